@@ -0,0 +1 @@
+"""가짜 Docker/Notion 서버를 이용한 종단간 벤치마크."""
@@ -0,0 +1,262 @@
+"""벤치마크용 가짜 Docker Engine API (유닉스 소켓).
+
+D2N이 실제로 쓰는 엔드포인트만 흉내 냅니다.
+
+- GET /_ping, /version
+- GET /info                       (SystemTime만, 시계 차이 측정용)
+- GET /containers/json            (라벨 필터는 무시, 모든 컨테이너가 d2n.enabled=true)
+- GET /containers/{id}/json       (inspect)
+- GET /events                     (chunked JSON 스트림, since 재생 지원)
+
+emit()으로 컨테이너 상태를 바꾸고 이벤트를 내보내며, 이벤트마다 발생 시각을 기록해
+이벤트 → Notion 쓰기 지연 측정에 씁니다.
+"""
+
+import json
+import os
+import queue
+import re
+import socketserver
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+API_VERSION = "1.43"
+
+_VERSION_PREFIX = re.compile(r"^/v[\d.]+")
+_INSPECT_PATH = re.compile(r"^/containers/([^/]+)/json$")
+
+# 이벤트 Action -> 이후 컨테이너 상태
+_STATE_AFTER = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "stop": "exited",
+    "die": "exited",
+    "pause": "paused",
+}
+
+
+class _Container:
+    __slots__ = ("id", "name", "image", "state", "created", "ip", "labels")
+
+    def __init__(self, index: int) -> None:
+        self.id = f"{index:064x}"
+        self.name = f"bench-{index:05d}"
+        self.image = "nginx:latest"
+        self.state = "running"
+        self.created = 1_700_000_000 + index
+        self.ip = f"172.{18 + index // 65025}.{index // 255 % 255}.{index % 255 + 1}"
+        self.labels = {
+            "d2n.enabled": "true",
+            "com.docker.compose.project": f"stack{index % 20}",
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "Id": self.id,
+            "Names": [f"/{self.name}"],
+            "Image": self.image,
+            "State": self.state,
+            "Status": self.state,
+            "Created": self.created,
+            "Ports": [{"PrivatePort": 80, "Type": "tcp"}],
+            "Labels": self.labels,
+            "HostConfig": {"NetworkMode": "bridge"},
+            "NetworkSettings": {"Networks": {"bridge": {"IPAddress": self.ip}}},
+        }
+
+    def inspect(self) -> dict[str, Any]:
+        created = datetime.fromtimestamp(self.created, timezone.utc).isoformat().replace("+00:00", "Z")
+        return {
+            "Id": self.id,
+            "Name": f"/{self.name}",
+            "Created": created,
+            "State": {"Status": self.state, "Running": self.state == "running"},
+            "Config": {"Image": self.image, "Labels": self.labels},
+            "HostConfig": {"NetworkMode": "bridge"},
+            "NetworkSettings": {
+                "Networks": {"bridge": {"IPAddress": self.ip}},
+                "Ports": {"80/tcp": None},
+            },
+        }
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class FakeDockerDaemon:
+    """containers개의 컨테이너를 가진 가짜 Docker 데몬."""
+
+    def __init__(self, socket_path: str, containers: int) -> None:
+        self.socket_path = socket_path
+        self._lock = threading.Lock()
+        self._containers = {c.id: c for c in (_Container(i) for i in range(containers))}
+        self._history: list[dict[str, Any]] = []
+        self._subscribers: list[queue.Queue[dict[str, Any] | None]] = []
+        # (컨테이너 이름, 이벤트 발생 시각 time.time())
+        self.emitted: list[tuple[str, float]] = []
+        self.requests: dict[str, int] = {}
+        self._server: _UnixHTTPServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"unix://{self.socket_path}"
+
+    def container_ids(self) -> list[str]:
+        return list(self._containers)
+
+    def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _UnixHTTPServer(self.socket_path, self._handler())
+        threading.Thread(target=self._server.serve_forever, name="fake-docker", daemon=True).start()
+
+    def stop(self) -> None:
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for q in subscribers:
+            q.put(None)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def emit(self, container_id: str, action: str) -> None:
+        """컨테이너 상태를 바꾸고 이벤트를 구독자 모두에게 보냄."""
+        with self._lock:
+            container = self._containers[container_id]
+            container.state = _STATE_AFTER.get(action, container.state)
+            now_ns = time.time_ns()
+            event = {
+                "status": action,
+                "id": container.id,
+                "from": container.image,
+                "Type": "container",
+                "Action": action,
+                "Actor": {
+                    "ID": container.id,
+                    "Attributes": {"name": container.name, "image": container.image, **container.labels},
+                },
+                "scope": "local",
+                "time": now_ns // 1_000_000_000,
+                "timeNano": now_ns,
+            }
+            self._history.append(event)
+            self.emitted.append((container.name, now_ns / 1e9))
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            q.put(event)
+
+    # -- HTTP ----------------------------------------------------------------
+
+    def _count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def _subscribe(self, since: float | None) -> "queue.Queue[dict[str, Any] | None]":
+        q: queue.Queue[dict[str, Any] | None] = queue.Queue()
+        with self._lock:
+            if since is not None:
+                for event in self._history:
+                    if event["timeNano"] / 1e9 >= since:
+                        q.put(event)
+            self._subscribers.append(q)
+        return q
+
+    def _unsubscribe(self, q: "queue.Queue[dict[str, Any] | None]") -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+            def _json(self, status: int, body: Any) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_HEAD(self) -> None:  # noqa: N802
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self) -> None:  # noqa: N802
+                url = urlparse(self.path)
+                path = _VERSION_PREFIX.sub("", url.path)
+                query = parse_qs(url.query)
+
+                if path == "/_ping":
+                    daemon._count("ping")
+                    data = b"OK"
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                elif path == "/version":
+                    self._json(200, {"ApiVersion": API_VERSION, "Version": "fake"})
+                elif path == "/info":
+                    daemon._count("info")
+                    system_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+                    self._json(200, {"ServerVersion": "fake", "SystemTime": system_time})
+                elif path == "/containers/json":
+                    daemon._count("list")
+                    with daemon._lock:
+                        summaries = [c.summary() for c in daemon._containers.values()]
+                    self._json(200, summaries)
+                elif match := _INSPECT_PATH.match(path):
+                    daemon._count("inspect")
+                    with daemon._lock:
+                        container = daemon._containers.get(match.group(1))
+                        attrs = container.inspect() if container else None
+                    if attrs is None:
+                        self._json(404, {"message": f"No such container: {match.group(1)}"})
+                    else:
+                        self._json(200, attrs)
+                elif path == "/events":
+                    daemon._count("events")
+                    since = query.get("since", [None])[0]
+                    self._stream_events(float(since) if since else None)
+                else:
+                    self._json(404, {"message": f"page not found: {path}"})
+
+            def _stream_events(self, since: float | None) -> None:
+                q = daemon._subscribe(since)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    while True:
+                        event = q.get()
+                        if event is None:
+                            self.wfile.write(b"0\r\n\r\n")
+                            self.wfile.flush()
+                            return
+                        data = json.dumps(event).encode("utf-8") + b"\n"
+                        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                finally:
+                    daemon._unsubscribe(q)
+                    self.close_connection = True
+
+        return Handler
@@ -0,0 +1,211 @@
+"""벤치마크용 가짜 Notion API (HTTP).
+
+NotionClient가 쓰는 엔드포인트만 흉내 냅니다.
+
+- GET   /v1/users/me
+- GET   /v1/databases/{id}
+- POST  /v1/databases/{id}/query   (Name equals / last_edited_time 필터, 페이지네이션)
+- POST  /v1/pages
+- PATCH /v1/pages/{id}
+
+요청마다 latency초를 지연하고, rate_limit_ratio 비율로 429(Retry-After 헤더 포함)를 돌려줍니다.
+페이지 쓰기(생성/수정)마다 시각과 컨테이너 이름을 기록해 이벤트 → 쓰기 지연 측정에 씁니다.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+_QUERY_PATH = re.compile(r"^/v1/databases/([^/]+)/query$")
+_DATABASE_PATH = re.compile(r"^/v1/databases/([^/]+)$")
+_PAGE_PATH = re.compile(r"^/v1/pages/([^/]+)$")
+
+
+def _name_of(props: dict[str, Any]) -> str:
+    title = (props.get("Name") or {}).get("title") or []
+    return "".join((part.get("text") or {}).get("content", "") for part in title)
+
+
+class FakeNotionServer:
+    """메모리에 페이지를 보관하는 가짜 Notion 서버."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rate_limit_ratio: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # page_id -> {"database_id", "properties", "last_edited_time"}
+        self.pages: dict[str, dict[str, Any]] = {}
+        self.calls: dict[str, int] = {}
+        self.rate_limited = 0
+        # (컨테이너 이름, 쓰기 시각 time.time())
+        self.writes: list[tuple[str, float]] = []
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="fake-notion", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(self.calls.values())
+
+    # -- 요청 처리 -------------------------------------------------------------
+
+    def _throttled(self, route: str) -> bool:
+        """호출을 집계하고, 429를 주입할 차례면 True."""
+        with self._lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+            if self.rate_limit_ratio > 0 and self._random.random() < self.rate_limit_ratio:
+                self.rate_limited += 1
+                return True
+        return False
+
+    def _page(self, page_id: str, page: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "object": "page",
+            "id": page_id,
+            "last_edited_time": page["last_edited_time"],
+            "parent": {"database_id": page["database_id"]},
+            "properties": page["properties"],
+        }
+
+    def _write(self, page_id: str, database_id: str, props: dict[str, Any], replace: bool) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            page = self.pages.get(page_id)
+            if page is None:
+                page = {"database_id": database_id, "properties": {}}
+                self.pages[page_id] = page
+            if replace:
+                page["properties"] = dict(props)
+            else:
+                page["properties"].update(props)
+            page["last_edited_time"] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+            self.writes.append((_name_of(page["properties"]), now))
+            return self._page(page_id, page)
+
+    def _query(self, database_id: str, body: dict[str, Any]) -> dict[str, Any]:
+        flt = body.get("filter") or {}
+        name = ((flt.get("title") or {}).get("equals")) if flt.get("property") == "Name" else None
+        edited_since = (flt.get("last_edited_time") or {}).get("on_or_after")
+        with self._lock:
+            matches = [
+                self._page(page_id, page)
+                for page_id, page in self.pages.items()
+                if page["database_id"] == database_id
+                and (name is None or _name_of(page["properties"]) == name)
+                and (edited_since is None or page["last_edited_time"] >= edited_since)
+            ]
+        start = int(body.get("start_cursor") or 0)
+        size = int(body.get("page_size") or 100)
+        chunk = matches[start:start + size]
+        has_more = start + size < len(matches)
+        return {
+            "object": "list",
+            "results": chunk,
+            "has_more": has_more,
+            "next_cursor": str(start + size) if has_more else None,
+        }
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+            def _send(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+            def _error(self, status: int, code: str, message: str) -> None:
+                self._send(status, {"object": "error", "status": status, "code": code, "message": message})
+
+            def _dispatch(self, method: str) -> None:
+                body = self._body()
+                path = self.path.split("?", 1)[0]
+                route, handler = self._route(method, path, body)
+                if server.latency > 0:
+                    time.sleep(server.latency)
+                if server._throttled(route):
+                    self._send(
+                        429,
+                        {"object": "error", "status": 429, "code": "rate_limited", "message": "Rate limited"},
+                        {"Retry-After": f"{server.retry_after:g}"},
+                    )
+                    return
+                handler()
+
+            def _route(self, method: str, path: str, body: dict[str, Any]) -> tuple[str, Any]:
+                if method == "GET" and path == "/v1/users/me":
+                    return "users.me", lambda: self._send(200, {"object": "user", "id": "bench", "type": "bot"})
+                if method == "POST" and (match := _QUERY_PATH.match(path)):
+                    return "databases.query", lambda: self._send(200, server._query(match.group(1), body))
+                if method == "GET" and (match := _DATABASE_PATH.match(path)):
+                    return "databases.retrieve", lambda: self._send(
+                        200, {"object": "database", "id": match.group(1)}
+                    )
+                if method == "POST" and path == "/v1/pages":
+                    database_id = (body.get("parent") or {}).get("database_id", "")
+                    return "pages.create", lambda: self._send(
+                        200, server._write(str(uuid.uuid4()), database_id, body.get("properties") or {}, True)
+                    )
+                if method == "PATCH" and (match := _PAGE_PATH.match(path)):
+                    return "pages.update", lambda: self._update(match.group(1), body)
+                return "unknown", lambda: self._error(404, "invalid_request_url", f"Invalid URL: {path}")
+
+            def _update(self, page_id: str, body: dict[str, Any]) -> None:
+                with server._lock:
+                    exists = page_id in server.pages
+                if not exists:
+                    self._error(404, "object_not_found", f"Could not find page with ID: {page_id}")
+                    return
+                self._send(200, server._write(page_id, "", body.get("properties") or {}, False))
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._dispatch("POST")
+
+            def do_PATCH(self) -> None:  # noqa: N802
+                self._dispatch("PATCH")
+
+        return Handler
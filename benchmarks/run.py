@@ -0,0 +1,266 @@
+"""D2N 종단간(end-to-end) 벤치마크.
+
+가짜 Docker 데몬(유닉스 소켓)과 가짜 Notion 서버를 띄우고, 실제 sync_all과 run_event_loop를
+그대로 돌려 처리량과 지연을 측정합니다. 결과는 커밋 간 비교를 위해 JSON으로 저장합니다.
+
+    python -m benchmarks.run --containers 100 1000 10000 --burst 500 --latency 0.05 --rate-limited 0.02
+
+컨테이너 수마다 별도 프로세스에서 실행하므로 peak RSS는 규모별로 따로 잽니다
+(가짜 서버도 같은 프로세스에 있어 그 메모리까지 포함됩니다).
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+# 벤치마크 중 건별 INFO 로그가 측정을 왜곡하지 않도록 src 모듈 import 전에 설정
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from benchmarks.fake_docker import FakeDockerDaemon  # noqa: E402
+from benchmarks.fake_notion import FakeNotionServer  # noqa: E402
+
+_DATABASE_ID = "bench-database"
+_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+def _write_config(directory: str, options: dict[str, Any]) -> str:
+    """벤치마크용 config.yaml을 만들어 경로를 반환."""
+    lines = [
+        "targets:",
+        '  default: "bench"',
+        "  databases:",
+        f'    - name: "bench"\n      database_id: "{_DATABASE_ID}"',
+        "sync:",
+        f"  workers: {options['sync_workers']}",
+        "events:",
+        f"  workers: {options['event_workers']}",
+        f"  debounce_seconds: {options['debounce']}",
+        "cache:",
+        "  flush_interval: 1.0",
+        "notion:",
+        f"  rate_limit: {options['rate_limit']}",
+        f"  burst: {options['rate_limit']}",
+    ]
+    path = os.path.join(directory, "config.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def _timed_sync(sync_all: Any, clients: tuple[Any, ...], notion: FakeNotionServer, containers: int) -> dict[str, Any]:
+    calls_before = notion.total_calls()
+    started = time.monotonic()
+    sync_all(*clients)
+    elapsed = time.monotonic() - started
+    return {
+        "seconds": round(elapsed, 3),
+        "containers_per_s": round(containers / elapsed, 1) if elapsed > 0 else 0.0,
+        "notion_calls": notion.total_calls() - calls_before,
+    }
+
+
+def _wait_for_writes(
+    notion: FakeNotionServer, emitted: list[tuple[str, float]], timeout: float
+) -> tuple[dict[int, float], int]:
+    """이벤트마다 그 이벤트가 만든 쓰기까지의 지연(초)을 모음. ({emitted 인덱스: 지연}, 쓰기를 못 본 이벤트 수)
+
+    같은 컨테이너의 이벤트는 한 샤드에서 순서대로 처리되므로, 컨테이너마다 이벤트를 보낸 순서대로
+    그 이후의 쓰기를 하나씩 짝지어 앞선 이벤트의 쓰기가 뒤 이벤트의 것으로 세어지지 않게 합니다.
+    """
+    pending: dict[str, list[int]] = {}
+    for index, (name, _) in enumerate(emitted):
+        pending.setdefault(name, []).append(index)
+    latencies: dict[int, float] = {}
+    seen = 0
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        with notion._lock:
+            new = notion.writes[seen:]
+            seen = len(notion.writes)
+        for name, at in new:
+            queue = pending.get(name)
+            # 버스트 전의 쓰기(전체 동기화 등)는 짝짓지 않음
+            if not queue or at < emitted[queue[0]][1]:
+                continue
+            index = queue.pop(0)
+            latencies[index] = at - emitted[index][1]
+            if not queue:
+                del pending[name]
+        if pending:
+            time.sleep(0.05)
+    return latencies, sum(len(queue) for queue in pending.values())
+
+
+def run_scenario(options: dict[str, Any]) -> dict[str, Any]:
+    """컨테이너 options['containers']개 규모로 전체 동기화 2회와 이벤트 버스트 1회를 측정."""
+    from config.settings import Settings
+    from src.cache_manager import CacheManager
+    from src.docker_client import DockerClient
+    from src.notion_client import NotionClient
+    import main
+
+    containers = options["containers"]
+    with tempfile.TemporaryDirectory(prefix="d2n-bench-") as tmp:
+        docker = FakeDockerDaemon(os.path.join(tmp, "docker.sock"), containers)
+        notion = FakeNotionServer(options["latency"], options["rate_limited"], options["retry_after"])
+        docker.start()
+        notion.start()
+
+        os.environ["DOCKER_API_URL"] = docker.base_url
+        os.environ["NOTION_API_KEY"] = "bench"
+        settings = Settings(env_file=os.path.join(tmp, ".env"), yaml_file=_write_config(tmp, options))
+        docker_client = DockerClient(settings)
+        notion_client = NotionClient(
+            "bench", settings.NOTION_RATE_LIMIT, settings.NOTION_BURST, notion.base_url,
+            settings.NOTION_MAX_CONCURRENCY, settings.NOTION_CONTAINER_ID_PROPERTY,
+        )
+        cache_manager = CacheManager(
+            os.path.join(tmp, "cache.json"),
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+            flush_interval=settings.CACHE_FLUSH_INTERVAL,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+        )
+        clients = (docker_client, notion_client, cache_manager, settings)
+
+        try:
+            result: dict[str, Any] = {"containers": containers}
+            result["sync_cold"] = _timed_sync(main.sync_all, clients, notion, containers)
+            result["sync_warm"] = _timed_sync(main.sync_all, clients, notion, containers)
+
+            stop = threading.Event()
+            loop = threading.Thread(
+                target=main.run_event_loop, args=(*clients, stop.is_set), name="bench-loop", daemon=True
+            )
+            loop.start()
+            # 이벤트 스트림을 구독할 때까지 대기 (시작 시 전체 동기화는 구독 뒤 백그라운드에서 진행)
+            while docker.requests.get("events", 0) == 0 and loop.is_alive():
+                time.sleep(0.05)
+
+            ids = docker.container_ids()
+            burst = options["burst"] or min(containers, 1000)
+            if options["debounce"] > 0 and burst > len(ids):
+                # 디바운스 창 안에서 같은 컨테이너의 die/start가 합쳐지면 변화가 없어 쓰기도 없음
+                print(f"Capping burst at {len(ids)} events (one per container) with debounce on.", file=sys.stderr)
+                burst = len(ids)
+            calls_before = notion.total_calls()
+            emitted_before = len(docker.emitted)
+            started = time.time()
+            for i in range(burst):
+                # 상태가 매번 바뀌도록 die/start를 번갈아 보냄 (지문 일치로 쓰기가 생략되지 않게)
+                action = "die" if (i // len(ids)) % 2 == 0 else "start"
+                docker.emit(ids[i % len(ids)], action)
+            emitted = docker.emitted[emitted_before:]
+            latencies, missed = _wait_for_writes(notion, emitted, options["timeout"])
+            finished = max((emitted[i][1] + lat for i, lat in latencies.items()), default=started)
+
+            stop.set()
+            docker.stop()
+            loop.join(timeout=30)
+
+            elapsed = finished - started
+            result["events"] = {
+                "count": burst,
+                "seconds": round(elapsed, 3),
+                "events_per_s": round(burst / elapsed, 1) if elapsed > 0 else 0.0,
+                "p50_latency_ms": round(_percentile(list(latencies.values()), 0.50) * 1000, 1),
+                "p99_latency_ms": round(_percentile(list(latencies.values()), 0.99) * 1000, 1),
+                "notion_calls_per_event": round((notion.total_calls() - calls_before) / burst, 3),
+                "missed": missed,
+            }
+            result["notion_calls"] = dict(notion.calls)
+            result["notion_rate_limited"] = notion.rate_limited
+            result["docker_requests"] = dict(docker.requests)
+            # Linux의 ru_maxrss 단위는 KiB
+            result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+            return result
+        finally:
+            cache_manager.close()
+            notion.stop()
+            docker.stop()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="D2N end-to-end benchmark")
+    parser.add_argument("--containers", type=int, nargs="+", default=[100, 1000], help="container counts to run")
+    parser.add_argument("--burst", type=int, default=0, help="events per burst (default: min(containers, 1000))")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake Notion latency per request (s)")
+    parser.add_argument("--rate-limited", type=float, default=0.0, help="fraction of Notion requests answered 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of injected 429s (s)")
+    parser.add_argument("--rate-limit", type=float, default=1000.0, help="notion.rate_limit for the run (req/s)")
+    parser.add_argument("--sync-workers", type=int, default=4)
+    parser.add_argument("--event-workers", type=int, default=4)
+    parser.add_argument(
+        "--debounce", type=float, default=0.0,
+        help="events.debounce_seconds (default: 0, every event is written; >0 caps the burst at one event per container)",
+    )
+    parser.add_argument("--timeout", type=float, default=300.0, help="max seconds to wait for a burst to drain")
+    parser.add_argument("--output", default="", help="result JSON path (default: benchmarks/results/<time>-<commit>.json)")
+    args = parser.parse_args()
+
+    options = {
+        "burst": args.burst,
+        "latency": args.latency,
+        "rate_limited": args.rate_limited,
+        "retry_after": args.retry_after,
+        "rate_limit": args.rate_limit,
+        "sync_workers": args.sync_workers,
+        "event_workers": args.event_workers,
+        "debounce": args.debounce,
+        "timeout": args.timeout,
+    }
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for count in args.containers:
+        print(f"Running {count} containers...", file=sys.stderr)
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_scenario, (dict(options, containers=count),))
+        print(json.dumps(result, indent=2), file=sys.stderr)
+        results.append(result)
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "options": options,
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        _RESULTS_DIR, f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
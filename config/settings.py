@@ -6,23 +6,92 @@ import yaml
 from src.logger import config_logger
 
 
+def _read_number(section: dict[str, Any], path: str, default: float, minimum: float = 0) -> float:
+    """YAML 섹션에서 숫자 설정값을 읽음. 누락 시 기본값, 잘못된 값이면 ValueError.
+
+    path는 `섹션.키` 형태로, 키는 마지막 구간을 사용하고 전체 경로는 오류 메시지에 씁니다.
+    """
+    key = path.rsplit(".", 1)[-1]
+    value = section.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+        config_logger.error(f"Invalid value for {path}: {value!r} (expected number >= {minimum})")
+        raise ValueError(f"Invalid value for {path}: {value!r} (expected number >= {minimum})")
+    return value
+
+
+def _read_bool(section: dict[str, Any], path: str, default: bool) -> bool:
+    """YAML 섹션에서 불리언 설정값을 읽음. 누락 시 기본값, 잘못된 값이면 ValueError."""
+    key = path.rsplit(".", 1)[-1]
+    value = section.get(key, default)
+    if not isinstance(value, bool):
+        config_logger.error(f"Invalid value for {path}: {value!r} (expected true/false)")
+        raise ValueError(f"Invalid value for {path}: {value!r} (expected true/false)")
+    return value
+
+
 class Settings:
     """애플리케이션 설정.
 
-    DOCKER_API_URL  : 도커 데몬과 통신하기 위한 URL
+    DOCKER_API_URL  : 도커 데몬과 통신하기 위한 URL (docker.hosts가 없을 때 사용)
+    DOCKER_HOSTS    : 호스트 이름 -> 도커 데몬 URL 매핑 (단일 호스트면 {"": DOCKER_API_URL})
     NOTION_API_KEY  : 노션 API 키
     TIMEZONE        : 타임존 (TZ 환경변수 기반)
     DB_IDS          : 데이터베이스 이름 -> ID 매핑 딕셔너리
     DEFAULT_DB_NAME : 기본 데이터베이스 이름
     DEFAULT_DB_ID   : 기본 데이터베이스 ID
+    SEEN_REFRESH_SECONDS : 변경 없는 컨테이너의 Seen만 갱신하는 주기(초, 0이면 갱신 안 함)
+    BULK_INDEX      : 전체 동기화 전에 DB를 일괄 스캔해 페이지 인덱스를 구축할지 여부
+    SYNC_WORKERS    : 전체 동기화를 병렬로 처리할 워커 스레드 수 (1이면 순차 처리)
+    EVENT_WORKERS   : Docker 이벤트를 처리할 워커 스레드 수 (컨테이너 ID 기준 샤딩)
+    EVENT_QUEUE_SIZE : 처리 대기 이벤트 큐의 최대 길이 (가득 차면 스트림 읽기를 늦춤)
+    EVENT_DEBOUNCE_SECONDS : 같은 컨테이너의 연속 이벤트를 하나로 합치는 창(초, 0이면 끔)
+    EVENT_RESUME_HORIZON : 재연결 시 놓친 이벤트를 재생으로 보정할 최대 공백(초, 넘거나 0이면 전체 동기화)
+    CACHE_FLUSH_INTERVAL : 캐시 변경을 모아서 디스크에 기록하는 주기(초, 0이면 변경마다 기록)
+    CACHE_TTL_SECONDS : 페이지 ID 캐시 유효 시간(초, 0이면 만료 없이 404로만 무효화)
+    CACHE_MAX_ENTRIES : 페이지 ID 캐시 최대 엔트리 수(LRU, 0이면 제한 없음)
+    NOTION_RATE_LIMIT : Notion API 호출 평균 속도 상한(요청/초)
+    NOTION_BURST    : 유휴 후 연속으로 허용하는 호출 수
+    NOTION_BREAKER_FAILURES : DB별 서킷 브레이커가 열리는 연속 실패 수
+    NOTION_BREAKER_RESET_SECONDS : 열린 회로가 시험 호출(half-open)을 허용하기까지의 시간(초)
+    NOTION_DB_CONCURRENCY : DB 하나를 동시에 처리할 수 있는 최대 워커 수(기본 DB가 여럿이면 EVENT_WORKERS의 절반, 0이면 제한 없음)
+    NOTION_MAX_CONCURRENCY : 동시에 나가 있는 Notion 호출 수의 최댓값(실제 상한은 429/지연에 따라 자동 조절)
+    NOTION_CONTAINER_ID_PROPERTY : 컨테이너 ID를 기록할 rich_text 속성 이름(빈 문자열이면 기록하지 않음)
+    OUTBOX_RETRY_SECONDS : 실패한 Notion 쓰기를 아웃박스에서 처음 재시도하기까지의 대기(초, 실패마다 두 배)
+    OUTBOX_MAX_RETRY_SECONDS : 아웃박스 재시도 대기의 상한(초)
+    METRICS_ENABLED : Prometheus 형식 메트릭 HTTP 엔드포인트(/metrics)를 열지 여부
+    METRICS_HOST    : 메트릭 엔드포인트 바인드 주소
+    METRICS_PORT    : 메트릭 엔드포인트 포트
     """
 
     DOCKER_API_URL: str
+    DOCKER_HOSTS: dict[str, str]
     NOTION_API_KEY: str
     TIMEZONE: str
     DB_IDS: dict[str, str]
     DEFAULT_DB_NAME: str
     DEFAULT_DB_ID: str
+    SEEN_REFRESH_SECONDS: float
+    BULK_INDEX: bool
+    SYNC_WORKERS: int
+    EVENT_WORKERS: int
+    EVENT_QUEUE_SIZE: int
+    EVENT_DEBOUNCE_SECONDS: float
+    EVENT_RESUME_HORIZON: float
+    CACHE_FLUSH_INTERVAL: float
+    CACHE_TTL_SECONDS: int
+    CACHE_MAX_ENTRIES: int
+    NOTION_RATE_LIMIT: float
+    NOTION_BURST: float
+    NOTION_BREAKER_FAILURES: int
+    NOTION_BREAKER_RESET_SECONDS: float
+    NOTION_DB_CONCURRENCY: int
+    NOTION_MAX_CONCURRENCY: int
+    NOTION_CONTAINER_ID_PROPERTY: str
+    OUTBOX_RETRY_SECONDS: float
+    OUTBOX_MAX_RETRY_SECONDS: float
+    METRICS_ENABLED: bool
+    METRICS_HOST: str
+    METRICS_PORT: int
 
     def __init__(self, env_file: str | None = None, yaml_file: str | None = None) -> None:
         """설정 초기화 및 로드.
@@ -56,8 +125,8 @@ class Settings:
             self.TIMEZONE = "Asia/Seoul"
         config_logger.info(f"Timezone set to: {self.TIMEZONE}")
 
+        # DOCKER_API_URL은 config.yaml에 docker.hosts가 없을 때만 필수 (_load_docker_hosts에서 검사)
         required_vars = {
-            "DOCKER_API_URL": self.DOCKER_API_URL,
             "NOTION_API_KEY": self.NOTION_API_KEY,
         }
 
@@ -101,6 +170,71 @@ class Settings:
             config_logger.error(f"Default target '{default_db_name}' ID not found in configuration")
             raise ValueError(f"Default target '{default_db_name}' ID not found in configuration")
 
+        self._load_docker_hosts(config.get("docker") or {})
+
+        sync_config = config.get("sync") or {}
+        self.SEEN_REFRESH_SECONDS = _read_number(sync_config, "sync.seen_refresh_seconds", 3600)
+        self.BULK_INDEX = _read_bool(sync_config, "sync.bulk_index", True)
+        self.SYNC_WORKERS = int(_read_number(sync_config, "sync.workers", 4, minimum=1))
+
+        events_config = config.get("events") or {}
+        self.EVENT_WORKERS = int(_read_number(events_config, "events.workers", 4, minimum=1))
+        self.EVENT_QUEUE_SIZE = int(_read_number(events_config, "events.queue_size", 1000, minimum=1))
+        self.EVENT_DEBOUNCE_SECONDS = _read_number(events_config, "events.debounce_seconds", 1.0)
+        self.EVENT_RESUME_HORIZON = _read_number(events_config, "events.resume_horizon_seconds", 300)
+
+        cache_config = config.get("cache") or {}
+        self.CACHE_FLUSH_INTERVAL = _read_number(cache_config, "cache.flush_interval", 1.0)
+        self.CACHE_TTL_SECONDS = int(_read_number(cache_config, "cache.ttl_seconds", 300))
+        self.CACHE_MAX_ENTRIES = int(_read_number(cache_config, "cache.max_entries", 0))
+
+        notion_config = config.get("notion") or {}
+        self.NOTION_RATE_LIMIT = _read_number(notion_config, "notion.rate_limit", 3.0, minimum=0.1)
+        self.NOTION_BURST = _read_number(notion_config, "notion.burst", 3, minimum=1)
+        self.NOTION_BREAKER_FAILURES = int(_read_number(notion_config, "notion.breaker_failures", 5, minimum=1))
+        self.NOTION_BREAKER_RESET_SECONDS = _read_number(notion_config, "notion.breaker_reset_seconds", 30)
+        # 기본은 이벤트 워커의 절반(올림): 느린 DB 하나가 모든 워커를 붙잡아도 나머지 DB를 처리할 자리가 남음.
+        # DB가 하나뿐이면 나눠 줄 다른 DB가 없으므로 모든 워커(이벤트 + 전체 동기화)
+        default_db_concurrency = (
+            max(1, (self.EVENT_WORKERS + 1) // 2) if len(self.DB_IDS) > 1 else self.EVENT_WORKERS + self.SYNC_WORKERS
+        )
+        self.NOTION_DB_CONCURRENCY = int(
+            _read_number(notion_config, "notion.database_concurrency", default_db_concurrency)
+        )
+        self.NOTION_MAX_CONCURRENCY = int(_read_number(notion_config, "notion.max_concurrency", 16, minimum=1))
+        self.NOTION_CONTAINER_ID_PROPERTY = str(notion_config.get("container_id_property") or "")
+
+        outbox_config = config.get("outbox") or {}
+        self.OUTBOX_RETRY_SECONDS = _read_number(outbox_config, "outbox.retry_seconds", 1.0, minimum=0.1)
+        self.OUTBOX_MAX_RETRY_SECONDS = _read_number(
+            outbox_config, "outbox.max_retry_seconds", 300.0, minimum=self.OUTBOX_RETRY_SECONDS
+        )
+
+        metrics_config = config.get("metrics") or {}
+        self.METRICS_ENABLED = _read_bool(metrics_config, "metrics.enabled", False)
+        self.METRICS_HOST = str(metrics_config.get("host", "0.0.0.0"))
+        self.METRICS_PORT = int(_read_number(metrics_config, "metrics.port", 9464))
+
+    def _load_docker_hosts(self, docker_config: dict[str, Any]) -> None:
+        """감시할 도커 데몬 목록을 로드. 목록이 없으면 DOCKER_API_URL 하나를 이름 없는 호스트로 사용."""
+        hosts = docker_config.get("hosts") or []
+        if not hosts:
+            if not self.DOCKER_API_URL:
+                config_logger.error("No DOCKER_API_URL found in environment variables")
+                raise ValueError("No DOCKER_API_URL found in environment variables")
+            self.DOCKER_HOSTS = {"": self.DOCKER_API_URL}
+            return
+
+        self.DOCKER_HOSTS = {}
+        for item in hosts:
+            name = str((item or {}).get("name") or "")
+            url = str((item or {}).get("url") or "")
+            if not name or not url or "/" in name or name in self.DOCKER_HOSTS:
+                config_logger.error(f"Invalid docker.hosts entry: {item!r} (unique name without '/' and url required)")
+                raise ValueError(f"Invalid docker.hosts entry: {item!r} (unique name without '/' and url required)")
+            self.DOCKER_HOSTS[name] = url
+        config_logger.info(f"Monitoring {len(self.DOCKER_HOSTS)} Docker hosts: {', '.join(self.DOCKER_HOSTS)}")
+
     def resolve_db_id(self, name: str | None) -> str:
         """`d2n.database` 라벨(데이터베이스 이름)을 실제 Notion DB ID로 해석.
 
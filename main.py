@@ -1,19 +1,43 @@
 import sys
 import time
 import signal
-from typing import Any, Callable
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable, Iterator
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from config.settings import load_settings, Settings
-from src.models import DockerContainerInfo
+from src.models import DockerContainerInfo, SyncStats
 from src.status import NotionStatus
-from src.docker_client import DockerClient
-from src.notion_client import NotionClient, PageNotFoundError
-from src.cache_manager import CacheManager
+from src.docker_client import D2N_ENABLED_LABEL, DockerClient
+from src.notion_client import NotionClient, PageNotFoundError, RetryLaterError
+from src.cache_manager import CacheManager, page_key
+from src.work_queue import ShardedWorkQueue
+from src.debouncer import Debouncer
+from src.outbox import OutboxDrainer
+from src.circuit_breaker import DatabaseGuard
+from src.priority import Priority, notion_priority
+from src.singleflight import SingleFlight
+from src.metrics import (
+    DOCKER_EVENTS,
+    DOCKER_RECONNECTS,
+    EVENT_LAG_SECONDS,
+    EVENT_QUEUE_DEPTH,
+    NOTION_DEFERRED,
+    NOTION_WRITES,
+    OUTBOX_PAGES,
+    PROCESS_UPDATE_SECONDS,
+    start_metrics_server,
+    timed,
+)
 from src.logger import main_logger
 
 FILTER = {
     "type": "container",
+    # 동기화 라벨이 있는 컨테이너의 이벤트만 데몬에서 걸러 받음 (값 true/false 판정은 이후 단계)
+    "label": [D2N_ENABLED_LABEL],
     "event": [
         "create",      # 생성됨 -> 노션: created
         "start",       # 실행 시작 -> 노션: running
@@ -23,93 +47,608 @@ FILTER = {
         "restart",     # 재시작 -> 노션: running (재시작 루프면 inspect가 restarting 반환)
         "pause",       # 일시 정지 -> 노션: paused
         "unpause",     # 정지 해제 -> 노션: running
+        "update",      # 설정 변경(docker update) -> 컨테이너 정보 캐시를 버리고 다시 inspect
+        "rename",      # 이름 변경 -> 같은 페이지의 제목만 새 이름으로 변경 (검색 없음)
     ],
 }
 
+# 컨테이너의 네트워크 연결/해제 -> IP/포트 캐시 무효화.
+# 네트워크 이벤트에는 컨테이너 라벨이 없어 위 label 필터에 걸리지 않으므로 따로 구독
+NETWORK_FILTER = {"type": "network", "event": ["connect", "disconnect"]}
+
+# 캐시된 컨테이너 정보를 버리고 inspect로 다시 읽어야 하는 이벤트
+_INVALIDATING_ACTIONS = frozenset({"rename", "update"})
+
+# 상태 전환으로 보고 가장 먼저 Notion에 반영할 이벤트 (그 외 이벤트는 속성 변경 우선순위)
+_TRANSITION_ACTIONS = frozenset({"start", "stop", "die", "destroy", "restart", "pause", "unpause"})
+
 # Docker 재연결 백오프 (초)
 _INITIAL_BACKOFF = 1.0
 _MAX_BACKOFF = 30.0
 
+# 마지막으로 받은 Docker 이벤트의 timeNano를 저장하는 캐시 meta 키 (호스트가 있으면 ":호스트"를 붙임)
+_CURSOR_KEY = "event_cursor"
+
+# 종료 시 호스트별 이벤트 스레드가 남은 작업을 마무리하기를 기다리는 최대 시간 (초)
+_SHUTDOWN_TIMEOUT = 10.0
+
+# 이벤트 큐 상태를 로그로 남기는 주기 (초)
+_QUEUE_REPORT_INTERVAL = 60.0
+
+# 증분 인덱스 스캔 시 겹쳐 조회할 여유 (Notion last_edited_time은 분 단위로 절삭됨)
+_INDEX_OVERLAP = 120.0
+
+# 여러 호스트의 이벤트 루프가 동시에 시작해도 DB 스캔은 한 번에 하나씩 (뒤따르는 쪽은 증분 스캔이 됨)
+_index_lock = threading.Lock()
+
+# DB 처리 자리가 빌 때까지 기다리는 최대 시간 (초). 넘으면 아웃박스로 미룸
+_BULKHEAD_WAIT = 1.0
+
+# DB ID -> 서킷 브레이커·동시 처리 상한 (호스트·워커 전체가 공유)
+_guards: dict[str, DatabaseGuard] = {}
+_guards_lock = threading.Lock()
+
+# 캐시 미스인 페이지 키의 검색/생성을 동시에 한 번만 실행 (이름이 같은 다른 컨테이너 ID끼리는 락이 달라 겹칠 수 있음)
+_page_flights: SingleFlight[tuple[str, bool]] = SingleFlight()
+
+# 전체 동기화·이벤트·아웃박스 재생이 같은 컨테이너를 동시에 쓰지 않게 하는 줄무늬(striped) 락
+_LOCK_STRIPES = 256
+_container_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+# 같은 페이지에 대한 버전 확인과 쓰기를 묶는 줄무늬 락 (ID가 다른 같은 이름의 컨테이너끼리 겹치지 않게)
+_page_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+# 프로세스 전체의 Notion 쓰기 집계 (지문 일치로 생략한 쓰기 수 포함)
+stats = SyncStats()
+
 
 def sync_all(
     docker_client: DockerClient,
     notion_client: NotionClient,
     cache_manager: CacheManager,
     settings: Settings,
+    touched: Callable[[str], float] | None = None,
+    should_stop: Callable[[], bool] | None = None,
 ) -> None:
+    """모든 대상 컨테이너를 Notion에 동기화.
+
+    SYNC_WORKERS > 1이면 컨테이너 단위로 스레드 풀에 나눠 처리합니다. 컨테이너마다
+    작업은 하나뿐이라 같은 컨테이너의 처리 순서는 그대로이며, Notion 호출 속도는
+    NotionClient의 토큰 버킷이 워커 전체에 걸쳐 제한합니다. 전체 동기화의 Notion 호출은
+    가장 낮은 우선순위(Priority.BULK)라 동시에 처리 중인 이벤트가 먼저 토큰을 받습니다.
+
+    이벤트와 함께 실행될 때는 touched(컨테이너 ID)가 그 컨테이너의 마지막 이벤트 수신 시각
+    (time.monotonic)을 돌려줍니다. 목록을 받은 뒤 이벤트가 온 컨테이너는 목록의 상태가 이미
+    낡았으므로 건너뜁니다(이벤트 쪽이 최신 상태를 씀).
+    """
+    started = time.monotonic()
     containers = docker_client.list_all_containers()
-    main_logger.info(f"Initial sync: Found {len(containers)} containers.")
+    docker_elapsed = time.monotonic() - started
+    host = f" on {docker_client.host}" if docker_client.host else ""
+    main_logger.info(f"Initial sync: Found {len(containers)} containers{host}.")
+    if containers:
+        # 연결이 끊긴 동안 삭제된 컨테이너의 ID 인덱스 정리 (목록이 비었으면 조회 실패일 수 있어 유지)
+        pruned = cache_manager.prune_containers(docker_client.host, {c.container_id for c in containers})
+        if pruned:
+            main_logger.info(f"Pruned {pruned} removed containers from the container ID index.")
+
+    index_started = time.monotonic()
+    if settings.BULK_INDEX:
+        refresh_index(notion_client, cache_manager, settings)
+    index_elapsed = time.monotonic() - index_started
+
+    before = replace(stats)
+    busy = 0.0
+    notion_started = time.monotonic()
+
+    superseded: list[str] = []
+
+    def timed_update(container: DockerContainerInfo) -> float:
+        t0 = time.monotonic()
+        if should_stop is not None and should_stop():
+            return 0.0
+        with _container_lock(container.container_id):
+            if touched is not None and touched(container.container_id) >= started:
+                superseded.append(container.container_id)
+                return 0.0
+            with notion_priority(Priority.BULK):
+                process_update(container, notion_client, cache_manager, settings)
+        return time.monotonic() - t0
+
+    workers = min(settings.SYNC_WORKERS, len(containers))
+    if workers <= 1:
+        for container in containers:
+            busy += timed_update(container)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2n-sync") as pool:
+            futures = [pool.submit(timed_update, container) for container in containers]
+            for future in as_completed(futures):
+                try:
+                    busy += future.result()
+                except Exception as e:
+                    main_logger.error(f"Sync worker failed: {e}")
+    notion_elapsed = time.monotonic() - notion_started
+    cache_stats = cache_manager.stats()
+
+    main_logger.info(
+        f"Initial sync done: updated {stats.updated - before.updated}, "
+        f"created {stats.created - before.created}, "
+        f"seen-only {stats.seen_only - before.seen_only}, "
+        f"skipped {stats.skipped - before.skipped} unchanged, "
+        f"dropped {stats.stale - before.stale} stale, "
+        f"{len(superseded)} superseded by live events."
+    )
+    main_logger.info(
+        f"Sync summary: {len(containers)} containers in {time.monotonic() - started:.2f}s "
+        f"(docker {docker_elapsed:.2f}s, index {index_elapsed:.2f}s, "
+        f"notion {notion_elapsed:.2f}s wall / {busy:.2f}s busy, workers {max(workers, 1)})"
+    )
+    main_logger.info(
+        f"Cache: {cache_stats.entries} entries (~{cache_stats.approx_bytes / 1024:.1f} KiB), "
+        f"hit ratio {cache_stats.hit_ratio:.1%} ({cache_stats.hits} hits / {cache_stats.misses} misses), "
+        f"{cache_stats.evictions} evicted"
+    )
+
+
+def refresh_index(
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> None:
+    """설정된 모든 DB를 스캔해 (DB, Name) -> page_id 인덱스를 캐시에 적재.
+
+    TTL 안에 스캔한 인덱스가 있으면 그 이후 수정된 페이지만 조회(증분)하고,
+    없으면 전체를 스캔합니다. 스캔이 실패한 DB는 개별 검색으로 폴백합니다.
+    """
+    with _index_lock:
+        for database_id in dict.fromkeys(settings.DB_IDS.values()):
+            started = time.time()
+            synced_at = cache_manager.get_index_time(database_id)
+            incremental = cache_manager.has_fresh_index(database_id)
+            since = (
+                datetime.fromtimestamp(synced_at - _INDEX_OVERLAP, timezone.utc).isoformat()
+                if incremental
+                else None
+            )
+
+            pages = notion_client.query_pages(database_id, edited_since=since)
+            if pages is None:
+                main_logger.warning(f"Index scan failed for database {database_id}. Falling back to search.")
+                continue
+
+            cache_manager.load_index(database_id, pages, complete=not incremental, synced_at=started)
+            main_logger.info(
+                f"{'Incremental' if incremental else 'Full'} index of database {database_id}: "
+                f"{len(pages)} pages in {time.time() - started:.2f}s"
+            )
+
+
+def _container_lock(container_id: str) -> threading.Lock:
+    """컨테이너 ID에 해당하는 줄무늬 락."""
+    return _container_locks[hash(container_id) % _LOCK_STRIPES]
+
+
+def _page_lock(page_id: str) -> threading.Lock:
+    """페이지 ID에 해당하는 줄무늬 락. 컨테이너 락을 잡은 채로만 얻음 (반대 순서 없음)."""
+    return _page_locks[hash(page_id) % _LOCK_STRIPES]
+
+
+def _log_fields(
+    container: DockerContainerInfo, db_id: str, page_id: str | None = None, started: float | None = None
+) -> dict[str, Any]:
+    """구조화 로그(LOG_FORMAT=json)용 extra 필드. started를 주면 그때부터의 소요 시간(초)을 포함."""
+    fields: dict[str, Any] = {"container": container.name, "db": db_id, "page_id": page_id or None}
+    if started is not None:
+        fields["duration"] = round(time.monotonic() - started, 3)
+    return fields
+
+
+def _record_write(outcome: str) -> None:
+    """Notion 쓰기 결과를 로그 집계(stats)와 메트릭에 함께 기록."""
+    stats.record(outcome)
+    NOTION_WRITES.inc(outcome)
+
+
+def _write_ahead(
+    cache_key: str, container: DockerContainerInfo, cache_manager: CacheManager, settings: Settings
+) -> None:
+    """Notion 쓰기 직전에 원하는 상태를 아웃박스에 기록. 쓰기가 실패하면 OutboxDrainer가 재시도."""
+    cache_manager.put_outbox(
+        cache_key, asdict(container), settings.OUTBOX_RETRY_SECONDS, settings.OUTBOX_MAX_RETRY_SECONDS
+    )
+
+
+def _defer(
+    cache_key: str, container: DockerContainerInfo, db_id: str, error: RetryLaterError, cache_manager: CacheManager
+) -> None:
+    """일시 오류로 실패한 쓰기를 아웃박스 재시도에 맡김. 워커는 기다리지 않고 다음 작업으로 넘어감."""
+    cache_manager.defer_outbox(cache_key, error.retry_after)
+    main_logger.warning(
+        "Deferred Notion write for %s: %s", container.name, error,
+        extra=_log_fields(container, db_id),
+    )
+
+
+def _retry_outcome(error: RetryLaterError) -> bool | None:
+    """미뤄진 쓰기가 서킷 브레이커에 주는 결과. 429는 통합 전체의 속도 제한이라 DB 실패로 세지 않음."""
+    return None if error.status == 429 else False
+
+
+def _guard(database_id: str, settings: Settings) -> DatabaseGuard:
+    """DB의 서킷 브레이커·동시 처리 상한 (처음 쓰일 때 생성)."""
+    with _guards_lock:
+        guard = _guards.get(database_id)
+        if guard is None:
+            guard = DatabaseGuard(
+                database_id,
+                settings.NOTION_BREAKER_FAILURES,
+                settings.NOTION_BREAKER_RESET_SECONDS,
+                settings.NOTION_DB_CONCURRENCY,
+            )
+            _guards[database_id] = guard
+        return guard
+
+
+def _reject(
+    cache_key: str,
+    container: DockerContainerInfo,
+    db_id: str,
+    reason: str,
+    delay: float,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> None:
+    """Notion을 부르지 않고 원하는 상태를 아웃박스에 넘김 (회로가 열렸거나 DB 처리 자리가 없음)."""
+    _write_ahead(cache_key, container, cache_manager, settings)
+    if delay > 0:
+        cache_manager.defer_outbox(cache_key, delay)
+    NOTION_DEFERRED.inc(db_id, reason)
+    main_logger.debug(
+        "Deferred %s to outbox (%s)", container.name, reason,
+        extra=_log_fields(container, db_id),
+    )
+
+
+def _newer_version(page_id: str, cache_key: str, cache_manager: CacheManager) -> int:
+    """페이지에 반영됐거나 아웃박스에서 기다리는 상태 중 가장 높은 버전. 이보다 낮은 상태는 낡은 것."""
+    pending = cache_manager.get_outbox(cache_key)
+    return max(cache_manager.get_version(page_id), int((pending or {}).get("version") or 0))
+
+
+def _settle(cache_key: str, container: DockerContainerInfo, cache_manager: CacheManager) -> None:
+    """원하는 상태가 페이지에 반영됨: 아웃박스에서 지우고, 삭제된 컨테이너면 컨테이너 ID 인덱스를 정리.
+
+    반영하는 사이 더 새 버전의 상태가 아웃박스에 들어왔으면 그 엔트리는 남겨 재시도에 맡깁니다.
+    삭제된 컨테이너의 페이지는 removed 상태로 Notion에 남으므로 이름 기준 매핑은 유지합니다.
+    최신 DB 인덱스가 있으면 매핑이 없는 키를 '페이지 없음'으로 보므로, 지우면 같은 이름으로
+    다시 만든 컨테이너(compose down/up)가 기존 페이지 대신 새 페이지를 만들게 됩니다.
+    """
+    cache_manager.remove_outbox(cache_key, container.version)
+    if container.status == NotionStatus.REMOVED and container.container_id:
+        cache_manager.remove_container_page(container.container_id)
+
+
+def _is_replaced(container_id: str, name: str) -> bool:
+    """docker compose가 재생성 직전에 옛 컨테이너에 붙이는 임시 이름(`<ID 앞 12자>_<이름>`)인지."""
+    return bool(container_id) and name.startswith(f"{container_id[:12]}_")
+
+
+def _cached_page_id(
+    container: DockerContainerInfo,
+    d2n_db_id: str,
+    cache_key: str,
+    cache_manager: CacheManager,
+) -> str | None:
+    """컨테이너 ID 인덱스를 먼저 보고, 같은 키면 이름 기준 캐시(TTL 포함)로 조회.
+
+    인덱스의 키가 지금 키와 다르면 같은 DB 안에서 이름이 바뀐 것이므로 매핑을 새 키로 옮기고
+    옛 이름으로 남은 아웃박스 엔트리를 버립니다(옛 이름을 다시 쓰지 않도록). 제목은 이어지는
+    업데이트에서 지문이 달라져 새 이름으로 바뀝니다. 이름 기준으로만 찾은 경우(구버전 캐시,
+    compose 재생성으로 ID가 바뀐 컨테이너)에는 인덱스를 채워 둡니다. 반대로 이름 기준 매핑이
+    만료·제거됐어도 인덱스가 같은 키를 가리키면 그 페이지를 씁니다(최신 DB 인덱스가 있으면
+    미스를 '페이지 없음'으로 보고 새로 만들기 때문).
+    """
+    container_id = container.container_id
+    entry = cache_manager.get_container_page(container_id) if container_id else None
+    if entry is not None and entry[0] != cache_key and entry[0].split("/", 1)[0] == d2n_db_id:
+        old_key = entry[0]
+        main_logger.info(
+            "Container %s was renamed (%s -> %s). Moving its page.", container_id[:12], old_key, cache_key,
+            extra=_log_fields(container, d2n_db_id, entry[1]),
+        )
+        cache_manager.remove_outbox(old_key)
+        return cache_manager.move_page_id(container_id, cache_key)
+
+    page_id = cache_manager.get_page_id(cache_key)
+    if page_id is None and entry is not None and entry[0] == cache_key:
+        page_id = entry[1]
+        cache_manager.set_page_id(cache_key, page_id, container_id)
+    elif page_id and container_id:
+        cache_manager.set_container_page(container_id, cache_key, page_id)
+    return page_id
+
+
+def _apply_update(
+    page_id: str,
+    cache_key: str,
+    container: DockerContainerInfo,
+    fingerprint: str,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> str:
+    """페이지에 컨테이너 상태를 반영하고 수행한 작업("updated"/"seen"/"skipped"/"stale")을 반환.
+
+    마지막으로 반영한 지문과 같으면 쓰기를 생략하고, SEEN_REFRESH_SECONDS가 지났을 때만
+    Seen 속성 하나를 갱신합니다. 쓰기 전에는 아웃박스에 먼저 기록합니다(_write_ahead).
+    페이지에 이미 더 새 버전이 반영됐거나 아웃박스에서 기다리면 쓰지 않고 "stale"을 반환합니다.
+    판단부터 반영 기록까지 페이지 락을 잡아, ID가 다른 같은 이름의 컨테이너가 한 페이지에
+    쓰더라도 오래된 쓰기가 새 쓰기를 덮지 않습니다. 예외 규약은 NotionClient.update_page와 동일합니다.
+    """
+    with _page_lock(page_id):
+        newer = _newer_version(page_id, cache_key, cache_manager)
+        if container.version < newer:
+            main_logger.info(
+                "Dropping stale write for %s (version %d < %d)", container.name, container.version, newer,
+                extra={"container": container.name, "page_id": page_id},
+            )
+            # 이 상태가 아웃박스에 남아 있던 것이면 정리 (더 새 상태가 기다리면 유지)
+            cache_manager.remove_outbox(cache_key, container.version)
+            _record_write("stale")
+            return "stale"
+
+        if cache_manager.get_fingerprint(page_id) == fingerprint:
+            interval = settings.SEEN_REFRESH_SECONDS
+            elapsed = time.time() - cache_manager.get_pushed_at(page_id)
+            if interval <= 0 or elapsed < interval or not container.seen:
+                _record_write("skipped")
+                return "skipped"
+            _write_ahead(cache_key, container, cache_manager, settings)
+            # Seen 단독 갱신은 상태 변화가 아니므로 가장 낮은 우선순위
+            with notion_priority(Priority.BULK):
+                notion_client.update_seen(page_id, container.seen)
+            cache_manager.touch_fingerprint(page_id, container.version)
+            _record_write("seen_only")
+            return "seen"
 
-    for container in containers:
-        process_update(container, notion_client, cache_manager, settings)
+        _write_ahead(cache_key, container, cache_manager, settings)
+        notion_client.update_page(page_id, container)
+        cache_manager.set_fingerprint(page_id, fingerprint, container.version)
+        _record_write("updated")
+        return "updated"
 
 
+@timed(PROCESS_UPDATE_SECONDS)
 def process_update(
     container: DockerContainerInfo,
     notion_client: NotionClient,
     cache_manager: CacheManager,
     settings: Settings,
-) -> None:
-    """컨테이너 정보를 Notion 페이지에 동기화.
+) -> bool:
+    """컨테이너 정보를 Notion 페이지에 동기화하고, 이 상태를 Notion에 실제로 썼는지 반환.
 
     캐시를 활용하며, 페이지가 실제로 삭제된 경우(404)에만 캐시를 무효화하고
-    재탐색/재생성합니다. 일시적 오류는 캐시를 유지한 채 건너뜁니다.
+    재탐색/재생성합니다. 마지막으로 반영한 속성과 같으면(지문 일치) 쓰기를 생략합니다.
+    쓰기 전에 원하는 상태를 아웃박스에 기록하므로, 실패한 쓰기는 캐시를 유지한 채
+    아웃박스에 남아 OutboxDrainer가 재시도합니다. 일시 오류(429/5xx)는 이 스레드에서 기다리지
+    않고 재시도 시각(Retry-After 이상)만 예약하며, 그 전에 같은 페이지의 새 상태가 들어오면
+    아웃박스 엔트리가 새 상태로 바뀌어 대기 중인 재시도를 대체합니다.
+
+    상태마다 버전(DockerContainerInfo.version, 이벤트 timeNano 또는 조회 시각)이 있어, 페이지에
+    이미 더 새 버전이 반영됐거나 아웃박스에서 기다리면 늦게 도착한 오래된 쓰기는 버립니다.
+
+    캐시 미스의 검색/생성은 페이지 키별 single-flight로 묶여, 같은 이름의 컨테이너가 동시에
+    미스를 내도 페이지는 하나만 만들어지고 나머지는 그 페이지에 자기 상태를 반영합니다.
+
+    DB마다 서킷 브레이커와 동시 처리 상한(NOTION_DB_CONCURRENCY)을 두어, 회로가 열렸거나
+    자리가 없으면 Notion을 부르지 않고 바로 아웃박스로 미룹니다. 문제 있는 DB 하나가
+    다른 DB의 갱신을 늦추지 않게 하기 위함입니다.
+
+    쓰기를 생략했거나(지문 일치·낡은 상태) 아웃박스로 미뤘거나 실패하면 False입니다.
     """
     # 0. d2n.enabled 라벨이 false면 무시
     if container.d2n_enabled is False:
-        main_logger.info(f"Skipping container {container.name} as d2n.enabled is set to false.")
-        return
+        main_logger.info(
+            "Skipping container %s as d2n.enabled is set to false.", container.name,
+            extra={"container": container.name},
+        )
+        return False
+
+    # 0-1. compose 재생성 중인 옛 컨테이너(임시 이름)는 무시. 같은 이름의 새 컨테이너가 페이지를 이어받음
+    if _is_replaced(container.container_id, container.name):
+        main_logger.info(
+            "Skipping container %s as it is being replaced by docker compose.", container.name,
+            extra={"container": container.name},
+        )
+        cache_manager.remove_container_page(container.container_id)
+        return False
 
+    started = time.monotonic()
     d2n_db_id = settings.resolve_db_id(container.d2n_database)
+    cache_key = page_key(d2n_db_id, container.name, container.host)
+    fingerprint = notion_client.fingerprint(container)
+
+    guard = _guard(d2n_db_id, settings)
+    if not guard.try_enter(_BULKHEAD_WAIT):
+        # 이 DB의 처리 자리가 모두 차 있음 (느린 DB) -> 워커를 붙잡지 않고 아웃박스로 미룸
+        _reject(cache_key, container, d2n_db_id, "bulkhead", 0.0, cache_manager, settings)
+        return False
+    try:
+        if not guard.breaker.allow():
+            _reject(cache_key, container, d2n_db_id, "breaker", guard.breaker.retry_in(), cache_manager, settings)
+            return False
+        outcome = _sync_page(
+            container, d2n_db_id, cache_key, fingerprint, started, notion_client, cache_manager, settings
+        )
+        if outcome is None:
+            guard.breaker.release()
+        elif outcome:
+            guard.breaker.record_success()
+        else:
+            guard.breaker.record_failure()
+        return outcome is True
+    finally:
+        guard.leave()
+
+
+def _sync_page(
+    container: DockerContainerInfo,
+    d2n_db_id: str,
+    cache_key: str,
+    fingerprint: str,
+    started: float,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> bool | None:
+    """process_update의 본체. Notion 호출 결과를 서킷 브레이커용으로 반환.
 
-    # 1. 캐시 확인 (이름 기준)
-    page_id = cache_manager.get_page_id(container.name)
+    True면 호출 성공(이 상태를 썼음), False면 실패(아웃박스에 남음), None이면 판단할 근거 없음
+    (지문 일치로 호출하지 않았거나 DB와 무관한 429).
+    """
+    # 1. 캐시 확인 (컨테이너 ID 기준, 없으면 DB + 이름 기준)
+    page_id = _cached_page_id(container, d2n_db_id, cache_key, cache_manager)
     if page_id:
         try:
-            notion_client.update_page(page_id, container)
-            main_logger.info(f"Updated existing page for {container.name} (ID: {page_id})")
-            return
+            result = _apply_update(
+                page_id, cache_key, container, fingerprint, notion_client, cache_manager, settings
+            )
+            if result != "stale":
+                _settle(cache_key, container, cache_manager)
+            main_logger.info(
+                "Updated existing page for %s (ID: %s, %s)", container.name, page_id, result,
+                extra=_log_fields(container, d2n_db_id, page_id, started),
+            )
+            return None if result in ("skipped", "stale") else True
         except PageNotFoundError:
             # 페이지가 실제로 삭제됨 -> 캐시 무효화 후 재생성
             main_logger.warning(
-                f"Page {page_id} for {container.name} not found. Invalidating cache and retrying..."
+                "Page %s for %s not found. Invalidating cache and retrying...", page_id, container.name,
+                extra=_log_fields(container, d2n_db_id, page_id),
             )
-            cache_manager.remove_page_id(container.name)
+            cache_manager.remove_page_id(cache_key, container.container_id)
+            cache_manager.remove_fingerprint(page_id)
             page_id = None
+        except RetryLaterError as e:
+            _defer(cache_key, container, d2n_db_id, e, cache_manager)
+            return _retry_outcome(e)
         except Exception as e:
-            # 일시 오류 등 -> 캐시 유지하고 건너뜀 (중복 생성 방지)
+            # 일시 오류 등 -> 캐시 유지하고 아웃박스 재시도에 맡김 (중복 생성 방지)
             main_logger.error(
-                f"Failed to update page {page_id} for {container.name}: {e}. Skipping (cache kept)."
+                "Failed to update page %s for %s: %s. Kept in outbox for retry.", page_id, container.name, e,
+                extra=_log_fields(container, d2n_db_id, page_id, started),
             )
-            return
+            return False
 
-    # 2. 캐시 미스: Notion 검색 후 업데이트, 없으면 생성
-    main_logger.info(f"Searching Notion for existing page: {container.name}")
-    page_id = notion_client.find_page_id(d2n_db_id, container.name)
+    # 2. 캐시 미스: Notion 검색, 없으면 생성. 같은 페이지 키의 검색/생성은 동시에 한 번만 실행
+    try:
+        (page_id, created), shared = _page_flights.do(
+            cache_key,
+            partial(
+                _resolve_page, container, d2n_db_id, cache_key, fingerprint, started,
+                notion_client, cache_manager, settings,
+            ),
+        )
+    except RetryLaterError as e:
+        # 검색에서 실패했으면 이 상태가 아직 아웃박스에 없으므로 기록 (생성에서 실패했으면 이미 기록됨)
+        pending = cache_manager.get_outbox(cache_key)
+        if pending is None or int(pending.get("version") or 0) < container.version:
+            _write_ahead(cache_key, container, cache_manager, settings)
+        _defer(cache_key, container, d2n_db_id, e, cache_manager)
+        return _retry_outcome(e)
+
+    if created and not shared:
+        # 이 호출의 상태로 새 페이지를 만들었으므로 더 쓸 것이 없음
+        _settle(cache_key, container, cache_manager)
+        _record_write("created")
+        return True
+    if not page_id:
+        main_logger.error(
+            "Failed to create page for %s. Kept in outbox for retry.", container.name,
+            extra=_log_fields(container, d2n_db_id, None, started),
+        )
+        return False
+
+    # 찾은 페이지, 또는 동시에 들어온 다른 호출이 찾거나 만든 페이지에 이 호출의 상태를 반영
+    if container.container_id:
+        cache_manager.set_container_page(container.container_id, cache_key, page_id)
+    try:
+        result = _apply_update(
+            page_id, cache_key, container, fingerprint, notion_client, cache_manager, settings
+        )
+        if result != "stale":
+            _settle(cache_key, container, cache_manager)
+        main_logger.info(
+            "Updated found page %s for %s (%s)", page_id, container.name, result,
+            extra=_log_fields(container, d2n_db_id, page_id, started),
+        )
+        return None if result in ("skipped", "stale") else True
+    except PageNotFoundError:
+        # 방금 찾았으나 사라진 드문 경우 -> 캐시를 비우고 아웃박스 재시도에서 다시 찾거나 생성
+        cache_manager.remove_page_id(cache_key, container.container_id)
+        cache_manager.remove_fingerprint(page_id)
+        return None
+    except RetryLaterError as e:
+        _defer(cache_key, container, d2n_db_id, e, cache_manager)
+        return _retry_outcome(e)
+    except Exception as e:
+        main_logger.error(
+            "Failed to update found page %s for %s: %s. Kept in outbox for retry.", page_id, container.name, e,
+            extra=_log_fields(container, d2n_db_id, page_id, started),
+        )
+        return False
+
+
+def _resolve_page(
+    container: DockerContainerInfo,
+    d2n_db_id: str,
+    cache_key: str,
+    fingerprint: str,
+    started: float,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> tuple[str, bool]:
+    """캐시 미스인 페이지를 찾거나 만들어 (페이지 ID, 새로 만들었는지)를 반환. 만들지 못하면 ("", False).
 
+    _page_flights를 거쳐 페이지 키마다 동시에 하나만 실행됩니다. 앞선 실행이 막 끝나 캐시에
+    기록했을 수 있으므로 캐시를 먼저 다시 봅니다. 새 페이지에는 이 호출의 상태가 쓰이고,
+    검색·생성의 일시 오류(RetryLaterError)는 기다리지 않고 기다리던 호출에도 그대로 전달됩니다.
+    """
+    page_id = cache_manager.get_page_id(cache_key)
     if page_id:
-        main_logger.info(f"Found existing page {page_id} for {container.name}. Updating cache.")
-        cache_manager.set_page_id(container.name, page_id)
-        try:
-            notion_client.update_page(page_id, container)
-            main_logger.info(f"Updated found page {page_id} for {container.name}")
-            return
-        except PageNotFoundError:
-            # 방금 찾았으나 사라진 드문 경우 -> 생성으로 폴백
-            cache_manager.remove_page_id(container.name)
-            page_id = ""
-        except Exception as e:
-            main_logger.error(f"Failed to update found page {page_id} for {container.name}: {e}")
-            return
+        return page_id, False
 
-    if not page_id:
-        main_logger.info(f"No existing page found for {container.name}, creating new page...")
-        new_id = notion_client.create_page(d2n_db_id, container)
-        if new_id:
-            main_logger.info(f"Created new page {new_id} for {container.name}")
-            cache_manager.set_page_id(container.name, new_id)
-        else:
-            main_logger.error(f"Failed to create page for {container.name}")
+    # 최신 인덱스가 있으면 미스 자체가 '페이지 없음'이므로 검색 생략
+    if not cache_manager.has_fresh_index(d2n_db_id):
+        main_logger.info(
+            "Searching Notion for existing page: %s", container.name,
+            extra=_log_fields(container, d2n_db_id),
+        )
+        page_id = notion_client.find_page_id(d2n_db_id, container.name, container.host, container.container_id)
+        if page_id:
+            main_logger.info(
+                "Found existing page %s for %s. Updating cache.", page_id, container.name,
+                extra=_log_fields(container, d2n_db_id, page_id),
+            )
+            cache_manager.set_page_id(cache_key, page_id, container.container_id)
+            return page_id, False
+
+    main_logger.info(
+        "No existing page found for %s, creating new page...", container.name,
+        extra=_log_fields(container, d2n_db_id),
+    )
+    _write_ahead(cache_key, container, cache_manager, settings)
+    new_id = notion_client.create_page(d2n_db_id, container)
+    if not new_id:
+        return "", False
+    main_logger.info(
+        "Created new page %s for %s", new_id, container.name,
+        extra=_log_fields(container, d2n_db_id, new_id, started),
+    )
+    cache_manager.set_page_id(cache_key, new_id, container.container_id)
+    cache_manager.set_fingerprint(new_id, fingerprint, container.version)
+    return new_id, True
 
 
 def handle_event(
@@ -126,11 +665,15 @@ def handle_event(
     container_id = event.get("id") or actor.get("ID")
     container_name = (event.get("name") or actor_attributes.get("name", "")).lstrip("/")
 
-    main_logger.info(f"Detected event: {action} for container Name: {container_name}")
+    main_logger.info(
+        "Detected event: %s for container Name: %s", action, container_name,
+        extra={"container": container_name, "action": action},
+    )
+    priority = Priority.TRANSITION if action in _TRANSITION_ACTIONS else Priority.CHANGE
 
     # 1. destroy 전용 처리 (컨테이너가 사라져 inspect 불가 -> 라벨로 구성)
     if action == "destroy":
-        d2n_enabled = actor_attributes.get("d2n.enabled", "FALSE").upper() == "TRUE"
+        d2n_enabled = actor_attributes.get(D2N_ENABLED_LABEL, "FALSE").upper() == "TRUE"
         if not d2n_enabled:
             return
 
@@ -150,21 +693,167 @@ def handle_event(
             ),
             d2n_enabled=d2n_enabled,
             d2n_database=actor_attributes.get("d2n.database", ""),
+            host=docker_client.host,
+            version=_event_version(event, docker_client),
         )
 
-        process_update(removed_info, notion_client, cache_manager, settings)
-        cache_manager.remove_page_id(container_name)
+        docker_client.forget(removed_info.container_id)
+        # 반영되면 process_update가 컨테이너 ID 인덱스를 정리 (실패하면 아웃박스 재시도를 위해 유지)
+        with _container_lock(removed_info.container_id), notion_priority(priority):
+            written = process_update(removed_info, notion_client, cache_manager, settings)
+        if written:
+            _observe_lag(event, docker_client)
         return
 
     # 2. 그 외 이벤트 처리 (create, start, stop, die, ...)
     if not container_id:
         return
 
-    container_info = docker_client.get_container_info(container_id)
+    if action in _INVALIDATING_ACTIONS:
+        docker_client.forget(container_id)
+    # 상태만 바뀌는 이벤트(stop/die/pause/unpause)는 이벤트 내용으로 적용하고,
+    # inspect는 create/start/restart와 처음 보는 컨테이너에만 사용
+    container_info = docker_client.container_from_event(event) or docker_client.get_container_info(container_id)
     if container_info is None:
         return
+    # inspect한 정보도 이벤트 시각을 버전으로 사용 (같은 데몬 시계로 이벤트끼리 순서를 비교)
+    if event.get("timeNano"):
+        container_info = replace(container_info, version=_event_version(event, docker_client))
 
-    process_update(container_info, notion_client, cache_manager, settings)
+    with _container_lock(container_id), notion_priority(priority):
+        written = process_update(container_info, notion_client, cache_manager, settings)
+    # 생략·미룬·낡은 쓰기는 아직 반영 전일 수 있으므로 지연으로 기록하지 않음
+    if written:
+        _observe_lag(event, docker_client)
+
+
+def _event_version(event: dict[str, Any], docker_client: DockerClient) -> int:
+    """이벤트로 만든 상태의 버전: Docker 이벤트의 timeNano (없으면 데몬 시계 기준의 지금 시각)."""
+    return int(event.get("timeNano") or docker_client.daemon_time_ns())
+
+
+def _observe_lag(event: dict[str, Any], docker_client: DockerClient) -> None:
+    """이벤트 발생 시각(timeNano)부터 Notion 반영까지 걸린 시간을 게이지에 기록 (데몬 시계 기준)."""
+    time_nano = event.get("timeNano")
+    if time_nano:
+        EVENT_LAG_SECONDS.set(max(0.0, (docker_client.daemon_time_ns() - int(time_nano)) / 1e9))
+
+
+def _watch_networks(stream: Iterator[dict[str, Any]], docker_client: DockerClient) -> None:
+    """네트워크 connect/disconnect 이벤트마다 해당 컨테이너의 IP/포트 캐시를 무효화.
+
+    스트림이 끝나면(연결 끊김, 재연결 시 close) 조용히 종료하고, 재구독은 이벤트 루프가 맡는다.
+    """
+    try:
+        for event in stream:
+            container_id = ((event.get("Actor") or {}).get("Attributes") or {}).get("container")
+            if container_id:
+                docker_client.invalidate_network(str(container_id))
+    except Exception as e:
+        main_logger.debug(f"Docker network event stream ended: {e}")
+
+
+def _close_stream(stream: Any) -> None:
+    """이벤트 스트림을 닫아 읽고 있는 스레드를 깨움."""
+    close = getattr(stream, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def _event_key(event: dict[str, Any]) -> str:
+    """이벤트를 묶는 키(컨테이너 ID, 없으면 이름)."""
+    actor = event.get("Actor", {})
+    return str(event.get("id") or actor.get("ID") or (actor.get("Attributes") or {}).get("name", ""))
+
+
+def _dispatch_event(
+    key: str,
+    event: dict[str, Any],
+    work_queue: ShardedWorkQueue,
+    docker_client: DockerClient,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> None:
+    """이벤트를 컨테이너 ID 기준 샤드에 넣음. 같은 컨테이너의 이벤트는 순서대로 처리된다."""
+    work_queue.submit(
+        key,
+        partial(handle_event, event, docker_client, notion_client, cache_manager, settings),
+    )
+
+
+def _replay_outbox(
+    key: str,
+    drainer: OutboxDrainer,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> None:
+    """아웃박스에 남은 페이지를 다시 동기화. 처리 시점의 최신 상태를 읽으므로 그 사이 들어온 상태가 이김."""
+    try:
+        state = cache_manager.get_outbox(key)
+        if state is None:
+            # 같은 컨테이너의 이벤트가 먼저 처리되어 이미 반영됨
+            return
+        with _container_lock(str(state.get("container_id", ""))):
+            # 락을 기다리는 동안 전체 동기화가 더 새 상태를 썼을 수 있으므로 다시 읽음
+            state = cache_manager.get_outbox(key)
+            if state is None:
+                return
+            try:
+                container = DockerContainerInfo(**state)
+            except TypeError as e:
+                main_logger.error(f"Dropping unreadable outbox entry {key}: {e}")
+                cache_manager.remove_outbox(key)
+                return
+            with notion_priority(Priority.CHANGE):
+                process_update(container, notion_client, cache_manager, settings)
+    finally:
+        drainer.done(key)
+
+
+def _dispatch_outbox(
+    key: str,
+    state: dict[str, Any],
+    drainer: OutboxDrainer,
+    work_queue: ShardedWorkQueue,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+) -> None:
+    """아웃박스 재생을 이벤트와 같은 샤드(컨테이너 ID)에 넣어 같은 컨테이너의 쓰기 순서를 지킴."""
+    work_queue.submit(
+        str(state.get("container_id") or state.get("name", "")),
+        partial(_replay_outbox, key, drainer, notion_client, cache_manager, settings),
+    )
+
+
+def _cursor_key(host: str) -> str:
+    """호스트별 이벤트 커서의 meta 키. 단일 호스트 구성은 기존 키를 그대로 사용."""
+    return f"{_CURSOR_KEY}:{host}" if host else _CURSOR_KEY
+
+
+def _resume_point(cache_manager: CacheManager, settings: Settings, docker_client: DockerClient) -> int | None:
+    """재연결 시 이벤트를 이어 받을 since 값(epoch 초). 재생할 수 없으면 None(전체 동기화).
+
+    커서는 데몬 시계의 timeNano이므로 공백도 데몬 시계 기준으로 잽니다(로컬 시계가 어긋나도
+    재생 여부가 바뀌지 않도록). 커서의 초 미만은 버리므로 마지막 이벤트와 같은 초의 이벤트가
+    다시 올 수 있지만, 이미 반영한 상태는 지문이 같아 쓰기가 생략됩니다(놓치는 것보다 겹치는 쪽이 안전).
+    """
+    cursor = cache_manager.get_meta(_cursor_key(docker_client.host))
+    if not cursor or settings.EVENT_RESUME_HORIZON <= 0:
+        return None
+
+    gap = (docker_client.daemon_time_ns() - int(cursor)) / 1e9
+    if gap > settings.EVENT_RESUME_HORIZON:
+        main_logger.info(f"Event gap {gap:.1f}s exceeds resume horizon. Running full sync.")
+        return None
+
+    main_logger.info(f"Resuming Docker events from cursor ({gap:.1f}s ago).")
+    return int(cursor) // 1_000_000_000
 
 
 def run_event_loop(
@@ -176,37 +865,188 @@ def run_event_loop(
 ) -> None:
     """이벤트 스트림을 소비하며, 연결이 끊기면 백오프 후 자동 재연결한다.
 
-    (재)연결 직후에는 sync_all로 전체 상태를 다시 맞춰 끊긴 동안 놓친 변화를 보정한다.
+    스트림을 읽는 이 스레드는 이벤트를 작업 큐에 넣기만 하고, 처리(inspect + Notion 쓰기)는
+    워커 스레드가 맡아 느린 Notion 호출이 스트림 읽기를 막지 않는다.
+    같은 컨테이너의 이벤트는 디바운스 창 동안 마지막 것 하나로 합쳐 처리한다.
+
+    시작 직후에는 sync_all로 전체 상태를 맞춘다. 재연결 시에는 마지막으로 받은 이벤트의
+    timeNano(커서)부터 이벤트를 재생해 끊긴 동안의 변화만 보정하고, 커서가 없거나
+    EVENT_RESUME_HORIZON보다 오래됐거나 데몬에 닿지 않았던(재시작 가능성) 경우에만 sync_all로 폴백한다.
+
+    sync_all은 이벤트 구독을 연 뒤 별도 스레드에서 돌려, 대량 재동기화 중에도 실시간 상태 변화가
+    먼저(더 높은 우선순위로) 반영되게 한다. 목록을 받은 뒤 이벤트가 온 컨테이너는 sync_all이 건너뛴다.
+
+    네트워크 connect/disconnect 이벤트는 별도 스트림으로 받아 컨테이너 정보 캐시의 IP/포트만 무효화한다.
+
+    실패한 Notion 쓰기는 아웃박스에 남고, OutboxDrainer가 재시도 시각마다 같은 작업 큐로 재생한다.
     """
     backoff = _INITIAL_BACKOFF
+    # 프로세스 시작 시점에는 그 사이 데몬이 재시작됐는지 알 수 없으므로 전체 동기화로 시작
+    needs_full_sync = True
+    work_queue = ShardedWorkQueue(
+        settings.EVENT_WORKERS,
+        settings.EVENT_QUEUE_SIZE,
+        f"d2n-worker-{docker_client.host}" if docker_client.host else "d2n-worker",
+    )
+    debouncer = Debouncer(
+        settings.EVENT_DEBOUNCE_SECONDS,
+        lambda key, event: _dispatch_event(
+            key, event, work_queue, docker_client, notion_client, cache_manager, settings
+        ),
+    )
+    drainer = OutboxDrainer(
+        cache_manager,
+        lambda key, state: _dispatch_outbox(
+            key, state, drainer, work_queue, notion_client, cache_manager, settings
+        ),
+        docker_client.host,
+    )
+    # 연결·보정 전에는 재생하지 않음 (아래 루프에서 보정이 끝나면 resume)
+    drainer.pause()
+    drainer.start()
+    EVENT_QUEUE_DEPTH.set_function(work_queue.depth, docker_client.host)
+    OUTBOX_PAGES.set_function(cache_manager.outbox_size)
+    cursor_key = _cursor_key(docker_client.host)
+    # 큐 상태는 이벤트 수신과 무관하게 주기적으로 남김 (멈추거나 한가한 큐도 보이도록)
+    report_stop = threading.Event()
+    reporter = threading.Thread(
+        target=_report_queue,
+        args=(work_queue, debouncer, _QUEUE_REPORT_INTERVAL, report_stop),
+        name=f"d2n-queue-report-{docker_client.host}" if docker_client.host else "d2n-queue-report",
+        daemon=True,
+    )
+    reporter.start()
+    # 컨테이너별 마지막 이벤트 수신 시각. 실행 중인 sync_all이 낡은 목록으로 덮어쓰지 않게 참고함
+    touched: dict[str, float] = {}
+    sync_thread: threading.Thread | None = None
+    network_stream: Any = None
+    network_thread: threading.Thread | None = None
 
-    while not should_stop():
-        try:
-            if not docker_client.ping():
-                raise ConnectionError("Docker daemon not reachable")
+    try:
+        while not should_stop():
+            try:
+                if not docker_client.ping():
+                    needs_full_sync = True
+                    raise ConnectionError("Docker daemon not reachable")
 
-            # 연결 직후 전체 동기화 (초기 실행 + 재연결 후 보정)
-            sync_all(docker_client, notion_client, cache_manager, settings)
-            backoff = _INITIAL_BACKOFF
+                # 앞서 받은 이벤트와 재생 중인 아웃박스, 이전 전체 동기화를 먼저 마무리한 뒤 보정 방식 결정
+                drainer.pause()
+                debouncer.flush()
+                work_queue.join()
+                drainer.resume()
+                if sync_thread is not None:
+                    sync_thread.join()
+                    sync_thread = None
+                since = None
+                if not needs_full_sync:
+                    # 끊긴 동안 데몬 시계가 바뀌었을 수 있으므로 공백을 재기 전에 다시 잼
+                    docker_client.sync_clock()
+                    since = _resume_point(cache_manager, settings, docker_client)
+                # 전체 동기화 중의 이벤트를 놓치지 않도록 구독을 먼저 열고 동기화는 뒤에서 진행
+                stream = docker_client.monitor_changes(filters=FILTER, since=since)
+                _close_stream(network_stream)
+                if network_thread is not None:
+                    network_thread.join(timeout=_SHUTDOWN_TIMEOUT)
+                network_stream = docker_client.monitor_changes(filters=NETWORK_FILTER, since=since)
+                network_thread = threading.Thread(
+                    target=_watch_networks,
+                    args=(network_stream, docker_client),
+                    name=f"d2n-networks-{docker_client.host}" if docker_client.host else "d2n-networks",
+                    daemon=True,
+                )
+                network_thread.start()
+                if since is None:
+                    touched.clear()
+                    sync_thread = threading.Thread(
+                        target=_run_sync,
+                        args=(docker_client, notion_client, cache_manager, settings, touched, should_stop),
+                        name=f"d2n-sync-{docker_client.host}" if docker_client.host else "d2n-sync",
+                        daemon=True,
+                    )
+                    sync_thread.start()
+                needs_full_sync = False
+                backoff = _INITIAL_BACKOFF
 
-            for event in docker_client.monitor_changes(filters=FILTER):
-                if should_stop():
-                    return
-                handle_event(event, docker_client, notion_client, cache_manager, settings)
+                for event in stream:
+                    if should_stop():
+                        return
+                    DOCKER_EVENTS.inc(str(event.get("Action", "")))
+                    key = _event_key(event)
+                    if sync_thread is not None and sync_thread.is_alive():
+                        touched[key] = time.monotonic()
+                    debouncer.submit(key, event)
+                    if event.get("timeNano"):
+                        cache_manager.set_meta(cursor_key, int(event["timeNano"]))
 
-            main_logger.warning("Docker event stream ended.")
-        except (KeyboardInterrupt, SystemExit):
-            raise
-        except Exception as e:
-            main_logger.error(f"Docker connection lost: {e}")
+                main_logger.warning("Docker event stream ended.")
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                main_logger.error(f"Docker connection lost: {e}")
 
-        if should_stop():
-            return
+            if should_stop():
+                return
 
-        main_logger.info(f"Reconnecting to Docker daemon in {backoff:.1f}s...")
-        time.sleep(backoff)
-        docker_client.reconnect()
-        backoff = min(backoff * 2, _MAX_BACKOFF)
+            main_logger.info(f"Reconnecting to Docker daemon in {backoff:.1f}s...")
+            time.sleep(backoff)
+            DOCKER_RECONNECTS.inc()
+            if not docker_client.reconnect():
+                needs_full_sync = True
+            backoff = min(backoff * 2, _MAX_BACKOFF)
+    finally:
+        report_stop.set()
+        drainer.stop()
+        _close_stream(network_stream)
+        if sync_thread is not None:
+            sync_thread.join(timeout=_SHUTDOWN_TIMEOUT)
+        debouncer.stop()
+        work_queue.stop()
+
+
+def _report_queue(
+    work_queue: ShardedWorkQueue, debouncer: Debouncer, interval: float, stop: threading.Event
+) -> None:
+    """interval초마다 이벤트 큐 상태를 로그로 남김 (stop이 설정될 때까지)."""
+    while not stop.wait(interval):
+        queue_stats = work_queue.stats()
+        main_logger.info(
+            f"Event queue: depth {queue_stats.depth}, debouncing {debouncer.pending()}, "
+            f"processed {queue_stats.processed}, "
+            f"avg wait {queue_stats.avg_wait:.3f}s, max wait {queue_stats.max_wait:.3f}s"
+        )
+
+
+def _run_sync(
+    docker_client: DockerClient,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+    touched: dict[str, float],
+    should_stop: Callable[[], bool],
+) -> None:
+    """이벤트 스트림과 함께 도는 전체 동기화. 예외는 로그로 남김 (다음 재연결 때 다시 맞춤)."""
+    try:
+        sync_all(
+            docker_client, notion_client, cache_manager, settings,
+            touched=lambda container_id: touched.get(container_id, float("-inf")),
+            should_stop=should_stop,
+        )
+    except Exception as e:
+        main_logger.error(f"Full sync for Docker host {docker_client.host or 'local'} failed: {e}")
+
+
+def _run_host_loop(
+    docker_client: DockerClient,
+    notion_client: NotionClient,
+    cache_manager: CacheManager,
+    settings: Settings,
+    should_stop: Callable[[], bool],
+) -> None:
+    """호스트 하나의 이벤트 루프를 스레드에서 실행. 예외는 로그로 남기고 다른 호스트에 번지지 않게 함."""
+    try:
+        run_event_loop(docker_client, notion_client, cache_manager, settings, should_stop)
+    except Exception as e:
+        main_logger.error(f"Event loop for Docker host {docker_client.host} stopped: {e}")
 
 
 def main() -> None:
@@ -223,18 +1063,62 @@ def main() -> None:
     signal.signal(signal.SIGTERM, signal_handler)
 
     settings = load_settings()
-    docker_client = DockerClient(settings)
-    notion_client = NotionClient(settings.NOTION_API_KEY)
-    cache_manager = CacheManager()
+    if settings.METRICS_ENABLED:
+        start_metrics_server(settings.METRICS_HOST, settings.METRICS_PORT)
+    # 호스트가 여럿이면 일부 데몬이 꺼져 있어도 시작하고, 각 이벤트 루프가 재연결을 맡음
+    single_host = len(settings.DOCKER_HOSTS) == 1
+    docker_clients = [
+        DockerClient(settings, url, host, require_connection=single_host)
+        for host, url in settings.DOCKER_HOSTS.items()
+    ]
+    notion_client = NotionClient(
+        settings.NOTION_API_KEY,
+        settings.NOTION_RATE_LIMIT,
+        settings.NOTION_BURST,
+        max_concurrency=settings.NOTION_MAX_CONCURRENCY,
+        container_id_property=settings.NOTION_CONTAINER_ID_PROPERTY,
+    )
+    cache_manager = CacheManager(
+        ttl_seconds=settings.CACHE_TTL_SECONDS,
+        flush_interval=settings.CACHE_FLUSH_INTERVAL,
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        # 구버전 캐시(이름 기준 키)는 DB 구분이 없던 때의 것이므로 기본 DB의 매핑으로 옮김
+        legacy_database_id=settings.DEFAULT_DB_ID,
+    )
 
+    threads: list[threading.Thread] = []
     try:
-        run_event_loop(docker_client, notion_client, cache_manager, settings, lambda: stop_event)
+        if single_host:
+            run_event_loop(docker_clients[0], notion_client, cache_manager, settings, lambda: stop_event)
+        else:
+            # 호스트마다 이벤트 스트림 스레드(백오프·커서 별도)를 두고, Notion 클라이언트·속도 제한·캐시는 공유
+            threads = [
+                threading.Thread(
+                    target=_run_host_loop,
+                    args=(docker_client, notion_client, cache_manager, settings, lambda: stop_event),
+                    name=f"d2n-events-{docker_client.host}",
+                    daemon=True,
+                )
+                for docker_client in docker_clients
+            ]
+            for thread in threads:
+                thread.start()
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1.0)
     except (KeyboardInterrupt, SystemExit):
         main_logger.info("Shutting down gracefully...")
     except Exception as e:
         main_logger.error(f"Unexpected error: {e}")
     finally:
-        docker_client.disconnect()
+        stop_event = True
+        # 연결을 먼저 닫아 스트림을 기다리던 스레드를 깨운 뒤, 남은 작업을 마무리할 시간을 줌
+        for docker_client in docker_clients:
+            docker_client.disconnect()
+        deadline = time.monotonic() + _SHUTDOWN_TIMEOUT
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        cache_manager.close()
         main_logger.info("Cleanup complete. Exiting.")
 
 
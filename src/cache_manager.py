@@ -1,71 +1,602 @@
 import json
 import os
+import sys
+import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
 from src.logger import cache_logger
+from src.metrics import CACHE_HITS, CACHE_MISSES
 
-# 캐시 엔트리: {container_name: {"page_id": str, "timestamp": float}}
-CacheData = dict[str, dict[str, str | float]]
+# 캐시 엔트리: {page_key: {"page_id": str, "timestamp": float}} (LRU 순서)
+CacheData = OrderedDict[str, dict[str, str | float]]
+
+# 지문 엔트리: {page_id: {"hash": str, "pushed_at": float, "version": 반영한 상태의 최고 버전(ns)}}
+FingerprintData = dict[str, dict[str, str | float | int]]
+
+# 인덱스 엔트리: {database_id: {"synced_at": float}}
+IndexData = dict[str, dict[str, float]]
+
+# 기타 상태: {name: 값} (예: 이벤트 스트림 커서)
+MetaData = dict[str, Any]
+# 아웃박스: {page_key: {"state": 컨테이너 상태(dict), "attempts": 실패 횟수, "due": 재시도 시각(epoch 초)}}
+OutboxData = dict[str, dict[str, Any]]
+
+# 컨테이너 ID 인덱스: {container_id: {"key": page_key, "page_id": str}}
+ContainerIndexData = dict[str, dict[str, str]]
+
+# 캐시 파일 포맷 버전. 버전 키가 없는 파일은 이름 기준 페이지 매핑({이름: 엔트리})만 담긴 구버전으로 취급합니다.
+_CACHE_VERSION = 2
+
+# 저널에 쌓인 변경이 이 수를 넘으면 스냅샷으로 압축
+_COMPACT_THRESHOLD = 1000
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """페이지 ID 캐시 통계.
+
+    Attributes:
+        entries (int): 캐시된 페이지 ID 수
+        hits (int): 조회 적중 수
+        misses (int): 조회 실패 수 (만료 포함)
+        evictions (int): LRU 상한으로 밀려난 엔트리 수
+        approx_bytes (int): 캐시가 차지하는 메모리 근사치(바이트, 지문·컨테이너 ID 인덱스 포함)
+    """
+
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+    approx_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def page_key(database_id: str, container_name: str, host: str = "") -> str:
+    """페이지 캐시 키. 같은 이름이 여러 DB·호스트에 있을 수 있어 DB ID와 호스트를 함께 사용.
+
+    호스트가 없으면(단일 호스트 구성) 기존과 같은 `DB/이름` 형태를 유지합니다.
+    """
+    return f"{database_id}/{host}/{container_name}" if host else f"{database_id}/{container_name}"
+
+
+def _state_version(state: dict[str, Any]) -> int:
+    """아웃박스에 저장된 컨테이너 상태의 버전. 버전이 없던 때의 엔트리는 0."""
+    return int(state.get("version") or 0)
+
+
+def _key_host(key: str) -> str:
+    """page_key에서 호스트 부분을 꺼냄. 단일 호스트 형식(`DB/이름`)이면 빈 문자열."""
+    parts = key.split("/", 2)
+    return parts[1] if len(parts) == 3 else ""
 
 
 class CacheManager:
-    def __init__(self, cache_file: str = "data/cache.json", ttl_seconds: int = 300) -> None:
+    """페이지 ID·지문·인덱스 캐시.
+
+    저장은 스냅샷(cache_file) + 추가 전용 저널(cache_file + ".journal")로 나뉩니다.
+    변경은 메모리에서 O(1)로 반영되고 한 줄짜리 저널 레코드로만 쌓이며,
+    flush_interval > 0이면 백그라운드 스레드가 그 주기로 모아서(group commit) 기록합니다
+    (0이면 변경마다 즉시 기록). 저널이 길어지면 임시 파일 + rename으로 스냅샷을 원자적으로
+    교체한 뒤 저널을 비웁니다. 기록 도중 종료되어도 스냅샷은 온전하고, 잘린 저널 마지막 줄만 버려집니다.
+
+    ttl_seconds가 0이면 페이지 ID를 만료 없이 신뢰하고(삭제된 페이지는 업데이트 시 404로
+    감지해 호출측이 무효화), max_entries가 0보다 크면 가장 오래 쓰이지 않은 엔트리부터 밀어냅니다.
+
+    legacy_database_id를 주면 구버전 캐시 파일(이름 기준 키)의 매핑을 그 DB의 키(DB/이름)로 옮겨
+    현재 형식의 스냅샷으로 다시 씁니다. 주지 않으면 구버전 파일은 버리고 빈 캐시로 시작합니다.
+    """
+
+    def __init__(
+        self,
+        cache_file: str = "data/cache.json",
+        ttl_seconds: int = 300,
+        flush_interval: float = 0.0,
+        max_entries: int = 0,
+        legacy_database_id: str = "",
+    ) -> None:
         self.cache_file = cache_file
+        self.legacy_database_id = legacy_database_id
+        self.journal_file = f"{cache_file}.journal"
         self.ttl_seconds = ttl_seconds
-        self.cache_data: CacheData = self._load_cache()
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        # 삽입/조회 순서를 LRU 순서로 사용 (앞쪽이 가장 오래 쓰이지 않은 엔트리)
+        self.cache_data: CacheData = OrderedDict()
+        self.fingerprints: FingerprintData = {}
+        self.indexes: IndexData = {}
+        self.meta: MetaData = {}
+        self.outbox: OutboxData = {}
+        self.containers: ContainerIndexData = {}
+        self._sections: dict[str, dict[str, Any]] = {
+            "pages": self.cache_data,
+            "fingerprints": self.fingerprints,
+            "indexes": self.indexes,
+            "meta": self.meta,
+            "outbox": self.outbox,
+            "containers": self.containers,
+        }
+        # 동시 동기화 워커가 공유하므로 조회/변경/저장을 하나의 락으로 직렬화
+        self._lock = threading.RLock()
+        self._pending: list[str] = []
+        self._journal_ops = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        migrated = self._load_cache()
+        with self._lock:
+            self._evict()
+            if migrated:
+                # 다음 시작부터는 현재 형식으로 읽도록 스냅샷을 바로 교체
+                self._compact()
+
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="d2n-cache-flush", daemon=True)
+            self._flusher.start()
+        ttl = f"{self.ttl_seconds} seconds" if self.ttl_seconds > 0 else "unlimited"
         cache_logger.info(
-            f"CacheManager initialized with cache file: {self.cache_file} and TTL: {self.ttl_seconds} seconds"
+            f"CacheManager initialized with cache file: {self.cache_file}, TTL: {ttl}, "
+            f"max entries: {self.max_entries or 'unlimited'}"
         )
 
-    def _load_cache(self) -> CacheData:
-        """캐시 파일에서 데이터를 로드"""
+    def _load_cache(self) -> bool:
+        """스냅샷을 읽고 저널을 재생해 메모리 상태를 복원. 구버전 파일을 옮겨 왔으면 True."""
+        migrated = False
         cache_logger.info(f"Loading cache from file: {self.cache_file}")
         if os.path.exists(self.cache_file):
             with open(self.cache_file, "r", encoding="utf-8") as file:
                 try:
-                    return json.load(file)
+                    data: dict[str, Any] = json.load(file)
                 except json.JSONDecodeError:
                     cache_logger.error(f"Cache file {self.cache_file} contains invalid JSON.")
-                    return {}
-        cache_logger.info(f"Cache file {self.cache_file} does not exist. Starting with empty cache.")
-        return {}
-
-    def _save_cache(self) -> None:
-        """캐시 데이터를 파일에 저장"""
-        cache_logger.debug(f"Saving cache to file: {self.cache_file}")
-        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-        with open(self.cache_file, "w", encoding="utf-8") as file:
-            json.dump(self.cache_data, file, ensure_ascii=False, indent=4)
-
-    def get_page_id(self, container_name: str) -> str | None:
-        """컨테이너 이름으로 캐시된 페이지 ID를 조회. TTL 검사 포함."""
-        cache_logger.debug(f"Retrieving page ID from cache for container: {container_name}")
-        entry = self.cache_data.get(container_name)
-        if not entry:
-            return None
-
-        saved_time = float(entry.get("timestamp", 0))
-        if time.time() - saved_time > self.ttl_seconds:
-            cache_logger.debug(
-                f"Cache entry for container {container_name} has expired. Removing from cache."
+                    data = {"version": _CACHE_VERSION}
+
+            if "version" not in data:
+                migrated = self._migrate_legacy(data)
+            else:
+                for name, section in self._sections.items():
+                    section.update(data.get(name) or {})
+        else:
+            cache_logger.info(f"Cache file {self.cache_file} does not exist. Starting with empty cache.")
+
+        if not os.path.exists(self.journal_file):
+            return migrated
+        with open(self.journal_file, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 종료되어 잘린 마지막 줄
+                    cache_logger.warning(f"Ignoring truncated record in {self.journal_file}")
+                    break
+                self._apply(record["ns"], record["key"], record.get("value"))
+                self._journal_ops += 1
+        return migrated
+
+    def _migrate_legacy(self, data: dict[str, Any]) -> bool:
+        """구버전 파일({컨테이너 이름: {"page_id", "timestamp"}})의 매핑을 legacy_database_id의 키로 옮김.
+
+        구버전은 DB 구분 없이 이름만 키로 썼으므로 기본 DB의 페이지로 간주합니다. 저장 시각은
+        그대로 두어 TTL이 이어서 적용되고, 오래된 것부터 넣어 LRU 순서도 유지합니다.
+        """
+        if not self.legacy_database_id:
+            # DB를 알 수 없으면 현재 키(DB/이름)로 옮길 수 없음
+            cache_logger.info(f"Cache file {self.cache_file} uses a legacy format. Starting with empty cache.")
+            return False
+        entries = [
+            (name, entry) for name, entry in data.items()
+            if isinstance(entry, dict) and entry.get("page_id")
+        ]
+        entries.sort(key=lambda item: float(item[1].get("timestamp", 0)))
+        for name, entry in entries:
+            self.cache_data[page_key(self.legacy_database_id, name)] = {
+                "page_id": str(entry["page_id"]),
+                "timestamp": float(entry.get("timestamp", 0)),
+            }
+        cache_logger.info(
+            f"Migrated {len(entries)} entries from legacy cache file {self.cache_file} "
+            f"to database {self.legacy_database_id}."
+        )
+        return True
+
+    def _apply(self, ns: str, key: str, value: Any) -> None:
+        section = self._sections.get(ns)
+        if section is None:
+            return
+        if value is None:
+            section.pop(key, None)
+        else:
+            section[key] = value
+
+    def _record(self, ns: str, key: str, value: Any) -> None:
+        """변경 하나를 저널 대기열에 추가 (락 보유 상태에서 호출). 즉시 기록 모드면 바로 flush."""
+        self._pending.append(
+            json.dumps({"ns": ns, "key": key, "value": value}, ensure_ascii=False, separators=(",", ":"))
+        )
+        if self.flush_interval <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """대기 중인 변경을 저널에 기록하고, 저널이 길면 스냅샷으로 압축"""
+        with self._lock:
+            if not self._pending:
+                return
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            with open(self.journal_file, "a", encoding="utf-8") as file:
+                file.write("\n".join(self._pending) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            self._journal_ops += len(self._pending)
+            self._pending.clear()
+            if self._journal_ops >= _COMPACT_THRESHOLD:
+                self._compact()
+
+    def _compact(self) -> None:
+        """현재 상태를 스냅샷으로 원자적으로 교체하고 저널을 비움 (락 보유 상태에서 호출)"""
+        cache_logger.debug(f"Compacting cache to file: {self.cache_file}")
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        data = {"version": _CACHE_VERSION, **self._sections}
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_file, self.cache_file)
+        # 스냅샷이 저널 내용을 모두 포함하므로 이제 비워도 안전
+        open(self.journal_file, "w", encoding="utf-8").close()
+        self._pending.clear()
+        self._journal_ops = 0
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                cache_logger.error(f"Failed to flush cache: {e}")
+
+    def close(self) -> None:
+        """백그라운드 기록을 멈추고 남은 변경을 스냅샷으로 정리"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if self._pending or self._journal_ops:
+                self._compact()
+
+    def _expired(self, saved_time: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - saved_time > self.ttl_seconds
+
+    def _evict(self) -> None:
+        """max_entries를 넘는 만큼 가장 오래 쓰이지 않은 엔트리를 제거 (락 보유 상태에서 호출).
+
+        밀려난 엔트리의 DB는 인덱스를 더 이상 완전하다고 볼 수 없으므로 인덱스 기록도 지웁니다.
+        페이지의 지문·버전과 그 키를 가리키는 컨테이너 ID 인덱스도 함께 지워, 상한이 메모리와
+        스냅샷 전체에 적용되게 합니다(다시 쓰이면 검색 후 한 번 더 쓰는 것으로 복구됨).
+        아웃박스는 아직 반영되지 않은 쓰기이므로 남깁니다.
+        """
+        if self.max_entries <= 0 or len(self.cache_data) <= self.max_entries:
+            return
+        evicted: set[str] = set()
+        while len(self.cache_data) > self.max_entries:
+            key, entry = self.cache_data.popitem(last=False)
+            evicted.add(key)
+            self._evictions += 1
+            self._record("pages", key, None)
+            page_id = str(entry.get("page_id"))
+            if self.fingerprints.pop(page_id, None) is not None:
+                self._record("fingerprints", page_id, None)
+            database_id = key.split("/", 1)[0]
+            if self.indexes.pop(database_id, None) is not None:
+                self._record("indexes", database_id, None)
+        for container_id in [cid for cid, entry in self.containers.items() if entry["key"] in evicted]:
+            del self.containers[container_id]
+            self._record("containers", container_id, None)
+
+    def get_page_id(self, key: str) -> str | None:
+        """페이지 키(page_key)로 캐시된 페이지 ID를 조회. TTL 검사 포함."""
+        cache_logger.debug("Retrieving page ID from cache for key: %s", key)
+        with self._lock:
+            entry = self.cache_data.get(key)
+            if not entry:
+                self._misses += 1
+                CACHE_MISSES.inc()
+                return None
+
+            saved_time = float(entry.get("timestamp", 0))
+            if self._expired(saved_time):
+                cache_logger.debug("Cache entry for key %s has expired. Removing from cache.", key)
+                del self.cache_data[key]
+                self._record("pages", key, None)
+                self._misses += 1
+                CACHE_MISSES.inc()
+                return None
+
+            self._hits += 1
+            CACHE_HITS.inc()
+            self.cache_data.move_to_end(key)
+            return str(entry.get("page_id"))
+
+    def set_page_id(self, key: str, page_id: str, container_id: str = "") -> None:
+        """페이지 키에 대한 페이지 ID를 캐시에 저장. container_id를 주면 컨테이너 ID 인덱스도 갱신."""
+        cache_logger.debug("Setting page ID in cache for key: %s", key)
+        with self._lock:
+            self.cache_data[key] = {
+                "page_id": page_id,
+                "timestamp": time.time(),
+            }
+            self.cache_data.move_to_end(key)
+            self._record("pages", key, self.cache_data[key])
+            if container_id:
+                self.set_container_page(container_id, key, page_id)
+            self._evict()
+
+    def remove_page_id(self, key: str, container_id: str = "") -> None:
+        """페이지 키에 대한 캐시된 페이지 ID를 제거. container_id를 주면 컨테이너 ID 인덱스에서도 제거."""
+        cache_logger.debug("Removing page ID from cache for key: %s", key)
+        with self._lock:
+            if key in self.cache_data:
+                del self.cache_data[key]
+                self._record("pages", key, None)
+            if container_id:
+                self.remove_container_page(container_id)
+
+    def remove_container_page(self, container_id: str) -> None:
+        """컨테이너 ID 인덱스에서 엔트리를 제거 (이름 기준 매핑은 그대로 둠)."""
+        with self._lock:
+            if container_id in self.containers:
+                del self.containers[container_id]
+                self._record("containers", container_id, None)
+
+    def get_container_page(self, container_id: str) -> tuple[str, str] | None:
+        """컨테이너 ID로 (페이지 키, 페이지 ID)를 조회. 없으면 None.
+
+        이름 기준 매핑과 달리 TTL이 없습니다. 컨테이너 ID는 재사용되지 않으므로 페이지가
+        사라진 경우(404)에만 호출측이 제거하며, 이름이 바뀐 컨테이너도 검색 없이 페이지를 찾습니다.
+        """
+        with self._lock:
+            entry = self.containers.get(container_id)
+            if not entry:
+                return None
+            return str(entry["key"]), str(entry["page_id"])
+
+    def set_container_page(self, container_id: str, key: str, page_id: str) -> None:
+        """컨테이너 ID 인덱스에 (페이지 키, 페이지 ID)를 기록. 이미 같은 값이면 저널에 쓰지 않음."""
+        entry = {"key": key, "page_id": page_id}
+        with self._lock:
+            if self.containers.get(container_id) != entry:
+                self.containers[container_id] = entry
+                self._record("containers", container_id, entry)
+
+    def move_page_id(self, container_id: str, new_key: str) -> str | None:
+        """이름이 바뀐 컨테이너의 페이지 매핑을 새 페이지 키로 옮기고 페이지 ID를 반환 (인덱스에 없으면 None).
+
+        옛 키가 같은 페이지를 가리키고 있으면 지워, 나중에 같은 이름으로 생기는 다른 컨테이너가
+        이 페이지를 잘못 이어받지 않게 합니다.
+        """
+        with self._lock:
+            entry = self.containers.get(container_id)
+            if not entry:
+                return None
+            old_key, page_id = entry["key"], entry["page_id"]
+            if old_key in self.cache_data and self.cache_data[old_key].get("page_id") == page_id:
+                del self.cache_data[old_key]
+                self._record("pages", old_key, None)
+            self.set_page_id(new_key, page_id, container_id)
+            return page_id
+
+    def prune_containers(self, host: str, live_ids: set[str]) -> int:
+        """전체 목록에 없는(끊긴 동안 삭제된) 호스트의 컨테이너를 ID 인덱스에서 제거하고 제거 수를 반환."""
+        with self._lock:
+            stale = [
+                container_id
+                for container_id, entry in self.containers.items()
+                if container_id not in live_ids and _key_host(entry["key"]) == host
+            ]
+            for container_id in stale:
+                del self.containers[container_id]
+                self._record("containers", container_id, None)
+            return len(stale)
+
+    def get_fingerprint(self, page_id: str) -> str | None:
+        """페이지에 마지막으로 반영한 속성 지문을 조회. 없으면 None.
+
+        페이지 ID 매핑과 달리 TTL이 없습니다. 지문은 '마지막으로 성공한 쓰기'의 기록이라
+        시간이 지나도 틀려지지 않으며, 페이지가 사라지면(404) 호출측에서 제거합니다.
+        """
+        with self._lock:
+            entry = self.fingerprints.get(page_id)
+            if not entry:
+                return None
+            return str(entry.get("hash"))
+
+    def get_pushed_at(self, page_id: str) -> float:
+        """페이지에 마지막으로 쓰기를 반영한 시각(epoch 초). 기록이 없으면 0."""
+        with self._lock:
+            entry = self.fingerprints.get(page_id)
+            if not entry:
+                return 0.0
+            return float(entry.get("pushed_at", 0))
+
+    def get_version(self, page_id: str) -> int:
+        """페이지에 반영한 상태 중 가장 높은 버전(DockerContainerInfo.version). 기록이 없으면 0."""
+        with self._lock:
+            entry = self.fingerprints.get(page_id)
+            if not entry:
+                return 0
+            return int(entry.get("version", 0))
+
+    def set_fingerprint(self, page_id: str, fingerprint: str, version: int = 0) -> None:
+        """페이지에 반영한 속성 지문과 반영 시각, 버전을 저장 (버전은 내려가지 않음)"""
+        cache_logger.debug("Setting fingerprint in cache for page: %s", page_id)
+        with self._lock:
+            previous = self.fingerprints.get(page_id) or {}
+            self.fingerprints[page_id] = {
+                "hash": fingerprint,
+                "pushed_at": time.time(),
+                "version": max(int(previous.get("version", 0)), version),
+            }
+            self._record("fingerprints", page_id, self.fingerprints[page_id])
+
+    def touch_fingerprint(self, page_id: str, version: int = 0) -> None:
+        """지문은 그대로 두고 반영 시각과 버전만 갱신 (Seen 단독 갱신 후 호출)"""
+        with self._lock:
+            entry = self.fingerprints.get(page_id)
+            if entry:
+                entry["pushed_at"] = time.time()
+                entry["version"] = max(int(entry.get("version", 0)), version)
+                self._record("fingerprints", page_id, entry)
+
+    def remove_fingerprint(self, page_id: str) -> None:
+        """페이지의 지문을 제거 (페이지 삭제 감지 시)"""
+        cache_logger.debug("Removing fingerprint from cache for page: %s", page_id)
+        with self._lock:
+            if page_id in self.fingerprints:
+                del self.fingerprints[page_id]
+                self._record("fingerprints", page_id, None)
+
+    def load_index(
+        self, database_id: str, pages: dict[str, str], complete: bool, synced_at: float
+    ) -> None:
+        """데이터베이스 스캔 결과({Name 또는 Host/Name: page_id})를 한 번에 캐시에 적재.
+
+        - complete=True  : 전체 스캔. 결과에 없는 해당 DB 엔트리는 삭제된 페이지로 보고 제거
+        - complete=False : 증분 스캔. 수정분을 덮어쓰고, 나머지 엔트리는 유효 기간만 연장
+          (그 사이 삭제된 페이지는 업데이트 시 404로 감지되어 재생성됩니다)
+
+        스캔은 이벤트 처리와 동시에 진행되므로, 스캔을 시작한(synced_at) 뒤에 기록된 엔트리는
+        스캔 결과보다 새것입니다. 지우지도 덮어쓰지도 않아야 스캔 도중 만든 페이지를 잃고
+        '페이지 없음'으로 판단해 한 번 더 만드는 일이 없습니다.
+        """
+        cache_logger.debug(
+            f"Loading {len(pages)} index entries for database {database_id} (complete={complete})"
+        )
+        with self._lock:
+            prefix = page_key(database_id, "")
+            now = time.time()
+            newer = {
+                key for key, entry in self.cache_data.items()
+                if key.startswith(prefix) and float(entry["timestamp"]) >= synced_at
+            }
+            for key in [k for k in self.cache_data if k.startswith(prefix) and k not in newer]:
+                if complete:
+                    del self.cache_data[key]
+                else:
+                    self.cache_data[key]["timestamp"] = now
+            for name, page_id in pages.items():
+                key = page_key(database_id, name)
+                if key not in newer:
+                    self.cache_data[key] = {"page_id": page_id, "timestamp": now}
+            self.indexes[database_id] = {"synced_at": synced_at}
+            if self.max_entries > 0 and len(self.cache_data) > self.max_entries:
+                # 상한보다 큰 DB는 인덱스 전체를 담을 수 없으므로 개별 검색 경로를 유지
+                cache_logger.warning(
+                    f"Index of database {database_id} exceeds max entries ({self.max_entries})."
+                )
+                self._evict()
+            # 대량 변경은 레코드를 하나씩 쌓는 대신 스냅샷 한 번으로 기록
+            self._compact()
+
+    def get_index_time(self, database_id: str) -> float:
+        """데이터베이스 인덱스를 마지막으로 스캔한 시각(epoch 초). 없으면 0."""
+        with self._lock:
+            entry = self.indexes.get(database_id)
+            if not entry:
+                return 0.0
+            return float(entry.get("synced_at", 0))
+
+    def has_fresh_index(self, database_id: str) -> bool:
+        """TTL 안에 스캔한 인덱스가 있는지. 있으면 캐시 미스는 '페이지 없음'으로 간주할 수 있음."""
+        with self._lock:
+            synced_at = self.get_index_time(database_id)
+            return synced_at > 0 and not self._expired(synced_at)
+
+    def get_meta(self, name: str) -> Any:
+        """기타 상태 값을 조회. 없으면 None."""
+        with self._lock:
+            return self.meta.get(name)
+
+    def set_meta(self, name: str, value: Any) -> None:
+        """기타 상태 값을 저장 (JSON 직렬화 가능한 값)"""
+        with self._lock:
+            if self.meta.get(name) != value:
+                self.meta[name] = value
+                self._record("meta", name, value)
+
+    def put_outbox(
+        self, key: str, state: dict[str, Any], retry_seconds: float, max_retry_seconds: float
+    ) -> None:
+        """페이지를 바꾸기 직전에 원하는 상태를 아웃박스에 기록 (write-ahead).
+
+        같은 키의 이전 상태는 대체되어 페이지마다 최신 상태 하나만 남습니다. 다만 이미 있는
+        상태의 버전(state["version"])이 더 높으면 그대로 둡니다. 엔트리가 이미 있으면(앞선 쓰기가
+        실패) 실패 횟수를 늘리고, 재시도 시각을 retry_seconds부터 두 배씩 max_retry_seconds까지 미룹니다.
+        """
+        with self._lock:
+            previous = self.outbox.get(key)
+            if previous and _state_version(previous["state"]) > _state_version(state):
+                return
+            attempts = int(previous["attempts"]) + 1 if previous else 0
+            delay = min(retry_seconds * 2 ** attempts, max_retry_seconds)
+            self.outbox[key] = {"state": state, "attempts": attempts, "due": time.time() + delay}
+            self._record("outbox", key, self.outbox[key])
+
+    def defer_outbox(self, key: str, delay: float) -> None:
+        """아웃박스 엔트리의 재시도를 최소 delay초 뒤로 미룸 (Retry-After 등 서버가 요구한 대기)"""
+        with self._lock:
+            entry = self.outbox.get(key)
+            if entry and entry["due"] < time.time() + delay:
+                entry["due"] = time.time() + delay
+                self._record("outbox", key, entry)
+
+    def get_outbox(self, key: str) -> dict[str, Any] | None:
+        """아웃박스에 남은 페이지의 최신 상태. 없으면(반영 완료) None."""
+        with self._lock:
+            entry = self.outbox.get(key)
+            return dict(entry["state"]) if entry else None
+
+    def remove_outbox(self, key: str, version: int | None = None) -> None:
+        """페이지 상태가 Notion에 반영되었으므로 아웃박스에서 제거.
+
+        version을 주면 그보다 새 버전의 상태가 기다리고 있을 때는 남겨 둡니다(그 상태는 아직 미반영).
+        """
+        with self._lock:
+            entry = self.outbox.get(key)
+            if entry is None or (version is not None and _state_version(entry["state"]) > version):
+                return
+            del self.outbox[key]
+            self._record("outbox", key, None)
+
+    def due_outbox(self, now: float | None = None) -> list[tuple[str, dict[str, Any]]]:
+        """재시도 시각이 지난 아웃박스 엔트리 [(키, 상태)]. 오래 기다린 것부터."""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = sorted((entry["due"], key) for key, entry in self.outbox.items() if entry["due"] <= now)
+            return [(key, dict(self.outbox[key]["state"])) for _, key in due]
+
+    def outbox_size(self) -> int:
+        """아웃박스에 남은 페이지 수"""
+        with self._lock:
+            return len(self.outbox)
+
+    def stats(self) -> CacheStats:
+        """적중률과 메모리 근사치를 포함한 캐시 통계"""
+        with self._lock:
+            approx = sys.getsizeof(self.cache_data) + sys.getsizeof(self.fingerprints) + sys.getsizeof(self.containers)
+            for section in (self.cache_data, self.fingerprints, self.containers):
+                for key, entry in section.items():
+                    approx += sys.getsizeof(key) + sys.getsizeof(entry)
+                    approx += sum(sys.getsizeof(value) for value in entry.values())
+            return CacheStats(
+                entries=len(self.cache_data),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                approx_bytes=approx,
             )
-            del self.cache_data[container_name]
-            self._save_cache()
-            return None
-
-        return str(entry.get("page_id"))
-
-    def set_page_id(self, container_name: str, page_id: str) -> None:
-        """컨테이너 이름에 대한 페이지 ID를 캐시에 저장"""
-        cache_logger.debug(f"Setting page ID in cache for container: {container_name}")
-        self.cache_data[container_name] = {
-            "page_id": page_id,
-            "timestamp": time.time(),
-        }
-        self._save_cache()
-
-    def remove_page_id(self, container_name: str) -> None:
-        """컨테이너 이름에 대한 캐시된 페이지 ID를 제거"""
-        cache_logger.debug(f"Removing page ID from cache for container: {container_name}")
-        if container_name in self.cache_data:
-            del self.cache_data[container_name]
-            self._save_cache()
@@ -0,0 +1,115 @@
+"""데이터베이스별 서킷 브레이커와 동시 처리 상한(bulkhead).
+
+공유되지 않았거나 잘못 설정된 DB, 과부하 상태의 DB로 가는 쓰기가 재시도를 반복하며 워커를
+붙잡으면 다른 DB의 갱신까지 늦어집니다. DB마다 연속 실패가 쌓이면 회로를 열어 즉시 실패(아웃박스로
+미룸)시키고, 일정 시간 뒤 한 건만 시험(half-open)해 회복 여부를 확인합니다. 동시 처리 상한은
+느린 DB 하나가 차지할 수 있는 워커 수를 제한합니다.
+"""
+
+import threading
+import time
+from typing import Callable
+from src.metrics import NOTION_BREAKER_STATE
+from src.logger import main_logger
+
+# 상태별 메트릭 값
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitBreaker:
+    """연속 실패 failure_threshold회에 열리고, reset_timeout초 뒤 시험 호출 하나를 허용하는 회로.
+
+    - closed    : 모두 허용. 성공하면 실패 횟수 초기화
+    - open      : 모두 거부. reset_timeout이 지나면 다음 allow() 한 건이 half_open 시험 호출이 됨
+    - half_open : 시험 호출 결과를 기다리는 동안 나머지는 거부. 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        NOTION_BREAKER_STATE.set(_STATE_VALUES["closed"], name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, state: str) -> None:
+        """상태 변경 (락 보유 상태에서 호출). open으로 갈 때마다 대기 시간을 새로 잼."""
+        previous, self._state = self._state, state
+        NOTION_BREAKER_STATE.set(_STATE_VALUES[state], self.name)
+        if state == "open":
+            self._opened_at = self._clock()
+            if previous == "closed":
+                main_logger.warning(
+                    f"Circuit for database {self.name} opened after {self._failures} failures. "
+                    f"Probing again in {self.reset_timeout:.0f}s."
+                )
+        elif state == "closed" and previous != "closed":
+            main_logger.info(f"Circuit for database {self.name} closed.")
+
+    def allow(self) -> bool:
+        """호출을 보내도 되는지. open에서 대기 시간이 지났으면 이 호출이 시험 호출이 됨."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+                self._transition("half_open")
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """다음 시험 호출까지 남은 시간(초). 열려 있지 않으면 0."""
+        with self._lock:
+            if self._state != "open":
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != "closed":
+                self._transition("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or (
+                self._state == "closed" and self._failures >= self.failure_threshold
+            ):
+                self._transition("open")
+
+    def release(self) -> None:
+        """allow()로 받은 시험 호출에서 Notion을 부르지 않았을 때 호출. 다음 allow()가 다시 시험함."""
+        with self._lock:
+            if self._state == "half_open":
+                self._state = "open"
+                NOTION_BREAKER_STATE.set(_STATE_VALUES["open"], self.name)
+
+
+class DatabaseGuard:
+    """DB 하나의 서킷 브레이커와 동시 처리 상한. concurrency가 0이면 상한 없음."""
+
+    def __init__(self, database_id: str, failure_threshold: int, reset_timeout: float, concurrency: int) -> None:
+        self.breaker = CircuitBreaker(database_id, failure_threshold, reset_timeout)
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency > 0 else None
+
+    def try_enter(self, timeout: float) -> bool:
+        """처리 자리를 얻음. timeout초 안에 자리가 나지 않으면 False (호출측은 미뤄야 함)."""
+        return self._slots is None or self._slots.acquire(timeout=timeout)
+
+    def leave(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
@@ -0,0 +1,91 @@
+"""Notion 동시 호출 수를 스스로 조절하는 AIMD 제어기.
+
+워크스페이스의 요청 예산을 다른 통합이 얼마나 쓰는지에 따라 알맞은 동시 호출 수가 달라지므로,
+고정 값 대신 TCP 혼잡 제어처럼 조절합니다. 응답이 빠르고 429/5xx가 없으면 상한을 조금씩(가산)
+올리고, 429/5xx/타임아웃을 받으면 절반으로(승산) 줄입니다. 평균 속도는 여전히 토큰 버킷
+(src.rate_limiter)이 지키고, 이 제어기는 동시에 나가 있는 호출 수만 제한합니다.
+"""
+
+import threading
+import time
+from typing import Callable
+
+# 동시 호출 상한의 시작값·하한
+_INITIAL_LIMIT = 4.0
+_MIN_LIMIT = 1.0
+
+# 과부하 신호 시 상한 감소 배율
+_DECREASE_FACTOR = 0.5
+
+# 기준 지연(관측 최솟값)의 이 배수까지를 정상 응답으로 봄. 아주 빠른 응답은 흔들림이 크므로 하한을 둠
+_LATENCY_TOLERANCE = 2.0
+_MIN_LATENCY_TARGET = 0.1  # 초
+
+# 기준 지연을 응답마다 이 비율만큼 올려, 네트워크 경로가 바뀌어도 옛 최솟값에 묶이지 않게 함
+_BASELINE_DRIFT = 0.01
+
+
+class AdaptiveConcurrency:
+    """가산 증가·승산 감소(AIMD)로 동시 호출 상한을 조절하는 스레드 안전 세마포어.
+
+    - acquire()         : 나가 있는 호출이 상한보다 적어질 때까지 기다린 뒤 시작 시각을 반환
+    - release(started, overloaded)
+        * overloaded=False : 정상 응답. 지연이 정상 범위이고 상한의 절반 이상을 쓰고 있었다면 상한을
+                             1/limit만큼 올림 (한 창 분량의 응답마다 약 1 증가)
+        * overloaded=True  : 429/5xx/타임아웃. 상한을 절반으로 줄임. 마지막 감소 전에 출발한 호출의
+                             신호는 같은 혼잡으로 보고 다시 줄이지 않음
+        * overloaded=None  : 속도와 무관한 오류(404 등). 상한을 바꾸지 않음
+    """
+
+    def __init__(
+        self,
+        maximum: float,
+        initial: float = _INITIAL_LIMIT,
+        minimum: float = _MIN_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maximum = max(float(maximum), minimum)
+        self.minimum = minimum
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._limit = min(max(float(initial), minimum), self.maximum)
+        self._in_flight = 0
+        self._baseline = 0.0
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        """현재 동시 호출 상한."""
+        with self._cond:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        with self._cond:
+            return self._in_flight
+
+    def acquire(self) -> float:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            return self._clock()
+
+    def release(self, started: float, overloaded: bool | None) -> None:
+        with self._cond:
+            # 상한의 절반도 쓰지 않는 동안에는 늘려 봐야 확인되지 않은 여유이므로 올리지 않음
+            busy = self._in_flight * 2 >= self._limit
+            self._in_flight -= 1
+            if overloaded:
+                if started >= self._last_decrease:
+                    self._limit = max(self.minimum, self._limit * _DECREASE_FACTOR)
+                    self._last_decrease = self._clock()
+            elif overloaded is not None:
+                latency = self._clock() - started
+                self._baseline = (
+                    latency if self._baseline <= 0 else min(latency, self._baseline * (1 + _BASELINE_DRIFT))
+                )
+                healthy = latency <= max(self._baseline * _LATENCY_TOLERANCE, _MIN_LATENCY_TARGET)
+                if healthy and busy:
+                    self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._cond.notify_all()
@@ -0,0 +1,100 @@
+"""컨테이너별 이벤트 디바운스(합치기).
+
+`docker compose down`/`restart`는 stop → die → destroy, die → start → restart 같은 이벤트를
+수 밀리초 안에 연달아 만듭니다. 각 이벤트마다 inspect + Notion 쓰기를 하면 마지막 쓰기만
+의미가 있으므로, 컨테이너 ID별로 창(window) 동안 들어온 이벤트를 가장 마지막 것 하나로
+합친 뒤 창이 끝날 때 내보냅니다. destroy는 이후에 무엇이 오더라도 최종 상태로 유지됩니다.
+"""
+
+import threading
+import time
+from typing import Any, Callable
+from src.logger import main_logger
+
+Event = dict[str, Any]
+
+
+class Debouncer:
+    """키(컨테이너 ID)별로 window초 동안의 이벤트를 합쳐 emit으로 내보냄.
+
+    창은 키의 첫 이벤트 시점부터 잽니다(새 이벤트가 와도 연장하지 않음). 재시작 루프처럼
+    이벤트가 끊이지 않는 컨테이너도 최대 window초 지연으로 상태가 반영됩니다.
+    window가 0 이하이면 합치지 않고 즉시 내보냅니다.
+    """
+
+    def __init__(self, window: float, emit: Callable[[str, Event], None]) -> None:
+        self.window = window
+        self._emit = emit
+        self._cond = threading.Condition()
+        # key -> [마감 시각, 최신 이벤트, 합쳐진 이벤트 수]
+        self._pending: dict[str, list[Any]] = {}
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+        if window > 0:
+            self._thread = threading.Thread(target=self._run, name="d2n-debounce", daemon=True)
+            self._thread.start()
+
+    def submit(self, key: str, event: Event) -> None:
+        """이벤트를 받아 창이 끝날 때까지 보관. 같은 키의 이전 이벤트는 대체(destroy는 유지)."""
+        if self.window <= 0:
+            self._emit(key, event)
+            return
+
+        with self._cond:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [time.monotonic() + self.window, event, 1]
+                self._cond.notify()
+                return
+            entry[2] += 1
+            if entry[1].get("Action") != "destroy":
+                entry[1] = event
+
+    def pending(self) -> int:
+        """창이 끝나기를 기다리는 키 수."""
+        with self._cond:
+            return len(self._pending)
+
+    def _pop_due(self, now: float, flush_all: bool) -> list[tuple[str, Event, int]]:
+        due = [
+            key for key, (deadline, _, _) in self._pending.items() if flush_all or deadline <= now
+        ]
+        return [(key, *self._pending.pop(key)[1:]) for key in due]
+
+    def _release(self, items: list[tuple[str, Event, int]]) -> None:
+        for key, event, merged in items:
+            if merged > 1:
+                main_logger.debug("Coalesced %d events for %s into %s", merged, key, event.get("Action"))
+            try:
+                self._emit(key, event)
+            except Exception as e:
+                main_logger.error(f"Failed to dispatch debounced event for {key}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    now = time.monotonic()
+                    deadlines = [entry[0] for entry in self._pending.values()]
+                    if deadlines and min(deadlines) <= now:
+                        break
+                    self._cond.wait(timeout=min(deadlines) - now if deadlines else None)
+                if self._stopped:
+                    return
+                items = self._pop_due(time.monotonic(), flush_all=False)
+            self._release(items)
+
+    def flush(self) -> None:
+        """창과 관계없이 보관 중인 이벤트를 모두 즉시 내보냄."""
+        with self._cond:
+            items = self._pop_due(time.monotonic(), flush_all=True)
+        self._release(items)
+
+    def stop(self) -> None:
+        """보관 중인 이벤트를 내보내고 타이머 스레드를 종료."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
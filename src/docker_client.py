@@ -1,13 +1,18 @@
 import re
+import json
 import ipaddress
+import threading
+import time
+from dataclasses import dataclass, replace
 from typing import Any, Iterator
-from datetime import datetime
+from datetime import datetime, timedelta, timezone as dt_timezone
 from zoneinfo import ZoneInfo
-from docker import from_env
-from docker.errors import NotFound
+from docker import DockerClient as _DockerSDKClient, from_env
+from docker.errors import DockerException, NotFound
 from config.settings import Settings
+from src.metrics import DOCKER_INSPECT_SECONDS, timed
 from src.models import DockerContainerInfo
-from src.status import normalize_status
+from src.status import NotionStatus, normalize_status
 from src.logger import docker_logger
 
 
@@ -16,9 +21,26 @@ from src.logger import docker_logger
 # 입력은 container.attrs (inspect 결과) 딕셔너리입니다.
 # ---------------------------------------------------------------------------
 
+# 동기화 대상 라벨. 목록/이벤트 조회 시 데몬 쪽 필터로 사용 (값 판정은 클라이언트에서)
+D2N_ENABLED_LABEL = "d2n.enabled"
+
+# 이미지·생성 시각·네트워크 구성을 바꾸지 않고 상태만 바꾸는 이벤트 -> 결과 상태.
+# 이 이벤트는 inspect 없이 이벤트 내용과 마지막으로 확인한 정적 속성으로 상태를 구성합니다.
+_STATUS_ONLY_EVENTS: dict[str, str] = {
+    "stop": NotionStatus.EXITED,
+    "die": NotionStatus.EXITED,
+    "pause": NotionStatus.PAUSED,
+    "unpause": NotionStatus.RUNNING,
+}
+
 # 나노초(>6자리) 소수부를 마이크로초(6자리)로 절삭하기 위한 패턴
 _FRACTION_RE = re.compile(r"(\.\d{6})\d+")
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# 데몬 시계가 로컬 시계와 이만큼(ns) 넘게 다르면 경고
+_CLOCK_SKEW_WARNING = 1_000_000_000
+
 
 def is_host_network(attrs: dict[str, Any]) -> bool:
     """컨테이너가 host 네트워크 모드인지 판별."""
@@ -123,11 +145,12 @@ def parse_stack(labels: dict[str, str]) -> str:
     )
 
 
-def to_local_iso(timestamp: str, timezone: str) -> str:
+def to_local_iso(timestamp: str, timezone: str, timespec: str = "auto") -> str:
     """Docker의 RFC3339 타임스탬프를 지정 타임존 기준 ISO 8601 문자열로 변환.
 
     - 빈 값 / Docker 영(zero) 타임스탬프 -> "" 반환
     - 나노초 정밀도는 마이크로초로 절삭하여 파싱 호환성 확보
+    - timespec은 datetime.isoformat과 동일 ("seconds"면 소수부 생략)
     """
     raw = (timestamp or "").strip()
     if not raw or raw.startswith("0001-01-01"):
@@ -139,7 +162,152 @@ def to_local_iso(timestamp: str, timezone: str) -> str:
         dt = datetime.fromisoformat(raw)
     except ValueError:
         return ""
-    return dt.astimezone(ZoneInfo(timezone)).isoformat()
+    return dt.astimezone(ZoneInfo(timezone)).isoformat(timespec=timespec)
+
+
+def docker_time_ns(timestamp: str) -> int | None:
+    """Docker의 RFC3339 타임스탬프를 유닉스 시각(ns)으로 변환. 해석할 수 없으면 None (마이크로초 정밀도)."""
+    raw = _FRACTION_RE.sub(r"\1", (timestamp or "").strip().replace("Z", "+00:00"))
+    try:
+        dt = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        return None
+    return (dt - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def epoch_to_local_iso(seconds: int | float | None, timezone: str) -> str:
+    """유닉스 시각(초)을 지정 타임존 기준 ISO 8601 문자열(초 단위)로 변환. 0/None이면 ""."""
+    if not seconds:
+        return ""
+    return datetime.fromtimestamp(seconds, ZoneInfo(timezone)).isoformat(timespec="seconds")
+
+
+def parse_summary_ports(ports: list[dict[str, Any]]) -> str:
+    """컨테이너 목록(/containers/json) 요약의 Ports 배열을 parse_ports와 같은 형식으로 변환.
+
+    요약은 바인딩마다 한 행({IP, PrivatePort, PublicPort, Type})이며,
+    노출만 된 포트는 IP/PublicPort가 없습니다.
+    """
+    entries: set[str] = set()
+    for port in ports or []:
+        cport = port.get("PrivatePort")
+        if cport is None:
+            continue
+        proto = port.get("Type") or ""
+        suffix = f"/{proto}" if proto else ""
+        host_ip = port.get("IP") or ""
+        host_port = port.get("PublicPort")
+
+        if not host_ip and not host_port:
+            entries.add(f"{cport}{suffix}")
+            continue
+        # IPv6 제외
+        if ":" in host_ip or not host_port:
+            continue
+        if host_ip in ("", "0.0.0.0"):
+            entries.add(f"{cport} → {host_port}{suffix}")
+        else:
+            entries.add(f"{cport} → {host_ip}:{host_port}{suffix}")
+
+    return "\n".join(sorted(entries))
+
+
+def container_info_from_summary(
+    summary: dict[str, Any], timezone: str, host: str = "", version: int = 0
+) -> DockerContainerInfo | None:
+    """컨테이너 목록 요약 한 건으로 DockerContainerInfo를 구성. inspect가 필요하면 None.
+
+    version은 목록을 요청한 시각(ns, 데몬 시계 기준)입니다. 요약은 그 이후의 상태이므로, 목록을 받는 동안
+    생긴 이벤트(더 큰 timeNano)는 목록보다 나중 상태로 취급됩니다.
+
+    요약에는 상태/포트/네트워크/라벨이 모두 있어 대부분 inspect 없이 충분하지만,
+    이름·상태가 비어 있거나 이미지가 태그 대신 ID(sha256:...)로만 남은 경우
+    (생성 당시 이미지 이름은 inspect의 Config.Image에만 있음)는 None을 반환합니다.
+    """
+    names = summary.get("Names") or []
+    state = summary.get("State") or ""
+    image = summary.get("Image") or ""
+    if not names or not state or not image or image.startswith("sha256:"):
+        return None
+
+    labels = summary.get("Labels") or {}
+    return DockerContainerInfo(
+        container_id=str(summary.get("Id") or ""),
+        name=str(names[0]).lstrip("/"),
+        status=normalize_status(state),
+        seen=datetime.now(ZoneInfo(timezone)).isoformat(),
+        ip=parse_ip(summary),
+        port=parse_summary_ports(summary.get("Ports") or []),
+        image=image,
+        created=epoch_to_local_iso(summary.get("Created"), timezone),
+        stack=parse_stack(labels),
+        d2n_enabled=labels.get(D2N_ENABLED_LABEL, "FALSE").upper() == "TRUE",
+        d2n_database=labels.get("d2n.database", ""),
+        host=host,
+        version=version,
+    )
+
+
+def container_info_from_event(
+    event: dict[str, Any], known: DockerContainerInfo, timezone: str
+) -> DockerContainerInfo | None:
+    """상태만 바꾸는 이벤트(stop/die/pause/unpause)를 마지막으로 확인한 정보에 적용. 그 외 이벤트면 None.
+
+    - exited  : 종료된 컨테이너는 IP와 포트 바인딩을 잃으므로 비움 (host 네트워크 표기는 유지)
+    - paused  : 네트워크가 그대로이므로 IP/포트 유지
+    - running : 일시 정지 전의 IP/포트 그대로 (unpause)
+    이름은 이벤트의 Actor.Attributes.name을 따르고, 버전은 이벤트의 timeNano입니다.
+    """
+    status = _STATUS_ONLY_EVENTS.get(str(event.get("Action") or ""))
+    if status is None:
+        return None
+
+    attributes = (event.get("Actor") or {}).get("Attributes") or {}
+    info = replace(
+        known,
+        name=str(attributes.get("name") or known.name).lstrip("/"),
+        status=status,
+        seen=datetime.now(ZoneInfo(timezone)).isoformat(),
+        version=int(event.get("timeNano") or 0),
+    )
+    if status == NotionStatus.EXITED:
+        info = replace(info, ip="host" if known.ip == "host" else "", port="")
+    return info
+
+
+def network_fingerprint(attrs: dict[str, Any]) -> str:
+    """parse_ip/parse_ports가 읽는 값(네트워크 모드, 네트워크별 IP, 포트 바인딩)만 모은 지문.
+
+    EndpointID 등 재시작마다 바뀌는 값은 빼서, IP/포트가 같으면 지문도 같게 합니다.
+    """
+    net_settings = attrs.get("NetworkSettings", {}) or {}
+    networks = net_settings.get("Networks", {}) or {}
+    return json.dumps(
+        [
+            (attrs.get("HostConfig", {}) or {}).get("NetworkMode", ""),
+            {name: (info or {}).get("IPAddress") or "" for name, info in networks.items()},
+            net_settings.get("Ports") or {},
+            net_settings.get("IPAddress") or "",
+        ],
+        sort_keys=True,
+    )
+
+
+@dataclass(slots=True)
+class _KnownContainer:
+    """DockerClient가 기억하는 컨테이너 한 개.
+
+    - updated_at    : 확인 시각(time.monotonic). 목록보다 새로 확인한 정보를 목록이 덮지 않게 함
+    - network_key   : info의 IP/포트를 파싱한 네트워크 설정 지문 (요약에서 만들었거나 모르면 None)
+    - network_stale : connect/disconnect 이후 아직 inspect하지 않아 IP/포트를 믿을 수 없음
+    """
+
+    info: DockerContainerInfo
+    updated_at: float
+    network_key: str | None = None
+    network_stale: bool = False
 
 
 # ---------------------------------------------------------------------------
@@ -148,25 +316,54 @@ def to_local_iso(timestamp: str, timezone: str) -> str:
 
 
 class DockerClient:
-    def __init__(self, settings: Settings) -> None:
-        """Docker 초기화 (설정 주입)."""
+    def __init__(
+        self,
+        settings: Settings,
+        api_url: str | None = None,
+        host: str = "",
+        require_connection: bool = True,
+    ) -> None:
+        """Docker 초기화 (설정 주입).
+
+        - api_url            : 데몬 주소 (미지정 시 settings.DOCKER_API_URL)
+        - host               : 호스트 이름. 여러 데몬을 감시할 때 컨테이너 정보와 캐시 키를 구분
+        - require_connection : False면 시작 시 데몬에 닿지 않아도 예외 없이 생성 (이벤트 루프가 재연결)
+        """
         self.settings = settings
-        self.docker_api_url = settings.DOCKER_API_URL
-        self.client = from_env(environment={"DOCKER_HOST": self.docker_api_url})
+        self.host = host
+        self.docker_api_url = api_url or settings.DOCKER_API_URL
+        # 컨테이너 ID -> 마지막으로 확인한 정보. 상태만 바뀌는 이벤트를 inspect 없이 처리하고
+        # inspect 결과의 정적 속성·네트워크 파싱을 재사용하는 데 사용
+        self._known: dict[str, _KnownContainer] = {}
+        self._known_lock = threading.Lock()
+        # 데몬 시계 - 로컬 시계 (ns). 전체 동기화 상태의 버전을 이벤트 timeNano와 같은 시계로 매기는 데 사용
+        self._clock_offset = 0
+        # 시작 시 데몬에 닿지 않았거나 재연결에 실패하면 None (이벤트 루프가 reconnect로 다시 만듦)
+        self.client: _DockerSDKClient | None = None
 
         docker_logger.info(f"Connecting to Docker daemon at {self.docker_api_url}...")
-
-        if not self.client.ping():
+        try:
+            self.client = from_env(environment={"DOCKER_HOST": self.docker_api_url})
+        except DockerException as e:
+            if require_connection:
+                raise
+            # 연결은 이벤트 루프의 ping/reconnect가 이어서 시도
+            docker_logger.warning(f"Docker daemon at {self.docker_api_url} not reachable yet: {e}")
+
+        if require_connection and not self.ping():
             docker_logger.error(f"Unable to connect to Docker daemon at {self.docker_api_url}")
             raise ConnectionError(f"Unable to connect to Docker daemon at {self.docker_api_url}")
 
     def disconnect(self) -> None:
         """Docker 클라이언트 연결 종료."""
         docker_logger.info("Disconnecting from Docker daemon...")
-        self.client.close()
+        if self.client is not None:
+            self.client.close()
 
     def ping(self) -> bool:
         """Docker 데몬 연결 상태 확인."""
+        if self.client is None:
+            return False
         try:
             return bool(self.client.ping())
         except Exception:
@@ -176,66 +373,207 @@ class DockerClient:
         """클라이언트를 재생성하여 데몬에 재연결. 성공 여부를 반환."""
         docker_logger.info("Reconnecting to Docker daemon...")
         try:
-            self.client.close()
+            if self.client is not None:
+                self.client.close()
         except Exception:
             pass
-        self.client = from_env(environment={"DOCKER_HOST": self.docker_api_url})
+        try:
+            self.client = from_env(environment={"DOCKER_HOST": self.docker_api_url})
+        except DockerException as e:
+            docker_logger.error(f"Unable to reconnect to Docker daemon at {self.docker_api_url}: {e}")
+            self.client = None
+            return False
         return self.ping()
 
-    def monitor_changes(self, filters: dict[str, Any] | None = None) -> Iterator[dict[str, Any]]:
-        """Docker 이벤트 모니터링 생성기."""
-        docker_logger.info("Starting to monitor Docker events...")
-        return self.client.events(decode=True, filters=filters)
+    def daemon_time_ns(self) -> int:
+        """데몬 시계 기준의 현재 시각(ns). 마지막으로 잰 시계 차이를 로컬 시각에 더함."""
+        return time.time_ns() + self._clock_offset
+
+    def sync_clock(self) -> None:
+        """데몬과의 시계 차이를 다시 잼 (연결되어 있지 않으면 이전 값 유지)."""
+        client = self.client
+        if client is not None:
+            self._measure_clock(client)
+
+    def _measure_clock(self, client: _DockerSDKClient) -> None:
+        """/info의 SystemTime으로 데몬과의 시계 차이를 잼 (오차는 왕복 시간의 절반 정도).
+
+        원격 데몬의 시계가 어긋나 있으면 로컬 시각으로 매긴 동기화 상태가 이벤트의 timeNano보다
+        앞서 이후의 die/destroy가 낡은 쓰기로 버려지므로, 동기화 상태도 데몬 시계로 매깁니다.
+        재지 못하면 이전 값을 유지합니다.
+        """
+        started = time.time_ns()
+        try:
+            system_time = (client.info() or {}).get("SystemTime")
+        except Exception as e:
+            docker_logger.warning(f"Unable to read clock of Docker daemon at {self.docker_api_url}: {e}")
+            return
+        daemon_ns = docker_time_ns(str(system_time or ""))
+        if daemon_ns is None:
+            return
+        offset = daemon_ns - (started + time.time_ns()) // 2
+        if abs(offset) > _CLOCK_SKEW_WARNING and abs(offset - self._clock_offset) > _CLOCK_SKEW_WARNING:
+            docker_logger.warning(
+                f"Docker daemon at {self.docker_api_url} clock differs from local clock by {offset / 1e9:.1f}s."
+            )
+        self._clock_offset = offset
+
+    def monitor_changes(
+        self, filters: dict[str, Any] | None = None, since: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Docker 이벤트 모니터링 생성기.
+
+        since(epoch 초)를 주면 데몬이 보관 중인 그 시각 이후 이벤트를 먼저 재생한 뒤 실시간으로 이어집니다.
+        """
+        client = self.client
+        if client is None:
+            raise ConnectionError(f"Docker daemon at {self.docker_api_url} is not connected")
+        docker_logger.info(f"Starting to monitor Docker events{f' since {since}' if since else ''}...")
+        return client.events(decode=True, filters=filters, since=since)
 
     def list_all_containers(self) -> list[DockerContainerInfo]:
-        """모든 Docker 컨테이너 정보를 리스트로 반환."""
-        docker_logger.info("Listing all Docker containers...")
+        """d2n.enabled 라벨이 붙은 컨테이너 정보를 리스트로 반환.
+
+        라벨 필터를 데몬에 넘겨 목록 호출 한 번으로 가져오고, 요약만으로 부족한 컨테이너만
+        개별 inspect합니다.
+        """
+        client = self.client
+        if client is None:
+            docker_logger.error(f"Cannot list containers: Docker daemon at {self.docker_api_url} is not connected")
+            return []
+        docker_logger.info("Listing labelled Docker containers...")
         containers = []
+        self._measure_clock(client)
+        listed_at = time.monotonic()
+        version = self.daemon_time_ns()
         try:
-            container_list = self.client.containers.list(all=True)
+            summaries = client.api.containers(
+                all=True, filters={"label": [D2N_ENABLED_LABEL]}
+            )
 
-            for c in container_list:
-                if not c.id:
+            inspected = 0
+            for summary in summaries:
+                container_id = str(summary.get("Id") or "")
+                if not container_id:
                     continue
-                info = self.get_container_info(str(c.id))
+                info = container_info_from_summary(summary, self.settings.TIMEZONE, self.host, version)
+                if info is None:
+                    inspected += 1
+                    info = self.get_container_info(container_id)
                 if info:
                     containers.append(info)
                 else:
-                    docker_logger.error(f"Failed to get info for container {c.id}")
+                    docker_logger.error(f"Failed to get info for container {container_id}")
+            docker_logger.debug(
+                f"Listed {len(summaries)} containers ({inspected} needed inspect)"
+            )
+            # 목록이 전체 상태이므로 끊긴 동안 삭제된 컨테이너의 정보도 정리.
+            # 목록을 받는 동안 이벤트로 갱신된 정보는 목록보다 새것이므로 유지
+            with self._known_lock:
+                known = {}
+                for info in containers:
+                    previous = self._known.get(info.container_id)
+                    if previous is not None and previous.updated_at > listed_at:
+                        known[info.container_id] = previous
+                    else:
+                        known[info.container_id] = _KnownContainer(info, listed_at)
+                self._known = known
         except Exception as e:
             docker_logger.error(f"Error listing containers: {e}")
 
         return containers
 
+    def container_from_event(self, event: dict[str, Any]) -> DockerContainerInfo | None:
+        """상태만 바꾸는 이벤트를 inspect 없이 적용한 정보. 그 외 이벤트이거나 모르는 컨테이너면 None.
+
+        네트워크 연결이 바뀐 뒤(invalidate_network)에는 IP/포트를 유지해야 하는 pause/unpause도
+        None을 반환해 inspect하게 합니다. stop/die는 어차피 네트워크 정보를 비우므로 그대로 적용합니다.
+        """
+        container_id = str(event.get("id") or (event.get("Actor") or {}).get("ID") or "")
+        with self._known_lock:
+            entry = self._known.get(container_id)
+            if entry is None:
+                return None
+            info = container_info_from_event(event, entry.info, self.settings.TIMEZONE)
+            if info is None or (entry.network_stale and info.status != NotionStatus.EXITED):
+                return None
+            self._known[container_id] = _KnownContainer(info, time.monotonic(), entry.network_key)
+        return info
+
+    def forget(self, container_id: str) -> None:
+        """컨테이너 정보를 버림. 삭제·이름 변경·설정 변경(update) 이벤트에서 호출해 다음에 새로 inspect."""
+        with self._known_lock:
+            self._known.pop(container_id, None)
+
+    def invalidate_network(self, container_id: str) -> None:
+        """네트워크 연결/해제(connect/disconnect)로 IP가 바뀌었을 수 있음. 이미지 등 정적 속성은 유지."""
+        with self._known_lock:
+            entry = self._known.get(container_id)
+            if entry is not None:
+                entry.network_key = None
+                entry.network_stale = True
+
+    @timed(DOCKER_INSPECT_SECONDS)
     def get_container_info(self, container_id: str) -> DockerContainerInfo | None:
-        """컨테이너 ID(또는 이름)로 상세 정보를 조회하여 DockerContainerInfo로 반환."""
-        docker_logger.debug(f"Getting info for container: {container_id}")
+        """컨테이너 ID(또는 이름)로 상세 정보를 조회하여 DockerContainerInfo로 반환.
+
+        이미 본 컨테이너면 이미지·생성 시각·스택·라벨은 캐시 값을 쓰고(컨테이너 ID가 같으면 바뀌지 않음),
+        IP/포트는 네트워크 설정의 지문이 같을 때 이전 파싱 결과를 재사용합니다.
+        버전은 inspect를 요청한 시각(ns, 데몬 시계 기준)입니다.
+        """
+        docker_logger.debug("Getting info for container: %s", container_id)
+        client = self.client
+        if client is None:
+            docker_logger.error(f"Cannot inspect {container_id}: Docker daemon at {self.docker_api_url} is not connected")
+            return None
+        version = self.daemon_time_ns()
         try:
-            container = self.client.containers.get(container_id)
-            attrs = container.attrs or {}
-
-            labels = (attrs.get("Config", {}) or {}).get("Labels", {}) or {}
-            d2n_enabled = labels.get("d2n.enabled", "FALSE").upper() == "TRUE"
-            d2n_database = labels.get("d2n.database", "")
-
-            image = (attrs.get("Config", {}) or {}).get("Image", "") or ""
-            created = to_local_iso(attrs.get("Created", ""), self.settings.TIMEZONE)
-
-            return DockerContainerInfo(
-                container_id=str(container.id or ""),
-                name=str(container.name or "").lstrip("/"),
-                status=normalize_status(container.status),
-                seen=datetime.now(ZoneInfo(self.settings.TIMEZONE)).isoformat(),
-                ip=parse_ip(attrs),
-                port=parse_ports(attrs),
-                image=image,
-                created=created,
-                stack=parse_stack(labels),
-                d2n_enabled=d2n_enabled,
-                d2n_database=d2n_database,
-            )
+            container = client.containers.get(container_id)
         except NotFound:
             return None
         except Exception as e:
             docker_logger.error(f"Error getting info for {container_id}: {e}")
             return None
+
+        attrs = container.attrs or {}
+        info_id = str(container.id or "")
+        network_key = network_fingerprint(attrs)
+        with self._known_lock:
+            entry = self._known.get(info_id)
+
+        if entry is not None and entry.network_key == network_key:
+            ip, port = entry.info.ip, entry.info.port
+        else:
+            ip, port = parse_ip(attrs), parse_ports(attrs)
+
+        if entry is not None:
+            static = entry.info
+            image, created, stack = static.image, static.created, static.stack
+            d2n_enabled, d2n_database = static.d2n_enabled, static.d2n_database
+        else:
+            labels = (attrs.get("Config", {}) or {}).get("Labels", {}) or {}
+            d2n_enabled = labels.get(D2N_ENABLED_LABEL, "FALSE").upper() == "TRUE"
+            d2n_database = labels.get("d2n.database", "")
+            stack = parse_stack(labels)
+            image = (attrs.get("Config", {}) or {}).get("Image", "") or ""
+            # 목록 요약(초 단위)과 같은 값이 되도록 초 단위로 맞춤 (쓰기 생략 지문 안정화)
+            created = to_local_iso(attrs.get("Created", ""), self.settings.TIMEZONE, "seconds")
+
+        info = DockerContainerInfo(
+            container_id=info_id,
+            name=str(container.name or "").lstrip("/"),
+            status=normalize_status(container.status),
+            seen=datetime.now(ZoneInfo(self.settings.TIMEZONE)).isoformat(),
+            ip=ip,
+            port=port,
+            image=image,
+            created=created,
+            stack=stack,
+            d2n_enabled=d2n_enabled,
+            d2n_database=d2n_database,
+            host=self.host,
+            version=version,
+        )
+        with self._known_lock:
+            self._known[info_id] = _KnownContainer(info, time.monotonic(), network_key)
+        return info
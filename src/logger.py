@@ -1,13 +1,49 @@
+import atexit
+import gzip
+import json
 import logging
 import os
+import queue
+import shutil
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Callable
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 if LOG_LEVEL not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
     print(f"Warning: Invalid LOG_LEVEL '{LOG_LEVEL}'. Defaulting to INFO.", file=sys.stderr)
     LOG_LEVEL = "INFO"
 
+
+def _env_flag(name: str, default: bool) -> bool:
+    """참/거짓 환경 변수 해석. 미지정이면 기본값."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+# 출력 형식: text(기본, 사람이 읽는 형식) 또는 json(한 줄에 JSON 하나, 로그 수집기용)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+if LOG_FORMAT not in ["text", "json"]:
+    print(f"Warning: Invalid LOG_FORMAT '{LOG_FORMAT}'. Defaulting to text.", file=sys.stderr)
+    LOG_FORMAT = "text"
+
+# 같은 메시지가 이 시간(초) 안에 반복되면 한 번만 기록하고 "repeated N times"로 요약 (0이면 끔)
+try:
+    LOG_DEDUP_SECONDS = max(0.0, float(os.getenv("LOG_DEDUP_SECONDS", "60")))
+except ValueError:
+    print("Warning: Invalid LOG_DEDUP_SECONDS. Defaulting to 60.", file=sys.stderr)
+    LOG_DEDUP_SECONDS = 60.0
+
+# 로그 기록(포맷팅·파일/콘솔 I/O·로테이션)을 백그라운드 스레드에서 처리할지 여부
+LOG_ASYNC = _env_flag("LOG_ASYNC", True)
+# 로테이션된 로그 파일을 gzip으로 압축할지 여부
+LOG_COMPRESS = _env_flag("LOG_COMPRESS", True)
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 if not os.path.exists(LOG_DIR):
@@ -60,26 +96,219 @@ class FileFormatter(logging.Formatter):
         return f"{asctime} {record.levelname:<8} {record.name:<8} {record.getMessage()}"
 
 
+class JsonFormatter(logging.Formatter):
+    """JSON Lines 포맷터. 로그 수집기가 정규식 없이 필드를 읽을 수 있도록 함.
+
+    `extra=`로 넘긴 구조화 필드(FIELDS)가 있으면 함께 기록합니다.
+    """
+
+    FIELDS = ("container", "action", "db", "page_id", "duration", "repeated")
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, object] = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RepeatFilter(logging.Filter):
+    """window초 안에 반복되는 동일 메시지(로거·레벨·본문 기준)를 억제.
+
+    처음 한 번은 그대로 통과시키고, 이후 같은 메시지는 세기만 합니다. 창이 지나면
+    drain()이 "repeated N times" 요약 레코드를 만들어 돌려주고, 요약 전에 같은 메시지가
+    다시 오면 그 레코드에 반복 횟수를 덧붙여 통과시킵니다. drain()은 창이 끝난 기록을
+    지우므로, 주기적으로 불러야(_summary_loop) 기억하는 메시지 수가 창 하나 분량으로 유지됩니다.
+    """
+
+    def __init__(self, window: float, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (로거, 레벨, 메시지) -> [창 시작 시각, 억제한 횟수]
+        self._seen: dict[tuple[str, int, str], list[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "repeated", None) is not None:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = self._clock()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                return False
+            suppressed = int(entry[1]) if entry is not None else 0
+            self._seen[key] = [now, 0]
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} (repeated {suppressed} more times)"
+            record.args = None
+            record.repeated = suppressed
+        return True
+
+    def drain(self, force: bool = False) -> list[logging.LogRecord]:
+        """창이 끝난(force면 전부) 억제 기록을 요약 레코드로 만들어 반환하고 정리."""
+        now = self._clock()
+        summaries = []
+        with self._lock:
+            for key, (started, count) in list(self._seen.items()):
+                if not force and now - started < self.window:
+                    continue
+                del self._seen[key]
+                if count:
+                    name, levelno, message = key
+                    summary = logging.LogRecord(
+                        name, levelno, "", 0,
+                        "Last message repeated %d times in %.0fs: %s",
+                        (int(count), self.window, message), None,
+                    )
+                    summary.repeated = int(count)
+                    summaries.append(summary)
+        return summaries
+
+
 def _rotated_namer(default_name: str) -> str:
-    """로테이션된 파일명을 'YYYY-MM-DD.log' 형태로 변환.
+    """로테이션된 파일명을 'YYYY-MM-DD.log' 형태로 변환 (압축 시 'YYYY-MM-DD.log.gz').
 
     기본값은 '.../d2n.log.2026-05-30' 이므로 '.../2026-05-30.log'로 바꿔
     기존의 날짜별 파일 관례를 유지합니다.
     """
     directory = os.path.dirname(default_name)
     date_suffix = default_name.rsplit(".", 1)[-1]
-    return os.path.join(directory, f"{date_suffix}.log")
+    return os.path.join(directory, f"{date_suffix}.log{'.gz' if LOG_COMPRESS else ''}")
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """로테이션 시 지난 로그 파일을 gzip으로 압축해 dest에 쓰고 원본을 삭제."""
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """레코드를 그대로 큐에 넣는 QueueHandler.
+
+    기본 prepare()는 호출 스레드에서 메시지를 포맷팅하지만, 같은 프로세스 안의 큐라
+    피클링이 필요 없으므로 %-스타일 인자 병합까지 리스너 스레드로 미룹니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _FilteringQueueListener(QueueListener):
+    """반복 억제 필터를 리스너 스레드에서 한 번만 적용하고, 창이 끝난 요약을 함께 기록."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        if _repeat_filter is not None:
+            for summary in _repeat_filter.drain():
+                super().handle(summary)
+            if not _repeat_filter.filter(record):
+                return
+        super().handle(record)
+
+
+def _emit_summaries(
+    repeat_filter: RepeatFilter, emit: Callable[[logging.LogRecord], None], force: bool = False
+) -> int:
+    """창이 끝난(force면 전부) 반복 요약을 emit으로 내보내고 내보낸 수를 반환."""
+    summaries = repeat_filter.drain(force)
+    for summary in summaries:
+        emit(summary)
+    return len(summaries)
+
+
+def _summary_loop(
+    repeat_filter: RepeatFilter,
+    emit: Callable[[logging.LogRecord], None],
+    interval: float,
+    stop: threading.Event,
+) -> None:
+    """interval초마다 반복 요약을 내보내는 백그라운드 루프.
+
+    다음 로그를 기다리지 않고 요약을 남기며, 동기 모드(LOG_ASYNC=0)에서도 억제 기록이 정리됩니다.
+    """
+    while not stop.wait(interval):
+        try:
+            _emit_summaries(repeat_filter, emit)
+        except Exception as e:
+            print(f"Warning: Failed to write repeated-log summary: {e}", file=sys.stderr)
+
+
+# 반복 요약을 내보내는 주기의 상한 (초). 창이 더 짧으면 창 길이마다
+_SUMMARY_INTERVAL = 5.0
 
 
 # 모든 로거가 공유하는 핸들러 (파일 핸들러를 하나만 두어 자정 로테이션 충돌 방지)
 _file_handler = TimedRotatingFileHandler(
     LOG_FILE_PATH, when="midnight", backupCount=30, encoding="utf-8"
 )
-_file_handler.setFormatter(FileFormatter())
+_file_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else FileFormatter())
 _file_handler.namer = _rotated_namer
+if LOG_COMPRESS:
+    _file_handler.rotator = _gzip_rotator
 
 _console_handler = logging.StreamHandler(sys.stdout)
-_console_handler.setFormatter(ColoredFormatter())
+_console_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else ColoredFormatter())
+
+_repeat_filter = RepeatFilter(LOG_DEDUP_SECONDS) if LOG_DEDUP_SECONDS > 0 else None
+
+# 비동기 모드: 로거는 큐에 넣기만 하고, 리스너 스레드가 포맷팅·I/O·로테이션(압축)을 맡음
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_queue_handler = _DeferredQueueHandler(_log_queue)
+_listener: QueueListener | None = None
+if LOG_ASYNC:
+    _listener = _FilteringQueueListener(_log_queue, _file_handler, _console_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _write_summary(record: logging.LogRecord) -> None:
+    """요약 레코드 하나를 기록. 비동기 모드면 리스너 큐로, 아니면 핸들러에 직접.
+
+    인터프리터 종료 중 이미 닫힌 스트림은 건너뜁니다.
+    """
+    if _listener is not None:
+        _log_queue.put(record)
+        return
+    for handler in (_file_handler, _console_handler):
+        stream = getattr(handler, "stream", None)
+        if stream is not None and not stream.closed and record.levelno >= handler.level:
+            handler.handle(record)
+
+
+_summary_stop = threading.Event()
+if _repeat_filter is not None:
+    threading.Thread(
+        target=_summary_loop,
+        args=(_repeat_filter, _write_summary, min(LOG_DEDUP_SECONDS, _SUMMARY_INTERVAL), _summary_stop),
+        name="d2n-log-summary",
+        daemon=True,
+    ).start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 기록하고 리스너 스레드를 종료 (프로세스 종료 시 자동 호출)."""
+    global _listener
+    _summary_stop.set()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    # 종료 직전까지 억제된 메시지의 요약을 남김
+    if _repeat_filter is not None:
+        _emit_summaries(_repeat_filter, _write_summary, force=True)
+
+
+atexit.register(shutdown_logging)
 
 
 def setup_logger(name: str) -> logging.Logger:
@@ -89,8 +318,13 @@ def setup_logger(name: str) -> logging.Logger:
     logger.propagate = False
 
     if not logger.handlers:
-        logger.addHandler(_file_handler)
-        logger.addHandler(_console_handler)
+        if LOG_ASYNC:
+            logger.addHandler(_queue_handler)
+        else:
+            logger.addHandler(_file_handler)
+            logger.addHandler(_console_handler)
+            if _repeat_filter is not None:
+                logger.addFilter(_repeat_filter)
 
     return logger
 
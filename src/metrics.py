@@ -0,0 +1,282 @@
+"""Prometheus 텍스트 포맷 메트릭과 선택적 HTTP 엔드포인트.
+
+외부 의존성 없이 카운터/게이지/히스토그램만 최소한으로 구현합니다. 메트릭 값은 항상
+집계되며(락 하나와 덧셈 수준의 비용), `metrics.enabled`가 켜져 있을 때만 HTTP 서버로 노출합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator, ParamSpec, TypeVar
+from src.logger import main_logger
+
+LabelValues = tuple[str, ...]
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, values: tuple[str, ...]) -> LabelValues:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        return tuple(str(v) for v in values)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """임의로 오르내리는 값. set_function으로 수집 시점에 값을 읽어 오게 할 수 있음."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, func: Callable[[], float], *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = func
+
+    def value(self, *labels: str) -> float:
+        key = self._key(labels)
+        with self._lock:
+            func = self._functions.get(key)
+            if func is None:
+                return self._values.get(key, 0.0)
+        return float(func())
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            keys = sorted(set(self._values) | set(self._functions))
+        for key in keys:
+            try:
+                value = self.value(*key)
+            except Exception:
+                continue
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (지연 시간 측정용)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = _DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [버킷별 개수..., 합계, 개수]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """with 블록의 소요 시간을 기록 (예외가 나도 기록)."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            data = self._values.get(self._key(labels))
+            return int(data[-1]) if data else 0
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, data in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, data):
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(count)}"
+                    )
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(data[-2])}")
+                lines.append(f"{self.name}_count{labels} {_format_value(data[-1])}")
+        return lines
+
+
+class Registry:
+    """메트릭 모음. render()로 Prometheus 텍스트 포맷을 생성."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def timed(histogram: Histogram, *labels: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """함수 호출 소요 시간을 histogram에 기록하는 데코레이터."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with histogram.time(*labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+# ---------------------------------------------------------------------------
+# D2N 메트릭 정의
+# ---------------------------------------------------------------------------
+
+DOCKER_INSPECT_SECONDS = Histogram(
+    "d2n_docker_inspect_seconds", "Latency of DockerClient.get_container_info"
+)
+DOCKER_EVENTS = Counter("d2n_docker_events_total", "Docker events received", ("action",))
+DOCKER_RECONNECTS = Counter("d2n_docker_reconnects_total", "Docker event stream reconnects")
+
+NOTION_REQUEST_SECONDS = Histogram(
+    "d2n_notion_request_seconds", "Latency of NotionClient methods including retries", ("method",)
+)
+NOTION_RETRIES = Counter("d2n_notion_retries_total", "Notion request retries", ("status",))
+NOTION_RATE_LIMITED = Counter("d2n_notion_rate_limited_total", "Notion 429 responses")
+NOTION_PAGE_NOT_FOUND = Counter("d2n_notion_page_not_found_total", "PageNotFoundError raised")
+NOTION_WRITES = Counter("d2n_notion_writes_total", "Notion write outcomes", ("outcome",))
+NOTION_BREAKER_STATE = Gauge(
+    "d2n_notion_breaker_state", "Circuit breaker state per database (0 closed, 1 half-open, 2 open)", ("database",)
+)
+NOTION_CONCURRENCY_LIMIT = Gauge(
+    "d2n_notion_concurrency_limit", "Current adaptive limit on concurrent Notion requests"
+)
+NOTION_DEFERRED = Counter(
+    "d2n_notion_deferred_total", "Page writes deferred to the outbox without calling Notion", ("database", "reason")
+)
+
+PROCESS_UPDATE_SECONDS = Histogram("d2n_process_update_seconds", "Latency of process_update")
+
+CACHE_HITS = Counter("d2n_cache_hits_total", "Page ID cache hits")
+CACHE_MISSES = Counter("d2n_cache_misses_total", "Page ID cache misses (including expiry)")
+
+OUTBOX_PAGES = Gauge("d2n_outbox_pages", "Pages waiting in the outbox for a Notion write")
+OUTBOX_REPLAYS = Counter("d2n_outbox_replays_total", "Outbox entries replayed by the drainer")
+
+EVENT_QUEUE_DEPTH = Gauge("d2n_event_queue_depth", "Events waiting in the work queue", ("host",))
+EVENT_LAG_SECONDS = Gauge(
+    "d2n_event_lag_seconds", "Time from the last handled Docker event to its Notion write"
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 (http.server 규약)
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        # 스크레이프마다 stderr에 접근 로그를 남기지 않음
+        return
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    """/metrics 를 제공하는 HTTP 서버를 데몬 스레드로 시작."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="d2n-metrics", daemon=True)
+    thread.start()
+    main_logger.info(f"Metrics endpoint listening on http://{host}:{server.server_port}/metrics")
+    return server
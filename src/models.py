@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 
 
 @dataclass(slots=True)
@@ -17,6 +18,9 @@ class DockerContainerInfo:
         stack (str): docker-compose 프로젝트(스택) 이름 (없으면 빈 문자열)
         d2n_enabled (bool): d2n.enabled 라벨
         d2n_database (str): d2n.database 라벨 (데이터베이스 "이름" 또는 빈 문자열)
+        host (str): 컨테이너가 있는 Docker 호스트 이름 (단일 호스트 구성이면 빈 문자열)
+        version (int): 상태를 관측한 시각(ns). 이벤트면 Docker 이벤트의 timeNano, 전체 동기화면
+            목록/inspect 조회 시각. 페이지에 이미 반영된 버전보다 낮으면 쓰지 않음 (0이면 알 수 없음)
     """
 
     container_id: str
@@ -30,3 +34,30 @@ class DockerContainerInfo:
     stack: str
     d2n_enabled: bool
     d2n_database: str
+    host: str = ""
+    version: int = 0
+
+
+@dataclass(slots=True)
+class SyncStats:
+    """Notion 쓰기 결과 집계. 지문(fingerprint) 비교로 아낀 호출 수를 확인하는 용도.
+
+    Attributes:
+        updated (int): 전체 속성을 갱신한 횟수
+        created (int): 새 페이지를 생성한 횟수
+        seen_only (int): 변경이 없어 Seen만 갱신한 횟수
+        skipped (int): 변경이 없어 쓰기를 생략한 횟수
+        stale (int): 더 새 버전이 이미 반영됐거나 대기 중이라 버린 쓰기 수
+    """
+
+    updated: int = 0
+    created: int = 0
+    seen_only: int = 0
+    skipped: int = 0
+    stale: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def record(self, outcome: str) -> None:
+        """결과("updated"/"created"/"seen_only"/"skipped"/"stale") 하나를 집계. 여러 워커에서 호출해도 안전."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import time
 from typing import Any, Callable, TypeVar, cast
 from notion_client import Client
@@ -7,16 +9,34 @@ from notion_client.errors import (
     HTTPResponseError,
     RequestTimeoutError,
 )
+from src.concurrency import AdaptiveConcurrency
+from src.metrics import (
+    NOTION_CONCURRENCY_LIMIT,
+    NOTION_PAGE_NOT_FOUND,
+    NOTION_RATE_LIMITED,
+    NOTION_REQUEST_SECONDS,
+    NOTION_RETRIES,
+    timed,
+)
 from src.models import DockerContainerInfo
+from src.priority import current_priority
+from src.rate_limiter import DEFAULT_BURST, DEFAULT_RATE, TokenBucket
 from src.logger import notion_logger
 
 T = TypeVar("T")
 
+# 동시 호출 상한의 기본 최댓값 (실제 상한은 이 안에서 AIMD로 조절)
+DEFAULT_MAX_CONCURRENCY = 16
+
 # 재시도 정책
 _MAX_RETRIES = 4
 _BASE_DELAY = 1.0   # 초
 _MAX_DELAY = 30.0   # 초
 
+# 전체 동기화 스레드의 조회(DB 스캔·정보 조회)가 재시도로 기다릴 수 있는 총 시간 (초).
+# 넘으면 포기하고 호출측 폴백(개별 검색)에 맡김
+_READ_RETRY_BUDGET = 5.0
+
 
 class PageNotFoundError(Exception):
     """Notion 페이지가 존재하지 않음(수동 삭제 등). 캐시 무효화 후 재생성 신호로 사용."""
@@ -26,6 +46,19 @@ class PageNotFoundError(Exception):
         self.page_id = page_id
 
 
+class RetryLaterError(Exception):
+    """일시 오류(429/5xx/타임아웃)로 쓰기(또는 쓰기 전의 페이지 검색)를 나중에 다시 보내야 함.
+
+    쓰기 메서드와 find_page_id는 호출 스레드에서 기다리지 않고 이 예외를 던지며,
+    호출측(process_update)이 retry_after초 뒤에 아웃박스에서 다시 처리되도록 예약합니다.
+    """
+
+    def __init__(self, label: str, status: int | str, retry_after: float) -> None:
+        super().__init__(f"{label} failed (status={status}), retry in {retry_after:.1f}s")
+        self.status = status
+        self.retry_after = retry_after
+
+
 def _is_retryable(exc: Exception) -> bool:
     """일시적(재시도 가능) 오류인지 판별. 429 또는 5xx, 요청 타임아웃."""
     if isinstance(exc, RequestTimeoutError):
@@ -35,6 +68,20 @@ def _is_retryable(exc: Exception) -> bool:
     return False
 
 
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    """재시도 전 대기(초). Retry-After 헤더 우선, 없으면 지수 백오프."""
+    delay = min(_BASE_DELAY * (2 ** attempt), _MAX_DELAY)
+    headers = getattr(exc, "headers", None)
+    if headers is not None:
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = min(float(retry_after), _MAX_DELAY)
+            except ValueError:
+                pass
+    return delay
+
+
 def _rich_text(value: str) -> dict[str, Any]:
     """rich_text 속성 빌더. 빈 값은 빈 배열로 보내 속성을 비웁니다."""
     if not value:
@@ -42,11 +89,57 @@ def _rich_text(value: str) -> dict[str, Any]:
     return {"rich_text": [{"text": {"content": value}}]}
 
 
+def _title_text(page: dict[str, Any]) -> str:
+    """페이지 객체에서 Name(title) 속성의 평문을 추출."""
+    title = ((page.get("properties") or {}).get("Name") or {}).get("title") or []
+    return "".join(part.get("plain_text") or (part.get("text") or {}).get("content", "") for part in title)
+
+
+def _rich_text_value(page: dict[str, Any], name: str) -> str:
+    """페이지 객체에서 rich_text 속성의 평문을 추출. 속성이 없으면 빈 문자열."""
+    text = ((page.get("properties") or {}).get(name) or {}).get("rich_text") or []
+    return "".join(part.get("plain_text") or (part.get("text") or {}).get("content", "") for part in text)
+
+
+def _host_text(page: dict[str, Any]) -> str:
+    """페이지 객체에서 Host(rich_text) 속성의 평문을 추출. 속성이 없으면 빈 문자열."""
+    return _rich_text_value(page, "Host")
+
+
+def property_fingerprint(props: dict[str, Any]) -> str:
+    """페이지 속성 딕셔너리의 지문(SHA-256). 변경 여부 판단용.
+
+    Seen은 매번 바뀌는 확인 시각이므로 지문에서 제외합니다.
+    """
+    payload = {key: value for key, value in props.items() if key != "Seen"}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
 class NotionClient:
-    def __init__(self, api_key: str) -> None:
-        """Notion 클라이언트 초기화."""
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        base_url: str | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        container_id_property: str = "",
+    ) -> None:
+        """Notion 클라이언트 초기화. 모든 API 호출은 rate_limit(요청/초) 토큰 버킷을 거칩니다.
+
+        동시에 나가 있는 호출 수는 429/5xx와 응답 지연을 보고 max_concurrency 안에서 스스로 조절합니다.
+        base_url을 주면 api.notion.com 대신 해당 서버로 요청합니다(벤치마크용 가짜 서버 등).
+        container_id_property를 주면 그 rich_text 속성에 컨테이너 ID를 기록하고 검색에도 사용합니다.
+        """
         self.api_key = api_key
-        self.client = Client(auth=self.api_key)
+        self.container_id_property = container_id_property
+        self.client = (
+            Client(auth=self.api_key, base_url=base_url) if base_url else Client(auth=self.api_key)
+        )
+        self.limiter = TokenBucket(rate_limit, burst)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        NOTION_CONCURRENCY_LIMIT.set_function(lambda: self.concurrency.limit)
 
         notion_logger.info("Connecting to Notion API...")
 
@@ -56,32 +149,58 @@ class NotionClient:
         except Exception as e:
             raise ConnectionError(f"Unable to connect to Notion API with provided key: {e}")
 
-    def _request_with_retry(self, label: str, func: Callable[[], T]) -> T:
-        """Notion API 호출에 지수 백오프 재시도를 적용. Retry-After 헤더를 존중."""
+    def _request_once(self, label: str, func: Callable[[], T], attempt: int = 0, last: bool = False) -> T:
+        """Notion API를 속도 제한을 거쳐 한 번 호출.
+
+        재시도할 만한 오류면(last가 아닐 때) 기다리지 않고 권장 대기 시간을 담은 RetryLaterError를
+        던집니다. 429를 받으면 Retry-After만큼 토큰 버킷 발급을 멈추고 속도를 낮춰,
+        다른 스레드의 호출도 함께 물러서게 합니다. 응답 결과는 동시 호출 제어기에 알려
+        429/5xx/타임아웃이면 동시 호출 상한을 줄이고, 빠른 정상 응답이면 조금씩 늘립니다.
+        """
+        self.limiter.acquire(current_priority())
+        started = self.concurrency.acquire()
+        overloaded: bool | None = None
+        try:
+            result = func()
+            overloaded = False
+            return result
+        except (HTTPResponseError, RequestTimeoutError) as e:
+            overloaded = _is_retryable(e)
+            status = getattr(e, "status", "?")
+            if status == 429:
+                NOTION_RATE_LIMITED.inc()
+            if not _is_retryable(e) or last:
+                raise
+            NOTION_RETRIES.inc(str(status))
+            delay = _retry_delay(e, attempt)
+            if status == 429:
+                self.limiter.penalize(delay)
+            raise RetryLaterError(label, status, delay) from e
+        finally:
+            self.concurrency.release(started, overloaded)
+
+    def _request_with_retry(self, label: str, func: Callable[[], T], budget: float | None = None) -> T:
+        """호출 스레드에서 기다리며 재시도하는 호출 (연결 확인·전체 동기화의 조회용).
+
+        쓰기와 이벤트 워커의 검색은 _request_once로 한 번만 보내고, 재시도는 호출측이 아웃박스로
+        예약합니다. budget(초)을 주면 대기 합계가 그 안에 들 때만 기다리고, 넘으면 RetryLaterError를
+        그대로 던집니다.
+        """
+        waited = 0.0
         for attempt in range(_MAX_RETRIES + 1):
             try:
-                return func()
-            except (HTTPResponseError, RequestTimeoutError) as e:
-                if not _is_retryable(e) or attempt == _MAX_RETRIES:
+                return self._request_once(label, func, attempt, last=attempt == _MAX_RETRIES)
+            except RetryLaterError as e:
+                waited += e.retry_after
+                if budget is not None and waited > budget:
                     raise
-
-                # Retry-After 헤더 우선, 없으면 지수 백오프
-                delay = min(_BASE_DELAY * (2 ** attempt), _MAX_DELAY)
-                headers = getattr(e, "headers", None)
-                if headers is not None:
-                    retry_after = headers.get("Retry-After")
-                    if retry_after:
-                        try:
-                            delay = min(float(retry_after), _MAX_DELAY)
-                        except ValueError:
-                            pass
-
-                status = getattr(e, "status", "?")
                 notion_logger.warning(
-                    f"{label} failed (status={status}). "
-                    f"Retry {attempt + 1}/{_MAX_RETRIES} in {delay:.1f}s..."
+                    "%s failed (status=%s). Retry %d/%d in %.1fs...",
+                    label, e.status, attempt + 1, _MAX_RETRIES, e.retry_after,
                 )
-                time.sleep(delay)
+                # 429의 대기는 다음 시도의 acquire()가 대신함 (버킷 전체가 함께 멈춤)
+                if e.status != 429:
+                    time.sleep(e.retry_after)
 
         # 도달하지 않음 (마지막 시도에서 raise)
         raise RuntimeError("unreachable")
@@ -92,6 +211,8 @@ class NotionClient:
         - 빈 date(Seen/Created)는 속성 자체를 생략합니다(빈 start는 API 오류).
         - Stacks(multi_select)는 스택이 있을 때만 설정합니다(단독 컨테이너의 수동 입력 보존).
           Notion은 존재하지 않는 옵션 이름을 쓰면 자동으로 옵션을 생성합니다.
+        - Host(rich_text)는 여러 호스트를 감시할 때만 설정합니다(단일 호스트 DB에는 속성 불필요).
+        - 컨테이너 ID(rich_text)는 container_id_property를 설정했을 때만 그 이름의 속성에 씁니다.
         """
         props: dict[str, Any] = {
             "Name": {"title": [{"text": {"content": container.name}}]},
@@ -106,75 +227,167 @@ class NotionClient:
             props["Created"] = {"date": {"start": container.created}}
         if container.stack:
             props["Stacks"] = {"multi_select": [{"name": container.stack}]}
+        if container.host:
+            props["Host"] = _rich_text(container.host)
+        if self.container_id_property and container.container_id:
+            props[self.container_id_property] = _rich_text(container.container_id)
         return props
 
+    def fingerprint(self, container: DockerContainerInfo) -> str:
+        """컨테이너가 Notion에 쓰일 속성의 지문. 마지막으로 반영한 값과 비교해 쓰기를 생략."""
+        return property_fingerprint(self._convert_property(container))
+
+    @timed(NOTION_REQUEST_SECONDS, "get_database")
     def get_database(self, database_id: str) -> dict[str, Any] | None:
         """데이터베이스 정보 조회."""
-        notion_logger.debug(f"Retrieving database info for ID: {database_id}")
+        notion_logger.debug("Retrieving database info for ID: %s", database_id)
         try:
             return cast(
                 dict[str, Any],
                 self._request_with_retry(
                     f"get_database({database_id})",
                     lambda: self.client.databases.retrieve(database_id=database_id),
+                    _READ_RETRY_BUDGET,
                 ),
             )
         except Exception as e:
             notion_logger.error(f"Error retrieving database {database_id}: {e}")
             return None
 
+    @timed(NOTION_REQUEST_SECONDS, "update_page")
     def update_page(self, page_id: str, container: DockerContainerInfo) -> bool:
         """Notion 페이지 업데이트.
 
         - 성공            -> True
         - 페이지 없음(404) -> PageNotFoundError 발생 (캐시 무효화 후 재생성)
-        - 그 외 오류       -> 재시도 후 예외 전파 (호출측에서 skip)
+        - 일시 오류        -> 기다리지 않고 RetryLaterError 발생 (호출측이 재시도 예약)
+        - 그 외 오류       -> 예외 전파
         """
-        notion_logger.debug(f"Updating page {page_id} for container: {container.name}")
+        notion_logger.debug("Updating page %s for container: %s", page_id, container.name)
         data = self._convert_property(container)
         try:
-            self._request_with_retry(
+            self._request_once(
                 f"update_page({container.name})",
                 lambda: self.client.pages.update(page_id=page_id, properties=data),
             )
             return True
         except APIResponseError as e:
             if e.code == APIErrorCode.ObjectNotFound:
+                NOTION_PAGE_NOT_FOUND.inc()
+                raise PageNotFoundError(page_id) from e
+            raise
+
+    @timed(NOTION_REQUEST_SECONDS, "update_seen")
+    def update_seen(self, page_id: str, seen: str) -> bool:
+        """Seen 속성만 갱신. 예외 규약은 update_page와 동일."""
+        notion_logger.debug("Refreshing Seen of page %s", page_id)
+        data = {"Seen": {"date": {"start": seen}}}
+        try:
+            self._request_once(
+                f"update_seen({page_id})",
+                lambda: self.client.pages.update(page_id=page_id, properties=data),
+            )
+            return True
+        except APIResponseError as e:
+            if e.code == APIErrorCode.ObjectNotFound:
+                NOTION_PAGE_NOT_FOUND.inc()
                 raise PageNotFoundError(page_id) from e
             raise
 
-    def find_page_id(self, database_id: str, container_name: str) -> str:
-        """데이터베이스에서 컨테이너 이름으로 페이지 ID 조회. 없거나 오류면 빈 문자열."""
-        notion_logger.debug(f"Finding page in database {database_id} for: {container_name}")
+    @timed(NOTION_REQUEST_SECONDS, "find_page_id")
+    def find_page_id(self, database_id: str, container_name: str, host: str = "", container_id: str = "") -> str:
+        """데이터베이스에서 컨테이너 이름(호스트가 있으면 Host까지)으로 페이지 ID 조회. 없거나 오류면 빈 문자열.
+
+        이벤트 워커에서 불리므로 일시 오류는 기다리지 않고 RetryLaterError로 던집니다(쓰기와 같이
+        호출측이 아웃박스 재시도를 예약). container_id_property가 설정되어 있고 container_id를 주면 ID가 같은 페이지도 함께 찾고,
+        둘 다 있으면 ID가 같은 페이지(이름이 바뀐 컨테이너의 기존 페이지)를 우선합니다.
+        """
+        notion_logger.debug("Finding page in database %s for: %s (host=%s)", database_id, container_name, host)
+        name_filter: dict[str, Any] = {"property": "Name", "title": {"equals": container_name}}
+        if host:
+            name_filter = {"and": [name_filter, {"property": "Host", "rich_text": {"equals": host}}]}
+        id_property = self.container_id_property if container_id else ""
+        if id_property:
+            name_filter = {
+                "or": [name_filter, {"property": id_property, "rich_text": {"equals": container_id}}]
+            }
         try:
             response = cast(
                 dict[str, Any],
-                self._request_with_retry(
+                self._request_once(
                     f"find_page_id({container_name})",
-                    lambda: self.client.databases.query(
-                        database_id=database_id,
-                        filter={"property": "Name", "title": {"equals": container_name}},
-                    ),
+                    lambda: self.client.databases.query(database_id=database_id, filter=name_filter),
                 ),
             )
             results = response.get("results") or []
+            if id_property:
+                for page in results:
+                    if _rich_text_value(page, id_property) == container_id:
+                        return str(page.get("id", ""))
             if results:
                 return str(results[0].get("id", ""))
             return ""
+        except RetryLaterError:
+            raise
         except Exception as e:
             notion_logger.error(
                 f"Error finding page for {container_name} in database {database_id}: {e}"
             )
             return ""
 
+    @timed(NOTION_REQUEST_SECONDS, "query_pages")
+    def query_pages(self, database_id: str, edited_since: str | None = None) -> dict[str, str] | None:
+        """데이터베이스 전체(또는 edited_since 이후 수정분)를 페이지 단위로 스캔해 {Name: page_id} 반환.
+
+        - edited_since : ISO 8601 시각. 지정 시 last_edited_time 필터로 수정분만 조회
+        - Host 속성이 채워진 페이지는 `Host/Name` 키로 반환 (page_key의 호스트 구분과 동일)
+        - 이름이 중복되면 먼저 조회된 페이지를 사용 (find_page_id와 동일)
+        - 오류 시 None (호출측은 개별 검색으로 폴백). 일시 오류의 재시도 대기는 _READ_RETRY_BUDGET까지
+        """
+        notion_logger.debug("Scanning database %s (edited_since=%s)", database_id, edited_since)
+        query: dict[str, Any] = {"database_id": database_id, "page_size": 100}
+        if edited_since:
+            query["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": edited_since},
+            }
+
+        pages: dict[str, str] = {}
+        cursor: str | None = None
+        try:
+            while True:
+                kwargs = dict(query, start_cursor=cursor) if cursor else query
+                response = cast(
+                    dict[str, Any],
+                    self._request_with_retry(
+                        f"query_pages({database_id})",
+                        lambda: self.client.databases.query(**kwargs),
+                        _READ_RETRY_BUDGET,
+                    ),
+                )
+                for page in response.get("results") or []:
+                    name = _title_text(page)
+                    host = _host_text(page)
+                    if name and host:
+                        name = f"{host}/{name}"
+                    if name and name not in pages:
+                        pages[name] = str(page.get("id", ""))
+                cursor = response.get("next_cursor")
+                if not response.get("has_more") or not cursor:
+                    return pages
+        except Exception as e:
+            notion_logger.error(f"Error scanning database {database_id}: {e}")
+            return None
+
+    @timed(NOTION_REQUEST_SECONDS, "create_page")
     def create_page(self, database_id: str, container: DockerContainerInfo) -> str:
-        """Notion에 새 페이지 생성. 실패 시 빈 문자열."""
-        notion_logger.debug(f"Creating new page in database {database_id} for: {container.name}")
+        """Notion에 새 페이지 생성. 일시 오류면 RetryLaterError, 그 외 실패 시 빈 문자열."""
+        notion_logger.debug("Creating new page in database %s for: %s", database_id, container.name)
         data = self._convert_property(container)
         try:
             page = cast(
                 dict[str, Any],
-                self._request_with_retry(
+                self._request_once(
                     f"create_page({container.name})",
                     lambda: self.client.pages.create(
                         parent={"database_id": database_id}, properties=data
@@ -182,6 +395,8 @@ class NotionClient:
                 ),
             )
             return str(page.get("id", ""))
+        except RetryLaterError:
+            raise
         except Exception as e:
             notion_logger.error(f"Error creating page for {container.name}: {e}")
             return ""
@@ -0,0 +1,104 @@
+"""Notion 쓰기 아웃박스(write-ahead) 재생.
+
+process_update는 페이지를 바꾸기 직전에 원하는 상태를 캐시의 outbox 구역에 먼저 기록하고,
+쓰기가 성공하면 지웁니다. Notion 장애로 쓰기가 실패하면 엔트리가 남고, 이 모듈의
+OutboxDrainer가 재시도 시각이 된 엔트리를 다시 처리하도록 넘깁니다. 아웃박스는 캐시
+저널과 함께 디스크에 남으므로 재시작 후에도 이어서 재생되며, 페이지마다 최신 상태 하나만
+남기 때문에 복구 비용은 장애 동안 바뀐 페이지 수로 제한됩니다.
+"""
+
+import threading
+from typing import Any, Callable
+from src.cache_manager import CacheManager
+from src.metrics import OUTBOX_REPLAYS
+from src.logger import main_logger
+
+# 재시도 시각이 된 엔트리를 찾는 주기 (초)
+_POLL_INTERVAL = 1.0
+
+
+class OutboxDrainer:
+    """재시도 시각이 된 아웃박스 엔트리를 dispatch(키, 상태)로 넘기는 백그라운드 스레드.
+
+    host가 같은 엔트리만 다룹니다(호스트마다 이벤트 루프와 작업 큐가 따로 있으므로).
+    dispatch는 작업 큐에 넣는 식으로 비동기일 수 있어, 넘긴 키는 done(키)이 불릴 때까지
+    다시 넘기지 않습니다. pause()가 반환된 뒤에는 resume() 전까지 아무것도 넘기지 않습니다.
+    """
+
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        dispatch: Callable[[str, dict[str, Any]], None],
+        host: str = "",
+        interval: float = _POLL_INTERVAL,
+    ) -> None:
+        self.cache_manager = cache_manager
+        self.host = host
+        self.interval = interval
+        self._dispatch = dispatch
+        # _drain_lock은 drain 전체(dispatch 포함)를, _lock은 _inflight만 보호.
+        # dispatch가 가득 찬 작업 큐에서 기다리는 동안에도 워커가 done()을 부를 수 있어야 함
+        self._drain_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._inflight: set[str] = set()
+        self._paused = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """백그라운드 재생 시작"""
+        name = f"d2n-outbox-{self.host}" if self.host else "d2n-outbox"
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """재생을 멈춤 (남은 엔트리는 디스크에 남아 다음 실행에서 이어짐)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def pause(self) -> None:
+        """전체 동기화처럼 같은 페이지를 따로 쓰는 동안 재생을 멈춤 (진행 중인 drain은 기다림)"""
+        with self._drain_lock:
+            self._paused = True
+
+    def resume(self) -> None:
+        with self._drain_lock:
+            self._paused = False
+
+    def done(self, key: str) -> None:
+        """dispatch로 넘긴 키의 처리가 끝남 (성공 여부와 무관하게 호출)"""
+        with self._lock:
+            self._inflight.discard(key)
+
+    def drain(self, now: float | None = None) -> int:
+        """재시도 시각이 된 엔트리를 넘기고, 넘긴 수를 반환"""
+        dispatched = 0
+        with self._drain_lock:
+            if self._paused:
+                return 0
+            for key, state in self.cache_manager.due_outbox(now):
+                with self._lock:
+                    if key in self._inflight or state.get("host", "") != self.host:
+                        continue
+                    self._inflight.add(key)
+                try:
+                    self._dispatch(key, state)
+                except Exception as e:
+                    self.done(key)
+                    main_logger.error(f"Failed to dispatch outbox entry {key}: {e}")
+                    continue
+                OUTBOX_REPLAYS.inc()
+                dispatched += 1
+        if dispatched:
+            main_logger.info(
+                "Replaying %d outbox entries (%d pending)", dispatched, self.cache_manager.outbox_size()
+            )
+        return dispatched
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.drain()
+            except Exception as e:
+                main_logger.error(f"Outbox drain failed: {e}")
@@ -0,0 +1,37 @@
+"""Notion 작업 우선순위.
+
+모든 Notion 호출은 같은 토큰 버킷(통합당 속도 제한)을 거치므로, 대량 재동기화 중에도 실제
+상태 변화가 먼저 반영되도록 버킷이 대기 중인 호출 가운데 우선순위가 높은 것부터 토큰을 줍니다.
+우선순위는 호출 스택 전체에 인자로 넘기는 대신 contextvar로 전달합니다.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator
+
+
+class Priority(IntEnum):
+    """값이 작을수록 먼저 처리."""
+
+    TRANSITION = 0  # 실시간 이벤트의 상태 전환 (die, destroy, restart 등)
+    CHANGE = 1      # 속성 변경(IP/포트 등)과 아웃박스 재시도
+    BULK = 2        # 전체 재동기화와 Seen 단독 갱신
+
+
+_current: ContextVar[Priority] = ContextVar("d2n_priority", default=Priority.CHANGE)
+
+
+def current_priority() -> Priority:
+    """현재 스레드(컨텍스트)의 Notion 작업 우선순위."""
+    return _current.get()
+
+
+@contextmanager
+def notion_priority(priority: Priority) -> Iterator[None]:
+    """블록 안의 Notion 호출을 priority로 보냄."""
+    token = _current.set(priority)
+    try:
+        yield
+    finally:
+        _current.reset(token)
@@ -0,0 +1,124 @@
+"""Notion API 호출 속도를 미리 조절하는 토큰 버킷.
+
+Notion은 통합(integration)당 평균 초당 3회 정도의 요청만 허용하고, 넘치면 429와
+Retry-After를 돌려줍니다. 429를 받은 뒤에 물러서는 대신, 모든 호출이 이 버킷에서
+토큰을 받아 가도록 해 요청 간격을 사전에 맞춥니다. 기다리는 호출이 여럿이면
+우선순위(src.priority)가 높은 호출부터 토큰을 받습니다.
+"""
+
+import itertools
+import threading
+import time
+from typing import Callable
+
+# Notion 문서 기준 평균 허용 속도 (요청/초)
+DEFAULT_RATE = 3.0
+DEFAULT_BURST = 3.0
+
+# 429 수신 시 속도 감소 배율과 하한(기본 속도 대비 비율)
+_PENALTY_FACTOR = 0.5
+_MIN_RATE_RATIO = 0.1
+
+# 기다리는 호출의 우선순위를 이 시간(초)마다 한 단계씩 올림 (낮은 우선순위의 기아 방지)
+_AGING_SECONDS = 5.0
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷.
+
+    - rate   : 초당 보충되는 토큰 수(평균 허용 속도)
+    - burst  : 쌓아 둘 수 있는 최대 토큰 수(유휴 후 연속 호출 허용량)
+    - penalize(retry_after) 호출 시 retry_after 동안 발급을 멈추고 속도를 절반으로 낮춘 뒤,
+      recovery_seconds에 걸쳐 원래 속도로 선형 복구합니다.
+
+    토큰이 모자라면 대기열에 서서 기다립니다. 토큰은 실효 우선순위(priority - 대기 시간 /
+    aging_seconds)가 가장 작은 호출에 먼저 돌아가고, 같으면 먼저 온 호출이 받습니다.
+    sleep을 주면(테스트용 가짜 시계) 조건 변수 대신 그 함수로 기다립니다.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        recovery_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] | None = None,
+        aging_seconds: float = _AGING_SECONDS,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.recovery_seconds = recovery_seconds
+        self.aging_seconds = aging_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        # 대기 번호 -> (우선순위, 도착 시각)
+        self._waiters: dict[int, tuple[int, float]] = {}
+        self._tickets = itertools.count()
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        """경과 시간만큼 토큰을 보충하고, 감속 중이면 속도를 복구 (락 보유 상태에서 호출)."""
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        if self.rate < self.base_rate and self.recovery_seconds > 0:
+            step = self.base_rate * elapsed / self.recovery_seconds
+            self.rate = min(self.base_rate, self.rate + step)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def _next_waiter(self, now: float) -> int:
+        """다음에 토큰을 받을 대기 번호 (락 보유 상태에서 호출)."""
+        return min(
+            self._waiters,
+            key=lambda ticket: (
+                self._waiters[ticket][0] - (now - self._waiters[ticket][1]) / self.aging_seconds,
+                ticket,
+            ),
+        )
+
+    def _pause(self, seconds: float) -> None:
+        if self._sleep is not None:
+            self._sleep(seconds)
+        else:
+            self._cond.wait(seconds)
+
+    def acquire(self, priority: int = 0) -> float:
+        """토큰 하나를 받아 감. 필요하면 대기하며, 실제 대기한 시간(초)을 반환.
+
+        priority는 작을수록 먼저 토큰을 받습니다(src.priority.Priority).
+        """
+        with self._cond:
+            started = self._clock()
+            ticket = next(self._tickets)
+            self._waiters[ticket] = (priority, started)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    wait = max(0.0, (1 - self._tokens) / self.rate, self._blocked_until - now)
+                    if wait <= 0:
+                        if self._next_waiter(now) == ticket:
+                            self._tokens -= 1
+                            return now - started
+                        # 토큰은 있지만 앞선 호출의 차례: 깨워서 가져가게 한 뒤 다시 확인
+                        self._cond.notify_all()
+                        wait = 1 / self.rate
+                    self._pause(wait)
+            finally:
+                del self._waiters[ticket]
+                self._cond.notify_all()
+
+    def penalize(self, retry_after: float) -> None:
+        """서버가 속도 제한(429)을 알려 옴. retry_after 동안 발급을 멈추고 속도를 낮춤."""
+        with self._cond:
+            now = self._clock()
+            self._refill(now)
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self.rate = max(self.base_rate * _MIN_RATE_RATIO, self.rate * _PENALTY_FACTOR)
+            # 쌓아 둔 버스트 여유도 버려, 재개 직후 몰리지 않게 함
+            self._tokens = min(self._tokens, 0.0)
@@ -0,0 +1,63 @@
+"""같은 키의 동시 작업을 한 번만 실행하는 single-flight.
+
+캐시 미스가 난 새 컨테이너의 페이지 조회는 "검색 후 없으면 생성"입니다. 같은 컨테이너의
+이벤트 두 개, 혹은 전체 동기화와 이벤트가 동시에 미스를 내면 둘 다 검색하고 둘 다 페이지를
+만들어 중복 행이 생깁니다. 키가 같은 호출이 겹치면 먼저 온 호출만 실행하고, 나머지는
+그 결과(또는 예외)를 그대로 받아 갑니다.
+"""
+
+import threading
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """진행 중인 호출 하나. 끝나면 done이 설정되고 result 또는 error가 채워짐."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """키별 동시 호출 합치기.
+
+    - do(key, func) : 같은 키로 진행 중인 호출이 없으면 func를 실행하고, 있으면 끝날 때까지
+                      기다려 그 결과를 받음. (결과, 다른 호출의 결과를 받았는지)를 반환
+    - 끝난 호출은 바로 잊으므로, 이후 호출은 func를 다시 실행합니다(결과 재사용은 캐시의 몫).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+
+    def do(self, key: str, func: Callable[[], T]) -> tuple[T, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """진행 중인 키 수."""
+        with self._lock:
+            return len(self._calls)
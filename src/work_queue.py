@@ -0,0 +1,110 @@
+"""Docker 이벤트 수신과 Notion 쓰기를 분리하는 샤드 작업 큐.
+
+이벤트 스트림을 읽는 스레드는 작업을 큐에 넣기만 하고, 실제 처리(inspect + Notion 호출)는
+워커 스레드가 맡습니다. 작업은 키(컨테이너 ID)의 해시로 샤드를 고르므로 같은 컨테이너의
+작업은 항상 같은 워커에서 순서대로 처리되고, 서로 다른 컨테이너는 병렬로 처리됩니다.
+"""
+
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+from src.logger import main_logger
+
+Task = Callable[[], None]
+
+# 작업이 이 시간(초) 이상 큐에서 기다렸으면 경고 로그
+_SLOW_WAIT_WARNING = 5.0
+
+
+@dataclass(slots=True)
+class QueueStats:
+    """큐 상태 스냅샷.
+
+    Attributes:
+        depth (int): 현재 대기 중인 작업 수 (전체 샤드 합)
+        processed (int): 처리를 마친 작업 수
+        avg_wait (float): 작업이 큐에서 기다린 평균 시간(초)
+        max_wait (float): 작업이 큐에서 기다린 최대 시간(초)
+    """
+
+    depth: int
+    processed: int
+    avg_wait: float
+    max_wait: float
+
+
+class ShardedWorkQueue:
+    """키 기준으로 샤드를 나눈 유한(bounded) 작업 큐와 샤드별 워커 스레드.
+
+    샤드 큐가 가득 차면 submit()이 블로킹되어, 처리보다 유입이 빠를 때 메모리를 무한정
+    쓰는 대신 이벤트 스트림 읽기를 늦춥니다(역압).
+    """
+
+    def __init__(self, workers: int, maxsize: int, name: str = "d2n-worker") -> None:
+        self._queues: list[queue.Queue[tuple[float, Task] | None]] = [
+            queue.Queue(maxsize=max(1, maxsize // max(1, workers))) for _ in range(max(1, workers))
+        ]
+        self._lock = threading.Lock()
+        self._processed = 0
+        self._wait_total = 0.0
+        self._max_wait = 0.0
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"{name}-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _shard(self, key: str) -> "queue.Queue[tuple[float, Task] | None]":
+        return self._queues[zlib.crc32(key.encode("utf-8")) % len(self._queues)]
+
+    def _run(self, q: "queue.Queue[tuple[float, Task] | None]") -> None:
+        while True:
+            item = q.get()
+            try:
+                if item is None:
+                    return
+                enqueued, task = item
+                wait = time.monotonic() - enqueued
+                with self._lock:
+                    self._processed += 1
+                    self._wait_total += wait
+                    self._max_wait = max(self._max_wait, wait)
+                if wait >= _SLOW_WAIT_WARNING:
+                    main_logger.warning(
+                        f"Task waited {wait:.1f}s in queue (depth {self.depth()})"
+                    )
+                task()
+            except Exception as e:
+                main_logger.error(f"Worker task failed: {e}")
+            finally:
+                q.task_done()
+
+    def submit(self, key: str, task: Task) -> None:
+        """키의 샤드에 작업을 넣음. 샤드가 가득 차면 자리가 날 때까지 대기."""
+        self._shard(key).put((time.monotonic(), task))
+
+    def depth(self) -> int:
+        """현재 대기 중인 작업 수."""
+        return sum(q.qsize() for q in self._queues)
+
+    def stats(self) -> QueueStats:
+        """큐 상태 스냅샷을 반환."""
+        with self._lock:
+            avg = self._wait_total / self._processed if self._processed else 0.0
+            return QueueStats(self.depth(), self._processed, avg, self._max_wait)
+
+    def join(self) -> None:
+        """지금까지 넣은 작업이 모두 끝날 때까지 대기."""
+        for q in self._queues:
+            q.join()
+
+    def stop(self) -> None:
+        """남은 작업을 처리한 뒤 워커를 종료."""
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
@@ -1,5 +1,6 @@
+import json
 import time
-from src.cache_manager import CacheManager
+from src.cache_manager import CacheManager, page_key
 
 
 def _cache(tmp_path, ttl=300):
@@ -37,3 +38,308 @@ def test_persistence_across_instances(tmp_path):
     CacheManager(cache_file=cache_file).set_page_id("web", "page-1")
     reopened = CacheManager(cache_file=cache_file)
     assert reopened.get_page_id("web") == "page-1"
+
+
+def test_fingerprint_set_and_get(tmp_path):
+    cm = _cache(tmp_path)
+    assert cm.get_fingerprint("page-1") is None
+    assert cm.get_pushed_at("page-1") == 0.0
+    cm.set_fingerprint("page-1", "abc")
+    assert cm.get_fingerprint("page-1") == "abc"
+    assert cm.get_pushed_at("page-1") > 0
+
+
+def test_fingerprint_survives_page_id_expiry(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("web", "page-1")
+    cm.set_fingerprint("page-1", "abc")
+    cm.cache_data["web"]["timestamp"] = time.time() - 10_000
+    assert cm.get_page_id("web") is None
+    assert cm.get_fingerprint("page-1") == "abc"
+
+
+def test_fingerprint_persistence_and_removal(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    CacheManager(cache_file=cache_file).set_fingerprint("page-1", "abc")
+    reopened = CacheManager(cache_file=cache_file)
+    assert reopened.get_fingerprint("page-1") == "abc"
+    reopened.remove_fingerprint("page-1")
+    assert reopened.get_fingerprint("page-1") is None
+
+
+def test_legacy_cache_file_is_discarded(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text(
+        json.dumps({"web": {"page_id": "page-1", "timestamp": time.time()}}), encoding="utf-8"
+    )
+    cm = CacheManager(cache_file=str(cache_file))
+    # 구버전 키는 이름 기준이라 DB/이름 키와 호환되지 않음
+    assert cm.cache_data == {}
+    assert cm.fingerprints == {}
+
+
+def test_legacy_cache_file_is_migrated_to_default_database(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    now = time.time()
+    cache_file.write_text(
+        json.dumps({
+            "web": {"page_id": "page-1", "timestamp": now},
+            "db": {"page_id": "page-2", "timestamp": now - 10},
+        }),
+        encoding="utf-8",
+    )
+    cm = CacheManager(cache_file=str(cache_file), legacy_database_id="db-1")
+    assert cm.get_page_id("db-1/web") == "page-1"
+    # 저장 시각이 유지되어 LRU 순서(오래된 것부터)와 TTL이 이어짐
+    assert list(cm.cache_data) == ["db-1/db", "db-1/web"]
+    assert cm.cache_data["db-1/db"]["timestamp"] == now - 10
+
+    # 스냅샷이 현재 형식으로 바뀌어 다음 시작에는 그대로 읽힘
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["version"] == 2
+    assert CacheManager(cache_file=str(cache_file)).get_page_id("db-1/web") == "page-1"
+
+
+def test_page_key_includes_database():
+    assert page_key("db-1", "web") != page_key("db-2", "web")
+
+
+def test_page_key_includes_host():
+    # 단일 호스트(빈 값)는 기존 키를 유지하고, 호스트가 다르면 같은 이름도 구분
+    assert page_key("db-1", "web", "") == "db-1/web"
+    assert page_key("db-1", "web", "nas") != page_key("db-1", "web", "pi")
+
+
+def test_index_with_host_names_matches_page_key(tmp_path):
+    cm = _cache(tmp_path)
+    cm.load_index("db-1", {"nas/web": "page-nas", "web": "page-local"}, complete=True, synced_at=time.time())
+    assert cm.get_page_id(page_key("db-1", "web", "nas")) == "page-nas"
+    assert cm.get_page_id(page_key("db-1", "web")) == "page-local"
+
+
+def test_full_index_replaces_entries_of_database(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id(page_key("db-1", "old"), "page-old")
+    cm.set_page_id(page_key("db-2", "other"), "page-other")
+    cm.load_index("db-1", {"web": "page-1"}, complete=True, synced_at=time.time())
+    assert cm.get_page_id(page_key("db-1", "web")) == "page-1"
+    assert cm.get_page_id(page_key("db-1", "old")) is None
+    assert cm.get_page_id(page_key("db-2", "other")) == "page-other"
+    assert cm.has_fresh_index("db-1") is True
+    assert cm.has_fresh_index("db-2") is False
+
+
+def test_incremental_index_keeps_and_refreshes_entries(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id(page_key("db-1", "web"), "page-1")
+    cm.cache_data[page_key("db-1", "web")]["timestamp"] = time.time() - 250
+    cm.load_index("db-1", {"api": "page-2"}, complete=False, synced_at=time.time())
+    assert cm.cache_data[page_key("db-1", "web")]["timestamp"] > time.time() - 5
+    assert cm.get_page_id(page_key("db-1", "api")) == "page-2"
+
+
+def test_stale_index_is_not_fresh(tmp_path):
+    cm = _cache(tmp_path, ttl=300)
+    cm.load_index("db-1", {}, complete=True, synced_at=time.time() - 10_000)
+    assert cm.has_fresh_index("db-1") is False
+
+
+def test_mutations_append_to_journal_not_snapshot(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("db/web", "page-1")
+    cm.set_page_id("db/api", "page-2")
+    assert not (tmp_path / "cache.json").exists()
+    lines = (tmp_path / "cache.json.journal").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+
+
+def test_truncated_journal_tail_is_ignored(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("db/web", "page-1")
+    with open(tmp_path / "cache.json.journal", "a", encoding="utf-8") as file:
+        file.write('{"ns": "pages", "key": "db/api", "val')
+    reopened = _cache(tmp_path)
+    assert reopened.get_page_id("db/web") == "page-1"
+    assert reopened.get_page_id("db/api") is None
+
+
+def test_close_compacts_into_snapshot(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("db/web", "page-1")
+    cm.remove_page_id("db/web")
+    cm.set_fingerprint("page-2", "abc")
+    cm.close()
+    assert (tmp_path / "cache.json.journal").read_text(encoding="utf-8") == ""
+    snapshot = json.loads((tmp_path / "cache.json").read_text(encoding="utf-8"))
+    assert snapshot["pages"] == {}
+    assert snapshot["fingerprints"]["page-2"]["hash"] == "abc"
+    assert _cache(tmp_path).get_fingerprint("page-2") == "abc"
+
+
+def test_group_commit_defers_writes_until_flush(tmp_path):
+    cm = CacheManager(cache_file=str(tmp_path / "cache.json"), flush_interval=3600)
+    cm.set_page_id("db/web", "page-1")
+    assert not (tmp_path / "cache.json.journal").exists()
+    cm.flush()
+    assert _cache(tmp_path).get_page_id("db/web") == "page-1"
+    cm.close()
+
+
+def test_zero_ttl_never_expires(tmp_path):
+    cm = _cache(tmp_path, ttl=0)
+    cm.set_page_id("db/web", "page-1")
+    cm.cache_data["db/web"]["timestamp"] = time.time() - 10**9
+    assert cm.get_page_id("db/web") == "page-1"
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+    cm = CacheManager(cache_file=str(tmp_path / "cache.json"), max_entries=2)
+    cm.set_page_id("db/a", "page-a")
+    cm.set_page_id("db/b", "page-b")
+    assert cm.get_page_id("db/a") == "page-a"  # a를 최근 사용으로
+    cm.set_page_id("db/c", "page-c")
+    assert cm.get_page_id("db/b") is None
+    assert cm.get_page_id("db/a") == "page-a"
+    assert cm.stats().evictions == 1
+
+
+def test_eviction_invalidates_database_index(tmp_path):
+    cm = CacheManager(cache_file=str(tmp_path / "cache.json"), max_entries=2)
+    cm.load_index("db", {"a": "page-a", "b": "page-b"}, complete=True, synced_at=time.time())
+    assert cm.has_fresh_index("db") is True
+    cm.set_page_id("db/c", "page-c")
+    # 밀려난 엔트리가 있으면 캐시 미스를 '페이지 없음'으로 볼 수 없음
+    assert cm.has_fresh_index("db") is False
+
+
+def test_eviction_drops_records_of_evicted_pages(tmp_path):
+    cm = CacheManager(cache_file=str(tmp_path / "cache.json"), max_entries=1)
+    cm.set_page_id("db/a", "page-a", "cid-a")
+    cm.set_fingerprint("page-a", "hash-a", version=10)
+    cm.put_outbox("db/a", {"name": "a", "version": 11}, 1, 300)
+    cm.set_page_id("db/b", "page-b", "cid-b")
+    cm.set_fingerprint("page-b", "hash-b", version=20)
+
+    # 밀려난 페이지의 지문·버전과 컨테이너 ID 인덱스도 함께 제거, 미반영 아웃박스는 유지
+    assert cm.get_fingerprint("page-a") is None
+    assert cm.get_container_page("cid-a") is None
+    assert cm.get_outbox("db/a") is not None
+    assert cm.get_container_page("cid-b") == ("db/b", "page-b")
+    cm.close()
+    reloaded = _cache(tmp_path)
+    assert (set(reloaded.fingerprints), set(reloaded.containers)) == ({"page-b"}, {"cid-b"})
+
+
+def test_stats_hit_ratio(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("db/web", "page-1")
+    cm.get_page_id("db/web")
+    cm.get_page_id("db/nope")
+    stats = cm.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_ratio == 0.5
+    assert stats.approx_bytes > 0
+
+
+def test_meta_persists(tmp_path):
+    cm = _cache(tmp_path)
+    assert cm.get_meta("event_cursor") is None
+    cm.set_meta("event_cursor", 1714521600123456789)
+    assert _cache(tmp_path).get_meta("event_cursor") == 1714521600123456789
+
+
+def test_outbox_coalesces_and_backs_off(tmp_path):
+    cm = _cache(tmp_path)
+    cm.put_outbox("db/web", {"status": "exited"}, 5, 300)
+    first_due = cm.outbox["db/web"]["due"]
+    # 같은 페이지의 새 상태는 이전 상태를 대체하고, 이미 있던 엔트리면 재시도 간격이 두 배
+    cm.put_outbox("db/web", {"status": "running"}, 5, 300)
+    assert cm.outbox_size() == 1
+    assert cm.get_outbox("db/web") == {"status": "running"}
+    assert cm.outbox["db/web"]["attempts"] == 1
+    assert cm.outbox["db/web"]["due"] - first_due >= 5
+    cm.remove_outbox("db/web")
+    assert cm.get_outbox("db/web") is None
+
+
+def test_outbox_due_order_and_persistence(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    cm = CacheManager(cache_file=cache_file)
+    cm.put_outbox("db/a", {"name": "a"}, 5, 300)
+    cm.put_outbox("db/b", {"name": "b"}, 1, 300)
+    assert cm.due_outbox() == []
+    # 재시작 후에도 남아 있고, 재시도 시각이 이른 것부터 반환
+    reopened = CacheManager(cache_file=cache_file)
+    assert [key for key, _ in reopened.due_outbox(time.time() + 60)] == ["db/b", "db/a"]
+
+
+def test_outbox_defer_only_pushes_due_later(tmp_path):
+    cm = _cache(tmp_path)
+    cm.put_outbox("db/web", {"name": "web"}, 1, 300)
+    cm.defer_outbox("db/web", 30)
+    due = cm.outbox["db/web"]["due"]
+    assert due >= time.time() + 29
+    # 더 짧은 대기는 이미 잡힌 재시도 시각을 당기지 않음
+    cm.defer_outbox("db/web", 1)
+    assert cm.outbox["db/web"]["due"] == due
+
+
+def test_container_index_persists_and_moves_on_rename(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    cm = CacheManager(cache_file=cache_file)
+    cm.set_page_id("db/web", "page-1", "abc")
+    reopened = CacheManager(cache_file=cache_file)
+    assert reopened.get_container_page("abc") == ("db/web", "page-1")
+    # 이름이 바뀌면 같은 페이지를 새 키로 옮기고, 옛 이름 키는 비움
+    assert reopened.move_page_id("abc", "db/api") == "page-1"
+    assert reopened.get_container_page("abc") == ("db/api", "page-1")
+    assert reopened.get_page_id("db/api") == "page-1"
+    assert reopened.get_page_id("db/web") is None
+    assert reopened.move_page_id("unknown", "db/x") is None
+
+
+def test_container_index_removal_and_prune(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("db/web", "page-1", "abc")
+    cm.set_page_id("db/nas/api", "page-2", "def")
+    cm.set_page_id("db/db", "page-3", "ghi")
+    cm.remove_page_id("db/web", "abc")
+    assert cm.get_container_page("abc") is None
+    # 목록에 없는 컨테이너는 같은 호스트의 것만 정리
+    assert cm.prune_containers("", {"xyz"}) == 1
+    assert cm.get_container_page("ghi") is None
+    assert cm.get_container_page("def") == ("db/nas/api", "page-2")
+
+
+def test_applied_version_never_decreases(tmp_path):
+    cm = _cache(tmp_path)
+    assert cm.get_version("page-1") == 0
+    cm.set_fingerprint("page-1", "hash-a", 200)
+    cm.set_fingerprint("page-1", "hash-b", 100)
+    assert (cm.get_fingerprint("page-1"), cm.get_version("page-1")) == ("hash-b", 200)
+    cm.touch_fingerprint("page-1", 300)
+    assert _cache(tmp_path).get_version("page-1") == 300
+
+
+def test_outbox_keeps_newer_version(tmp_path):
+    cm = _cache(tmp_path)
+    cm.put_outbox("db/web", {"status": "exited", "version": 200}, 5, 300)
+    # 늦게 도착한 오래된 상태는 기다리는 새 상태를 대체하지도, 반영 후 지우지도 못함
+    cm.put_outbox("db/web", {"status": "running", "version": 100}, 5, 300)
+    assert cm.get_outbox("db/web") == {"status": "exited", "version": 200}
+    cm.remove_outbox("db/web", 100)
+    assert cm.get_outbox("db/web") is not None
+    cm.remove_outbox("db/web", 200)
+    assert cm.get_outbox("db/web") is None
+
+
+def test_index_scan_keeps_entries_written_after_scan_start(tmp_path):
+    cm = _cache(tmp_path)
+    cm.set_page_id("db/old", "page-0")
+    scan_started = time.time()
+    # 스캔 도중 만들어지거나 다시 찾은 페이지는 스캔 결과보다 새것
+    cm.set_page_id("db/new", "page-1")
+    cm.set_page_id("db/web", "page-3")
+    cm.load_index("db", {"web": "page-2"}, complete=True, synced_at=scan_started)
+    assert cm.get_page_id("db/old") is None
+    assert cm.get_page_id("db/new") == "page-1"
+    assert cm.get_page_id("db/web") == "page-3"
@@ -0,0 +1,75 @@
+from src.circuit_breaker import CircuitBreaker, DatabaseGuard
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(threshold=3, reset=30):
+    clock = _Clock()
+    return CircuitBreaker("db", threshold, reset, clock), clock
+
+
+def test_opens_after_consecutive_failures():
+    breaker, _ = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    # 중간 성공은 연속 실패를 초기화
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_in() == 30
+
+
+def test_half_open_allows_single_probe():
+    breaker, clock = _breaker(threshold=1)
+    breaker.record_failure()
+    clock.now = 30
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    # 시험 호출 결과가 나오기 전 나머지는 거부
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_with_new_timeout():
+    breaker, clock = _breaker(threshold=1)
+    breaker.record_failure()
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()
+
+
+def test_release_returns_unused_probe():
+    breaker, clock = _breaker(threshold=1)
+    breaker.record_failure()
+    clock.now = 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == "open"
+    # 대기 시간은 이미 지났으므로 다음 호출이 다시 시험
+    assert breaker.allow()
+
+
+def test_guard_limits_concurrency():
+    guard = DatabaseGuard("db", 5, 30, concurrency=1)
+    assert guard.try_enter(0)
+    assert not guard.try_enter(0.01)
+    guard.leave()
+    assert guard.try_enter(0)
+    unlimited = DatabaseGuard("db2", 5, 30, concurrency=0)
+    assert all(unlimited.try_enter(0) for _ in range(10))
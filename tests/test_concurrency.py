@@ -0,0 +1,98 @@
+import threading
+import time
+from src.concurrency import AdaptiveConcurrency
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _call(limiter, clock, latency, overloaded=False):
+    started = limiter.acquire()
+    clock.now += latency
+    limiter.release(started, overloaded)
+
+
+def _saturate(limiter, clock, latency):
+    # 상한만큼 동시에 보낸 뒤 모두 응답받음 (한 창)
+    starts = [limiter.acquire() for _ in range(limiter.limit)]
+    clock.now += latency
+    for started in starts:
+        limiter.release(started, False)
+
+
+def test_additive_increase_while_healthy_and_saturated():
+    clock = _FakeClock()
+    limiter = AdaptiveConcurrency(maximum=16, initial=4, clock=clock)
+    for _ in range(3):
+        _saturate(limiter, clock, 0.05)
+    # 상한의 절반 이상이 나가 있던 응답마다 1/limit씩 증가 (4 → 4.5 → 4.9 → 5.3)
+    assert limiter.limit == 5
+
+
+def test_no_increase_when_not_using_the_limit():
+    clock = _FakeClock()
+    limiter = AdaptiveConcurrency(maximum=16, initial=4, clock=clock)
+    for _ in range(20):
+        _call(limiter, clock, 0.05)
+    assert limiter.limit == 4
+
+
+def test_no_increase_when_latency_is_high():
+    clock = _FakeClock()
+    limiter = AdaptiveConcurrency(maximum=16, initial=4, clock=clock)
+    _saturate(limiter, clock, 2.0)
+    _saturate(limiter, clock, 5.0)
+    # 두 번째 창은 기준 지연(2초)의 두 배를 넘으므로 늘리지 않음 (첫 창의 4.5에 머묾)
+    assert limiter.limit == 4
+
+
+def test_multiplicative_decrease_once_per_congestion():
+    clock = _FakeClock()
+    limiter = AdaptiveConcurrency(maximum=16, initial=8, clock=clock)
+    starts = [limiter.acquire() for _ in range(4)]
+    clock.now += 0.1
+    for started in starts:
+        limiter.release(started, True)
+    # 같은 시점에 나간 호출들의 429는 한 번만 반영
+    assert limiter.limit == 4
+    _call(limiter, clock, 0.1, overloaded=True)
+    assert limiter.limit == 2
+
+
+def test_limit_stays_within_bounds():
+    clock = _FakeClock()
+    limiter = AdaptiveConcurrency(maximum=5, initial=4, clock=clock)
+    for _ in range(10):
+        _saturate(limiter, clock, 0.05)
+    assert limiter.limit == 5
+    for _ in range(10):
+        _call(limiter, clock, 0.05, overloaded=True)
+    assert limiter.limit == 1
+
+
+def test_neutral_errors_do_not_change_limit():
+    clock = _FakeClock()
+    limiter = AdaptiveConcurrency(maximum=16, initial=4, clock=clock)
+    starts = [limiter.acquire() for _ in range(4)]
+    for started in starts:
+        limiter.release(started, None)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_acquire_blocks_at_limit():
+    limiter = AdaptiveConcurrency(maximum=1, initial=1)
+    started = limiter.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    limiter.release(started, None)
+    waiter.join(timeout=1)
+    assert acquired.is_set()
@@ -0,0 +1,57 @@
+import threading
+import time
+from src.debouncer import Debouncer
+
+
+def _collect():
+    emitted = []
+    lock = threading.Lock()
+
+    def emit(key, event):
+        with lock:
+            emitted.append((key, event["Action"]))
+
+    return emitted, emit
+
+
+def _event(action):
+    return {"Action": action}
+
+
+def test_events_within_window_collapse_to_latest():
+    emitted, emit = _collect()
+    d = Debouncer(0.1, emit)
+    for action in ("die", "start", "restart"):
+        d.submit("c1", _event(action))
+    time.sleep(0.3)
+    d.stop()
+    assert emitted == [("c1", "restart")]
+
+
+def test_destroy_always_wins():
+    emitted, emit = _collect()
+    d = Debouncer(10, emit)
+    for action in ("stop", "die", "destroy", "start"):
+        d.submit("c1", _event(action))
+    d.flush()
+    d.stop()
+    assert emitted == [("c1", "destroy")]
+
+
+def test_keys_are_independent():
+    emitted, emit = _collect()
+    d = Debouncer(10, emit)
+    d.submit("c1", _event("die"))
+    d.submit("c2", _event("start"))
+    assert d.pending() == 2
+    d.stop()
+    assert sorted(emitted) == [("c1", "die"), ("c2", "start")]
+
+
+def test_zero_window_emits_immediately():
+    emitted, emit = _collect()
+    d = Debouncer(0, emit)
+    d.submit("c1", _event("die"))
+    d.submit("c1", _event("start"))
+    d.stop()
+    assert emitted == [("c1", "die"), ("c1", "start")]
@@ -0,0 +1,140 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+import src.docker_client as docker_client_module
+from src.docker_client import DockerClient, docker_time_ns, network_fingerprint
+
+
+def _attrs(ip="172.17.0.2", endpoint="e1"):
+    return {
+        "Created": "2024-05-01T00:00:00Z",
+        "Config": {"Image": "nginx:latest", "Labels": {"d2n.enabled": "true", "com.docker.compose.project": "app"}},
+        "HostConfig": {"NetworkMode": "bridge"},
+        "NetworkSettings": {
+            "Networks": {"bridge": {"IPAddress": ip, "EndpointID": endpoint}},
+            "Ports": {"80/tcp": [{"HostIp": "0.0.0.0", "HostPort": "8080"}]},
+        },
+    }
+
+
+class _FakeContainers:
+    def __init__(self):
+        self.attrs = _attrs()
+        self.status = "running"
+        self.calls = 0
+
+    def get(self, container_id):
+        self.calls += 1
+        return SimpleNamespace(id=container_id, name="web", status=self.status, attrs=self.attrs)
+
+
+def _client():
+    # 데몬 연결 없이 캐시 동작만 검증 (__init__ 우회)
+    client = DockerClient.__new__(DockerClient)
+    client.settings = SimpleNamespace(TIMEZONE="UTC")
+    client.host = ""
+    client.docker_api_url = "unix:///var/run/docker.sock"
+    client.client = SimpleNamespace(containers=_FakeContainers())
+    client._known = {}
+    client._known_lock = threading.Lock()
+    client._clock_offset = 0
+    return client
+
+
+def _event(action):
+    return {"Action": action, "id": "abc", "Actor": {"ID": "abc", "Attributes": {"name": "web"}}}
+
+
+def test_network_fingerprint_ignores_endpoint_changes():
+    assert network_fingerprint(_attrs(endpoint="e1")) == network_fingerprint(_attrs(endpoint="e2"))
+    assert network_fingerprint(_attrs(ip="172.17.0.2")) != network_fingerprint(_attrs(ip="172.17.0.3"))
+
+
+def test_repeat_inspect_reuses_parsed_network(monkeypatch):
+    client = _client()
+    calls = []
+    original = docker_client_module.parse_ip
+    monkeypatch.setattr(docker_client_module, "parse_ip", lambda attrs: calls.append(1) or original(attrs))
+    first = client.get_container_info("abc")
+    client.client.containers.attrs = _attrs(endpoint="e2")
+    second = client.get_container_info("abc")
+    # 네트워크 지문이 같으면 다시 파싱하지 않음
+    assert len(calls) == 1
+    assert (second.ip, second.port, second.created) == (first.ip, first.port, first.created)
+
+
+def test_network_change_invalidates_pause_fast_path():
+    client = _client()
+    client.get_container_info("abc")
+    assert client.container_from_event(_event("pause")).status == "paused"
+    client.invalidate_network("abc")
+    # IP가 바뀌었을 수 있으므로 unpause는 inspect 필요, die는 네트워크를 비우므로 그대로 적용
+    assert client.container_from_event(_event("unpause")) is None
+    assert client.container_from_event(_event("die")).ip == ""
+
+
+def test_forget_requires_fresh_inspect():
+    client = _client()
+    client.get_container_info("abc")
+    client.forget("abc")
+    assert client.container_from_event(_event("die")) is None
+
+
+def test_disconnected_client_fails_softly():
+    # 시작 시 데몬에 닿지 않은 호스트: 조회는 빈 결과, 이벤트 구독은 재연결 루프가 처리할 예외
+    client = _client()
+    client.client = None
+    assert client.list_all_containers() == []
+    assert client.get_container_info("abc") is None
+    assert client.ping() is False
+    client.sync_clock()
+    with pytest.raises(ConnectionError):
+        client.monitor_changes()
+
+
+def test_docker_time_ns_parses_nanosecond_timestamps():
+    assert docker_time_ns("1970-01-01T00:00:01.000000500Z") == 1_000_000_000
+    assert docker_time_ns("2024-05-01T09:00:00+09:00") == 1714521600 * 1_000_000_000
+    assert docker_time_ns("") is None
+
+
+def _summary():
+    return {
+        "Id": "abc",
+        "Names": ["/web"],
+        "Image": "nginx:latest",
+        "Created": 1714521600,
+        "State": "running",
+        "Labels": {"d2n.enabled": "true"},
+        "HostConfig": {"NetworkMode": "bridge"},
+        "NetworkSettings": {"Networks": {"bridge": {"IPAddress": "172.17.0.2"}}},
+    }
+
+
+def test_listed_versions_follow_daemon_clock():
+    # 데몬 시계가 로컬보다 30초 느린 원격 호스트
+    behind = datetime.now(timezone.utc) - timedelta(seconds=30)
+    client = _client()
+    client.client.info = lambda: {"SystemTime": behind.isoformat().replace("+00:00", "Z")}
+    client.client.api = SimpleNamespace(containers=lambda **kwargs: [_summary()])
+
+    listed = client.list_all_containers()
+    # 목록 직후 데몬에서 일어난 die 이벤트(데몬 시계의 timeNano)가 목록 상태보다 새것이어야 함
+    event_version = client.daemon_time_ns()
+    assert len(listed) == 1
+    assert listed[0].version <= event_version < time.time_ns() - 25 * 1_000_000_000
+
+
+def test_unreadable_daemon_clock_keeps_previous_offset():
+    client = _client()
+    client._clock_offset = -5
+
+    def fail():
+        raise ConnectionError("boom")
+
+    client.client.info = fail
+    client.client.api = SimpleNamespace(containers=lambda **kwargs: [])
+    assert client.list_all_containers() == []
+    assert client._clock_offset == -5
@@ -0,0 +1,142 @@
+import gzip
+import json
+import logging
+import queue
+import threading
+import time
+
+from src import logger as log_module
+
+
+def test_rotated_name_keeps_date_convention(tmp_path):
+    name = log_module._rotated_namer(str(tmp_path / "d2n.log.2026-05-30"))
+    expected = "2026-05-30.log.gz" if log_module.LOG_COMPRESS else "2026-05-30.log"
+    assert name == str(tmp_path / expected)
+
+
+def test_gzip_rotator_compresses_and_removes_source(tmp_path):
+    source = tmp_path / "d2n.log"
+    source.write_text("line 1\nline 2\n", encoding="utf-8")
+    dest = tmp_path / "2026-05-30.log.gz"
+
+    log_module._gzip_rotator(str(source), str(dest))
+
+    assert not source.exists()
+    with gzip.open(dest, "rt", encoding="utf-8") as f:
+        assert f.read() == "line 1\nline 2\n"
+
+
+def test_queue_handler_defers_formatting():
+    q = queue.SimpleQueue()
+    handler = log_module._DeferredQueueHandler(q)
+    record = logging.LogRecord("Main", logging.INFO, __file__, 1, "Created page %s for %s", ("p1", "web"), None)
+
+    handler.handle(record)
+
+    # 호출 스레드에서는 인자를 병합하지 않고 그대로 넘김 (포맷팅은 리스너 스레드에서)
+    queued = q.get_nowait()
+    assert queued.args == ("p1", "web")
+    assert queued.getMessage() == "Created page p1 for web"
+
+
+def _record(msg, *args, **extra):
+    record = logging.LogRecord("Main", logging.ERROR, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_includes_structured_fields():
+    record = _record("Updated page %s", "p1", container="web", db="db1", page_id="p1", duration=0.25)
+    payload = json.loads(log_module.JsonFormatter().format(record))
+    assert payload["message"] == "Updated page p1"
+    assert payload["level"] == "ERROR"
+    assert payload["logger"] == "Main"
+    assert (payload["container"], payload["db"], payload["page_id"], payload["duration"]) == ("web", "db1", "p1", 0.25)
+    # 값이 없는 필드는 생략
+    assert "action" not in payload
+
+
+def test_repeat_filter_collapses_into_summary():
+    now = [0.0]
+    f = log_module.RepeatFilter(60, clock=lambda: now[0])
+
+    assert f.filter(_record("Failed to update page %s", "p1")) is True
+    # 창 안의 같은 메시지는 억제, 다른 메시지는 통과
+    assert f.filter(_record("Failed to update page %s", "p1")) is False
+    assert f.filter(_record("Failed to update page %s", "p1")) is False
+    assert f.filter(_record("Failed to update page %s", "p2")) is True
+    assert f.drain() == []
+
+    now[0] = 61.0
+    summaries = f.drain()
+    assert len(summaries) == 1
+    assert summaries[0].repeated == 2
+    assert "repeated 2 times" in summaries[0].getMessage()
+    assert "Failed to update page p1" in summaries[0].getMessage()
+
+
+def test_repeat_filter_annotates_when_not_drained():
+    now = [0.0]
+    f = log_module.RepeatFilter(10, clock=lambda: now[0])
+    f.filter(_record("Detected event: die"))
+    f.filter(_record("Detected event: die"))
+
+    # 요약 전에 창이 지나 같은 메시지가 다시 오면 반복 횟수를 덧붙여 통과
+    now[0] = 11.0
+    record = _record("Detected event: die")
+    assert f.filter(record) is True
+    assert record.repeated == 1
+    assert record.getMessage() == "Detected event: die (repeated 1 more times)"
+
+
+def _sync_logger(f, name):
+    # 동기 모드(LOG_ASYNC=0)와 같은 구성: 필터가 로거에 붙고 핸들러가 바로 기록
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.filters = [f]
+    return logger, records
+
+
+def test_sync_mode_summaries_prune_remembered_messages():
+    now = [0.0]
+    f = log_module.RepeatFilter(60, clock=lambda: now[0])
+    logger, records = _sync_logger(f, "test-sync-prune")
+    for i in range(10_000):
+        logger.error("Failed to update page %s", i)
+    logger.error("Failed to update page %s", 0)
+    assert len(records) == 10_000
+
+    now[0] = 61.0
+    # 다음 로그를 기다리지 않고 주기 루프가 요약을 내보내며 기억한 메시지를 정리
+    assert log_module._emit_summaries(f, records.append) == 1
+    assert records[-1].repeated == 1
+    assert f._seen == {}
+
+
+def test_summary_loop_emits_without_further_records():
+    f = log_module.RepeatFilter(0.05)
+    logger, records = _sync_logger(f, "test-sync-loop")
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=log_module._summary_loop, args=(f, records.append, 0.02, stop), daemon=True
+    )
+    thread.start()
+    try:
+        logger.error("Docker event stream ended.")
+        logger.error("Docker event stream ended.")
+        for _ in range(100):
+            if len(records) == 2:
+                break
+            time.sleep(0.02)
+    finally:
+        stop.set()
+        thread.join(1)
+    assert [r.getMessage() for r in records] == [
+        "Docker event stream ended.",
+        "Last message repeated 1 times in 0s: Docker event stream ended.",
+    ]
@@ -0,0 +1,434 @@
+import textwrap
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from config.settings import Settings
+from src.cache_manager import CacheManager
+from src.debouncer import Debouncer
+from src.models import DockerContainerInfo
+from src.notion_client import NotionClient, RetryLaterError
+from src.outbox import OutboxDrainer
+from src.work_queue import ShardedWorkQueue
+import main
+
+YAML = textwrap.dedent(
+    """
+    targets:
+      default: "Docker"
+      databases:
+        - name: "Docker"
+          database_id: "db"
+    """
+)
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCKER_API_URL", "unix:///var/run/docker.sock")
+    monkeypatch.setenv("NOTION_API_KEY", "secret")
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(YAML, encoding="utf-8")
+    return Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(cache_file=str(tmp_path / "cache.json"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_guards(monkeypatch):
+    # DB별 서킷 브레이커는 프로세스 전역이므로 테스트마다 새로 만듦
+    monkeypatch.setattr(main, "_guards", {})
+
+
+class FakeNotion(NotionClient):
+    """Notion API 대신 호출을 기록하는 클라이언트. 속성 변환·지문은 실제 구현을 사용."""
+
+    def __init__(self):
+        # 네트워크 연결 없이 동작 (NotionClient.__init__ 우회)
+        self.container_id_property = ""
+        self.calls = []
+        self.pages = {}
+        # 다음 쓰기들이 차례로 던질 예외
+        self.failures = []
+
+    def _write(self, *call):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.calls.append(call)
+
+    def find_page_id(self, database_id, container_name, host="", container_id=""):
+        self.calls.append(("find", container_name))
+        return self.pages.get(container_name, "")
+
+    def create_page(self, database_id, container):
+        page_id = f"p{len(self.pages) + 1}"
+        self._write("create", page_id, container.status)
+        self.pages[container.name] = page_id
+        return page_id
+
+    def update_page(self, page_id, container):
+        self._write("update", page_id, container.status)
+        return True
+
+    def update_seen(self, page_id, seen):
+        self._write("seen", page_id)
+        return True
+
+    def writes(self):
+        return [call for call in self.calls if call[0] != "find"]
+
+
+def _container(status="running", version=0, **overrides):
+    base = dict(
+        container_id="c1",
+        name="web",
+        status=status,
+        seen="2024-05-01T09:00:00+09:00",
+        ip="172.17.0.2: bridge",
+        port="",
+        image="nginx:latest",
+        created="",
+        stack="",
+        d2n_enabled=True,
+        d2n_database="",
+        version=version,
+    )
+    base.update(overrides)
+    return DockerContainerInfo(**base)
+
+
+# --- _resume_point ---------------------------------------------------------
+
+
+def _daemon_clock(offset_ns=0):
+    return SimpleNamespace(host="", daemon_time_ns=lambda: time.time_ns() + offset_ns)
+
+
+def test_resume_point_rounds_cursor_down_to_seconds(settings, cache):
+    cursor = time.time_ns() - 5_500_000_000
+    cache.set_meta("event_cursor", cursor)
+    # Docker SDK의 since는 정수 초. 같은 초의 이벤트는 다시 받더라도 놓치지 않도록 내림
+    assert main._resume_point(cache, settings, _daemon_clock()) == cursor // 1_000_000_000
+
+
+def test_resume_point_requires_recent_cursor(settings, cache):
+    assert main._resume_point(cache, settings, _daemon_clock()) is None
+    cache.set_meta("event_cursor", time.time_ns() - 3600 * 1_000_000_000)
+    assert main._resume_point(cache, settings, _daemon_clock()) is None
+
+
+def test_resume_point_measures_gap_on_daemon_clock(settings, cache):
+    # 데몬 시계가 로컬보다 10분 느림: 커서(데몬 시각)는 5초 전이지만 로컬 시계로는 10분 전
+    behind = -600 * 1_000_000_000
+    cursor = time.time_ns() + behind - 5 * 1_000_000_000
+    cache.set_meta("event_cursor", cursor)
+    assert main._resume_point(cache, settings, _daemon_clock(behind)) == cursor // 1_000_000_000
+    # 반대로 데몬 시계가 빠르면 로컬 기준으로 최근이어도 공백이 큼
+    cache.set_meta("event_cursor", time.time_ns() - 5 * 1_000_000_000)
+    assert main._resume_point(cache, settings, _daemon_clock(-behind)) is None
+
+
+# --- 인덱스 스캔과 페이지 생성이 겹칠 때 ----------------------------------
+
+
+def test_full_index_scan_keeps_pages_created_during_the_scan(settings, cache):
+    notion = FakeNotion()
+    scan_started = time.time()
+    main.process_update(_container(), notion, cache, settings)
+    # 생성 전의 스냅샷을 담은 전체 스캔이 생성 뒤에 적재됨
+    cache.load_index("db", {}, complete=True, synced_at=scan_started)
+    assert cache.has_fresh_index("db")
+
+    main.process_update(_container("exited"), notion, cache, settings)
+    assert notion.writes() == [("create", "p1", "running"), ("update", "p1", "exited")]
+
+
+def test_container_index_covers_a_missing_name_mapping(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(), notion, cache, settings)
+    # 이름 기준 매핑만 사라지고(만료·LRU) DB 인덱스는 최신인 상태
+    cache.remove_page_id("db/web")
+    cache.load_index("db", {}, complete=True, synced_at=time.time())
+
+    main.process_update(_container("exited"), notion, cache, settings)
+    assert notion.writes() == [("create", "p1", "running"), ("update", "p1", "exited")]
+    assert cache.get_page_id("db/web") == "p1"
+
+
+# --- 상태 버전: 낡은 쓰기 / 아웃박스 대기 / 반영 정리 -------------------------
+
+
+def test_older_state_is_dropped_after_newer_write(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    main.process_update(_container("exited", version=30), notion, cache, settings)
+    # 늦게 도착한 전체 동기화 스냅샷(더 낮은 버전)은 새 상태를 덮지 않음
+    main.process_update(_container(version=20), notion, cache, settings)
+
+    assert notion.writes() == [("create", "p1", "running"), ("update", "p1", "exited")]
+    assert cache.get_version("p1") == 30
+    assert cache.get_outbox("db/web") is None
+
+
+def test_older_state_is_dropped_while_newer_state_waits_in_outbox(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    notion.failures.append(RetryLaterError("update", 503, 5))
+    main.process_update(_container("exited", version=30), notion, cache, settings)
+    assert cache.get_outbox("db/web")["version"] == 30
+
+    main.process_update(_container(version=20), notion, cache, settings)
+    # 기다리는 새 상태는 남아 재시도에 맡겨짐
+    assert notion.writes() == [("create", "p1", "running")]
+    assert cache.get_outbox("db/web")["version"] == 30
+
+    main.process_update(_container("exited", version=30), notion, cache, settings)
+    assert notion.writes()[-1] == ("update", "p1", "exited")
+    assert cache.get_outbox("db/web") is None
+
+
+def test_settle_keeps_newer_pending_state(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    main._write_ahead("db/web", _container("exited", version=30), cache, settings)
+
+    # 반영하는 사이 더 새 상태가 들어왔으면 남기고, 같거나 새 버전이 반영되면 정리
+    main._settle("db/web", _container(version=20), cache)
+    assert cache.get_outbox("db/web")["version"] == 30
+    main._settle("db/web", _container("exited", version=30), cache)
+    assert cache.get_outbox("db/web") is None
+
+
+def test_removed_container_settles_page_mapping(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    main.process_update(_container("removed", version=20), notion, cache, settings)
+
+    assert notion.writes()[-1] == ("update", "p1", "removed")
+    # 페이지는 removed로 남으므로 이름 기준 매핑은 유지하고 컨테이너 ID만 정리
+    assert cache.get_page_id("db/web") == "p1"
+    assert cache.get_container_page("c1") is None
+
+
+def test_recreated_container_reuses_page_with_fresh_index(settings, cache):
+    notion = FakeNotion()
+    cache.load_index("db", {}, complete=True, synced_at=time.time())
+    main.process_update(_container(version=10), notion, cache, settings)
+    main.process_update(_container("removed", version=20), notion, cache, settings)
+
+    # compose down/up: 같은 이름, 새 컨테이너 ID
+    main.process_update(_container(version=30, container_id="c2"), notion, cache, settings)
+    assert notion.writes() == [
+        ("create", "p1", "running"),
+        ("update", "p1", "removed"),
+        ("update", "p1", "running"),
+    ]
+    assert cache.get_container_page("c2") == ("db/web", "p1")
+
+
+# --- 아웃박스(write-ahead) -------------------------------------------------
+
+
+def test_outbox_entry_is_written_before_the_notion_write(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    pending = []
+    update_page = notion.update_page
+
+    def recording_update(page_id, container):
+        pending.append(cache.get_outbox("db/web"))
+        return update_page(page_id, container)
+
+    notion.update_page = recording_update
+    main.process_update(_container("exited", version=20), notion, cache, settings)
+
+    assert [(state["status"], state["version"]) for state in pending] == [("exited", 20)]
+    # 반영되면 제거
+    assert cache.get_outbox("db/web") is None
+    assert cache.outbox_size() == 0
+
+
+def test_failed_write_stays_in_outbox_until_a_retry_succeeds(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    notion.failures.append(ConnectionError("reset by peer"))
+    main.process_update(_container("exited", version=20), notion, cache, settings)
+    # 실패한 쓰기는 페이지 매핑과 함께 남아 재시도를 기다림
+    assert cache.get_outbox("db/web")["status"] == "exited"
+    assert cache.get_page_id("db/web") == "p1"
+
+    notion.failures.append(RetryLaterError("update", 503, 5))
+    main.process_update(_container("exited", version=20), notion, cache, settings)
+    assert cache.get_outbox("db/web")["status"] == "exited"
+    assert cache.due_outbox(time.time()) == []
+    assert [key for key, _ in cache.due_outbox(time.time() + 60)] == ["db/web"]
+
+    main.process_update(_container("exited", version=20), notion, cache, settings)
+    assert notion.writes() == [("create", "p1", "running"), ("update", "p1", "exited")]
+    assert cache.get_outbox("db/web") is None
+
+
+def test_newer_state_replaces_pending_outbox_entry(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    notion.failures.append(RetryLaterError("update", 503, 5))
+    main.process_update(_container("exited", version=20), notion, cache, settings)
+    notion.failures.append(RetryLaterError("update", 503, 5))
+    main.process_update(_container("paused", version=30), notion, cache, settings)
+
+    # 재시도를 기다리던 exited 대신 최신 상태 하나만 남음
+    pending = cache.get_outbox("db/web")
+    assert (pending["status"], pending["version"]) == ("paused", 30)
+    assert cache.outbox_size() == 1
+
+    # OutboxDrainer의 재시도는 처리 시점의 최신 상태를 읽어 반영
+    drainer = OutboxDrainer(cache, lambda key, state: None)
+    main._replay_outbox("db/web", drainer, notion, cache, settings)
+    assert notion.writes() == [("create", "p1", "running"), ("update", "p1", "paused")]
+    assert cache.get_outbox("db/web") is None
+
+
+# --- 변경 없는 상태의 쓰기 생략 / Seen 갱신 주기 ------------------------------
+
+
+def _age_fingerprint(cache, page_id, seconds):
+    # 마지막 반영 시각을 과거로 돌림
+    cache.fingerprints[page_id]["pushed_at"] = time.time() - seconds
+
+
+def test_unchanged_state_skips_the_write(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    # Seen만 다른 같은 상태 (주기적 전체 동기화)
+    main.process_update(_container(version=20, seen="2024-05-01T10:00:00+09:00"), notion, cache, settings)
+
+    assert notion.writes() == [("create", "p1", "running")]
+    assert cache.get_outbox("db/web") is None
+
+
+def test_unchanged_state_refreshes_only_seen_after_interval(settings, cache):
+    settings.SEEN_REFRESH_SECONDS = 600
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    _age_fingerprint(cache, "p1", 601)
+
+    main.process_update(_container(version=20, seen="2024-05-01T10:00:00+09:00"), notion, cache, settings)
+    # 갱신 직후에는 다시 주기가 시작됨
+    main.process_update(_container(version=30, seen="2024-05-01T10:05:00+09:00"), notion, cache, settings)
+
+    assert notion.writes() == [("create", "p1", "running"), ("seen", "p1")]
+    assert cache.get_version("p1") == 20
+    assert cache.get_outbox("db/web") is None
+
+
+def test_seen_refresh_disabled_with_zero_interval(settings, cache):
+    settings.SEEN_REFRESH_SECONDS = 0
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    _age_fingerprint(cache, "p1", 86400)
+
+    main.process_update(_container(version=20, seen="2024-05-02T09:00:00+09:00"), notion, cache, settings)
+    assert notion.writes() == [("create", "p1", "running")]
+
+
+def test_changed_state_writes_the_full_page(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container(version=10), notion, cache, settings)
+    main.process_update(_container(version=20, ip="172.17.0.3: bridge"), notion, cache, settings)
+    main.process_update(_container("exited", version=30, ip=""), notion, cache, settings)
+
+    assert notion.writes() == [
+        ("create", "p1", "running"),
+        ("update", "p1", "running"),
+        ("update", "p1", "exited"),
+    ]
+    assert cache.get_fingerprint("p1") == notion.fingerprint(_container("exited", version=30, ip=""))
+
+
+def test_failed_search_defers_state_to_outbox(settings, cache):
+    notion = FakeNotion()
+    find_page_id = notion.find_page_id
+    failures = [RetryLaterError("find_page_id", 503, 5)]
+
+    def flaky_find(*args, **kwargs):
+        if failures:
+            raise failures.pop(0)
+        return find_page_id(*args, **kwargs)
+
+    notion.find_page_id = flaky_find
+    main.process_update(_container(version=10), notion, cache, settings)
+    # 검색이 실패하면 만들지 않고(중복 방지) 상태를 아웃박스에 남겨 재시도 시각을 예약
+    assert notion.writes() == []
+    assert cache.get_outbox("db/web")["version"] == 10
+    assert cache.due_outbox(time.time()) == []
+
+    main.process_update(_container(version=10), notion, cache, settings)
+    assert notion.writes() == [("create", "p1", "running")]
+    assert cache.get_outbox("db/web") is None
+
+
+# --- 이벤트 지연 게이지 ------------------------------------------------------
+
+
+def _docker(container, now_ns):
+    # handle_event가 쓰는 DockerClient 메서드만 흉내 냄
+    return SimpleNamespace(
+        host="",
+        forget=lambda container_id: None,
+        container_from_event=lambda event: container,
+        get_container_info=lambda container_id: container,
+        daemon_time_ns=lambda: now_ns,
+    )
+
+
+def _die_event(time_nano):
+    return {"Action": "die", "id": "c1", "Actor": {"ID": "c1", "Attributes": {"name": "web"}}, "timeNano": time_nano}
+
+
+def test_event_lag_is_recorded_only_for_written_events(settings, cache):
+    notion = FakeNotion()
+    main.process_update(_container("exited", version=10), notion, cache, settings)
+    main.EVENT_LAG_SECONDS.set(-1.0)
+
+    # 이미 반영된 상태(쓰기 생략)는 지연으로 기록하지 않음
+    main.handle_event(_die_event(20), _docker(_container("exited"), 2_000_000_020), notion, cache, settings)
+    assert main.EVENT_LAG_SECONDS.value() == -1.0
+
+    notion.failures.append(RetryLaterError("update", 503, 5))
+    main.handle_event(_die_event(30), _docker(_container("paused"), 3_000_000_030), notion, cache, settings)
+    assert main.EVENT_LAG_SECONDS.value() == -1.0
+
+    # 실제로 쓴 이벤트만 데몬 시계 기준으로 기록
+    main.handle_event(_die_event(40), _docker(_container("paused"), 4_000_000_040), notion, cache, settings)
+    assert main.EVENT_LAG_SECONDS.value() == 4.0
+
+
+# --- 이벤트 큐 보고 ----------------------------------------------------------
+
+
+def test_queue_report_runs_without_incoming_events(caplog):
+    # 워커 하나가 멈춰 큐가 쌓였고 새 이벤트는 들어오지 않는 상태
+    work_queue = ShardedWorkQueue(1, 10)
+    debouncer = Debouncer(0, lambda key, event: None)
+    release = threading.Event()
+    work_queue.submit("c1", lambda: release.wait(5))
+    work_queue.submit("c1", lambda: None)
+    stop = threading.Event()
+    reporter = threading.Thread(target=main._report_queue, args=(work_queue, debouncer, 0.02, stop), daemon=True)
+    try:
+        with caplog.at_level("INFO", logger=main.main_logger.name):
+            reporter.start()
+            for _ in range(100):
+                if any("Event queue: depth 1" in r.getMessage() for r in caplog.records):
+                    break
+                time.sleep(0.02)
+    finally:
+        stop.set()
+        reporter.join(1)
+        release.set()
+        debouncer.stop()
+        work_queue.stop()
+    assert any("Event queue: depth 1" in r.getMessage() for r in caplog.records)
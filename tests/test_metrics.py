@@ -0,0 +1,65 @@
+import urllib.request
+
+from src.metrics import REGISTRY, Counter, Gauge, Histogram, start_metrics_server, timed
+
+
+def test_counter_renders_labels():
+    counter = Counter("test_events_total", "events", ("action",))
+    counter.inc("start")
+    counter.inc("start")
+    counter.inc("die")
+
+    text = REGISTRY.render()
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{action="start"} 2' in text
+    assert 'test_events_total{action="die"} 1' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("test_latency_seconds", "latency", buckets=(0.1, 1.0))
+    hist.observe(0.05)
+    hist.observe(0.5)
+    hist.observe(5.0)
+
+    text = REGISTRY.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_count 3" in text
+
+
+def test_timed_records_even_on_error():
+    hist = Histogram("test_timed_seconds", "timed", ("method",))
+
+    @timed(hist, "boom")
+    def fail():
+        raise RuntimeError("boom")
+
+    try:
+        fail()
+    except RuntimeError:
+        pass
+    # 예외가 나도 지연 시간은 기록됨
+    assert hist.count("boom") == 1
+
+
+def test_gauge_function_is_read_at_scrape():
+    depth = [3]
+    gauge = Gauge("test_queue_depth", "depth")
+    gauge.set_function(lambda: depth[0])
+    depth[0] = 7
+    assert "test_queue_depth 7" in REGISTRY.render()
+
+
+def test_metrics_endpoint_serves_registry():
+    Counter("test_scraped_total", "scraped").inc()
+    server = start_metrics_server("127.0.0.1", 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            assert response.headers["Content-Type"].startswith("text/plain")
+        assert "test_scraped_total 1" in body
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,8 +1,12 @@
 from src.docker_client import (
+    container_info_from_event,
+    container_info_from_summary,
+    epoch_to_local_iso,
     is_host_network,
     parse_ip,
     parse_ports,
     parse_stack,
+    parse_summary_ports,
     to_local_iso,
 )
 
@@ -176,3 +180,118 @@ def test_parse_stack_compose_takes_precedence():
 def test_parse_stack_none():
     assert parse_stack({}) == ""
     assert parse_stack({"some.other.label": "x"}) == ""
+
+
+# --- 컨테이너 목록 요약 (/containers/json) ---------------------------------
+
+def test_parse_summary_ports_matches_inspect_format():
+    ports = [
+        {"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+        {"IP": "::", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+        {"IP": "127.0.0.1", "PrivatePort": 5432, "PublicPort": 5432, "Type": "tcp"},
+        {"PrivatePort": 9000, "Type": "tcp"},
+    ]
+    assert parse_summary_ports(ports) == "5432 → 127.0.0.1:5432/tcp\n80 → 8080/tcp\n9000/tcp"
+
+
+def test_parse_summary_ports_empty():
+    assert parse_summary_ports([]) == ""
+
+
+def test_epoch_to_local_iso():
+    assert epoch_to_local_iso(1714521600, "Asia/Seoul") == "2024-05-01T09:00:00+09:00"
+    assert epoch_to_local_iso(0, "UTC") == ""
+
+
+def test_to_local_iso_seconds_matches_epoch():
+    assert to_local_iso("2024-05-01T00:00:00.123456789Z", "UTC", "seconds") == epoch_to_local_iso(
+        1714521600, "UTC"
+    )
+
+
+def _summary(**overrides):
+    base = {
+        "Id": "abc123",
+        "Names": ["/web"],
+        "Image": "nginx:latest",
+        "Created": 1714521600,
+        "State": "running",
+        "Ports": [{"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"}],
+        "Labels": {"d2n.enabled": "true", "d2n.database": "Jenkins", "com.docker.compose.project": "app"},
+        "HostConfig": {"NetworkMode": "bridge"},
+        "NetworkSettings": {"Networks": {"bridge": {"IPAddress": "172.17.0.2"}}},
+    }
+    base.update(overrides)
+    return base
+
+
+def test_container_info_from_summary():
+    info = container_info_from_summary(_summary(), "UTC")
+    assert info is not None
+    assert info.name == "web"
+    assert info.status == "running"
+    assert info.ip == "172.17.0.2: bridge"
+    assert info.port == "80 → 8080/tcp"
+    assert info.created == "2024-05-01T00:00:00+00:00"
+    assert info.stack == "app"
+    assert info.d2n_enabled is True
+    assert info.d2n_database == "Jenkins"
+
+
+def test_container_info_from_summary_host_network():
+    info = container_info_from_summary(_summary(HostConfig={"NetworkMode": "host"}), "UTC")
+    assert info is not None
+    assert info.ip == "host"
+
+
+def test_container_info_from_summary_needs_inspect_for_untagged_image():
+    assert container_info_from_summary(_summary(Image="sha256:deadbeef"), "UTC") is None
+    assert container_info_from_summary(_summary(Names=[]), "UTC") is None
+
+
+# --- container_info_from_event ---------------------------------------------
+
+
+def _event(action, name="web"):
+    return {"Action": action, "id": "abc123", "Actor": {"ID": "abc123", "Attributes": {"name": name}}}
+
+
+def test_container_info_from_event_die_clears_network():
+    known = container_info_from_summary(_summary(), "UTC")
+    info = container_info_from_event(_event("die"), known, "UTC")
+    assert info is not None
+    assert info.status == "exited"
+    assert (info.ip, info.port) == ("", "")
+    # 정적 속성은 마지막으로 확인한 값 그대로
+    assert (info.image, info.created, info.stack) == (known.image, known.created, known.stack)
+
+
+def test_container_info_from_event_keeps_host_network():
+    known = container_info_from_summary(_summary(HostConfig={"NetworkMode": "host"}), "UTC")
+    info = container_info_from_event(_event("stop"), known, "UTC")
+    assert info is not None
+    assert info.ip == "host"
+
+
+def test_container_info_from_event_pause_and_unpause_keep_network():
+    known = container_info_from_summary(_summary(), "UTC")
+    paused = container_info_from_event(_event("pause"), known, "UTC")
+    assert paused is not None
+    assert (paused.status, paused.ip, paused.port) == ("paused", known.ip, known.port)
+    resumed = container_info_from_event(_event("unpause"), paused, "UTC")
+    assert resumed is not None
+    assert (resumed.status, resumed.ip) == ("running", known.ip)
+
+
+def test_container_info_from_event_needs_inspect_for_other_actions():
+    known = container_info_from_summary(_summary(), "UTC")
+    for action in ("create", "start", "restart"):
+        assert container_info_from_event(_event(action), known, "UTC") is None
+
+
+def test_container_info_versions_follow_list_time_and_event_time():
+    known = container_info_from_summary(_summary(), "UTC", version=100)
+    assert known is not None and known.version == 100
+    # 이벤트로 만든 상태는 이벤트의 timeNano가 버전
+    info = container_info_from_event(dict(_event("die"), timeNano=250), known, "UTC")
+    assert info is not None and info.version == 250
@@ -0,0 +1,154 @@
+import time
+import httpx
+import pytest
+from notion_client.errors import HTTPResponseError
+from src.models import DockerContainerInfo
+from src.concurrency import AdaptiveConcurrency
+from src.notion_client import NotionClient, RetryLaterError
+from src.priority import Priority, notion_priority
+from src.rate_limiter import TokenBucket
+
+
+class _FakeDatabases:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def query(self, **kwargs):
+        self.calls.append(kwargs)
+        start = int(kwargs.get("start_cursor") or 0)
+        size = kwargs.get("page_size", 100)
+        chunk = self.pages[start:start + size]
+        more = start + size < len(self.pages)
+        return {
+            "results": chunk,
+            "has_more": more,
+            "next_cursor": str(start + size) if more else None,
+        }
+
+
+class _FakeClient:
+    def __init__(self, pages):
+        self.databases = _FakeDatabases(pages)
+
+
+def _page(page_id, name):
+    return {"id": page_id, "properties": {"Name": {"title": [{"plain_text": name}]}}}
+
+
+def _client(pages, container_id_property=""):
+    # 네트워크 연결 없이 조회 로직만 검증 (__init__ 우회)
+    client = NotionClient.__new__(NotionClient)
+    client.client = _FakeClient(pages)
+    client.limiter = TokenBucket(rate=1000, burst=1000)
+    client.concurrency = AdaptiveConcurrency(maximum=16)
+    client.container_id_property = container_id_property
+    return client
+
+
+def test_query_pages_paginates_all_results():
+    pages = [_page(f"p{i}", f"c{i}") for i in range(250)]
+    client = _client(pages)
+    index = client.query_pages("db-1")
+    assert len(index) == 250
+    assert index["c0"] == "p0"
+    assert len(client.client.databases.calls) == 3
+
+
+def test_query_pages_keeps_first_duplicate():
+    client = _client([_page("p1", "web"), _page("p2", "web")])
+    assert client.query_pages("db-1") == {"web": "p1"}
+
+
+def test_query_pages_incremental_uses_last_edited_filter():
+    client = _client([])
+    client.query_pages("db-1", edited_since="2024-05-01T00:00:00+00:00")
+    query = client.client.databases.calls[0]
+    assert query["filter"]["timestamp"] == "last_edited_time"
+    assert query["filter"]["last_edited_time"] == {"on_or_after": "2024-05-01T00:00:00+00:00"}
+
+
+def test_query_pages_keys_pages_with_host():
+    page = _page("p2", "web")
+    page["properties"]["Host"] = {"rich_text": [{"plain_text": "nas"}]}
+    client = _client([_page("p1", "web"), page])
+    assert client.query_pages("db-1") == {"web": "p1", "nas/web": "p2"}
+
+
+class _UnavailablePages:
+    def __init__(self):
+        self.calls = 0
+
+    def update(self, **kwargs):
+        self.calls += 1
+        raise HTTPResponseError(httpx.Response(503, headers={"Retry-After": "7"}))
+
+
+def test_find_page_id_filters_by_name_only_without_id_property():
+    client = _client([_page("p1", "web")])
+    assert client.find_page_id("db-1", "web", container_id="abc") == "p1"
+    assert client.client.databases.calls[0]["filter"] == {"property": "Name", "title": {"equals": "web"}}
+
+
+def test_find_page_id_prefers_container_id_match():
+    # 이름이 바뀐 컨테이너: 옛 이름의 페이지가 ID 속성으로 함께 조회되면 그쪽을 우선
+    renamed = _page("p2", "old-web")
+    renamed["properties"]["Container ID"] = {"rich_text": [{"plain_text": "abc"}]}
+    client = _client([_page("p1", "web"), renamed], container_id_property="Container ID")
+    assert client.find_page_id("db-1", "web", container_id="abc") == "p2"
+    query_filter = client.client.databases.calls[0]["filter"]
+    assert query_filter["or"][1] == {"property": "Container ID", "rich_text": {"equals": "abc"}}
+
+
+def test_update_page_defers_retry_without_sleeping():
+    client = _client([])
+    client.client.pages = _UnavailablePages()
+    container = DockerContainerInfo("c1", "web", "running", "", "", "", "nginx", "", "", True, "")
+    started = time.monotonic()
+    with pytest.raises(RetryLaterError) as info:
+        client.update_page("page-1", container)
+    # 한 번만 보내고 기다리지 않으며, Retry-After를 재시도 대기로 전달
+    assert client.client.pages.calls == 1
+    assert time.monotonic() - started < 1.0
+    assert info.value.retry_after == 7.0
+
+
+class _UnavailableDatabases:
+    def __init__(self):
+        self.calls = 0
+
+    def query(self, **kwargs):
+        self.calls += 1
+        raise HTTPResponseError(httpx.Response(503, headers={"Retry-After": "7"}))
+
+
+def test_find_page_id_defers_retry_without_sleeping():
+    client = _client([])
+    client.client.databases = _UnavailableDatabases()
+    started = time.monotonic()
+    # 이벤트 워커의 검색도 쓰기처럼 한 번만 보내고 재시도는 호출측(아웃박스)에 맡김
+    with pytest.raises(RetryLaterError):
+        client.find_page_id("db-1", "web")
+    assert client.client.databases.calls == 1
+    assert time.monotonic() - started < 1.0
+
+
+def test_query_pages_gives_up_past_retry_budget():
+    client = _client([])
+    client.client.databases = _UnavailableDatabases()
+    started = time.monotonic()
+    # Retry-After(7초)가 대기 한도를 넘으므로 기다리지 않고 실패 (호출측은 개별 검색으로 폴백)
+    assert client.query_pages("db-1") is None
+    assert client.client.databases.calls == 1
+    assert time.monotonic() - started < 1.0
+
+
+def test_limiter_receives_current_priority():
+    client = _client([_page("p1", "c1")])
+    seen = []
+    client.limiter.acquire = lambda priority=0: seen.append(priority) or 0.0
+    client.query_pages("db-1")
+    with notion_priority(Priority.BULK):
+        client.query_pages("db-1")
+    # 블록 밖은 기본값(속성 변경), 블록 안은 지정한 우선순위로 토큰을 요청
+    assert seen == [Priority.CHANGE, Priority.BULK]
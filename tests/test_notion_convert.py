@@ -1,5 +1,5 @@
 from src.models import DockerContainerInfo
-from src.notion_client import NotionClient, _rich_text
+from src.notion_client import NotionClient, _rich_text, property_fingerprint
 
 
 def _container(**overrides):
@@ -20,9 +20,10 @@ def _container(**overrides):
     return DockerContainerInfo(**base)
 
 
-def _convert(container):
+def _convert(container, container_id_property=""):
     # 네트워크 연결 없이 변환 로직만 검증 (__init__ 우회)
     client = NotionClient.__new__(NotionClient)
+    client.container_id_property = container_id_property
     return client._convert_property(container)
 
 
@@ -63,7 +64,30 @@ def test_convert_omits_stacks_when_empty():
     assert "Stacks" not in props
 
 
+def test_convert_sets_host_only_when_present():
+    assert "Host" not in _convert(_container())
+    assert _convert(_container(host="nas"))["Host"] == {"rich_text": [{"text": {"content": "nas"}}]}
+
+
+def test_convert_sets_container_id_only_when_configured():
+    assert "Container ID" not in _convert(_container())
+    props = _convert(_container(), container_id_property="Container ID")
+    assert props["Container ID"] == {"rich_text": [{"text": {"content": "abc123"}}]}
+
+
 def test_convert_empty_ip_clears_property():
     props = _convert(_container(ip="", port=""))
     assert props["IP"] == {"rich_text": []}
     assert props["Ports"] == {"rich_text": []}
+
+
+def test_fingerprint_ignores_seen():
+    a = _convert(_container(seen="2024-05-01T09:00:00+09:00"))
+    b = _convert(_container(seen="2024-05-02T09:00:00+09:00"))
+    assert property_fingerprint(a) == property_fingerprint(b)
+
+
+def test_fingerprint_changes_with_status():
+    a = _convert(_container(status="running"))
+    b = _convert(_container(status="exited"))
+    assert property_fingerprint(a) != property_fingerprint(b)
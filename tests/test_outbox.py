@@ -0,0 +1,34 @@
+import time
+from src.cache_manager import CacheManager
+from src.outbox import OutboxDrainer
+
+
+def _drainer(tmp_path, host=""):
+    cm = CacheManager(cache_file=str(tmp_path / "cache.json"))
+    dispatched = []
+    drainer = OutboxDrainer(cm, lambda key, state: dispatched.append(key), host)
+    return cm, drainer, dispatched
+
+
+def test_drain_dispatches_due_entries_once_until_done(tmp_path):
+    cm, drainer, dispatched = _drainer(tmp_path)
+    cm.put_outbox("db/web", {"name": "web"}, 1, 300)
+    later = time.time() + 60
+    assert drainer.drain(later) == 1
+    # 처리가 끝나기(done) 전에는 다시 넘기지 않음
+    assert drainer.drain(later) == 0
+    drainer.done("db/web")
+    assert drainer.drain(later) == 1
+    assert dispatched == ["db/web", "db/web"]
+
+
+def test_drain_skips_other_hosts_and_pause(tmp_path):
+    cm, drainer, dispatched = _drainer(tmp_path, host="nas")
+    cm.put_outbox("db/pi/web", {"name": "web", "host": "pi"}, 1, 300)
+    cm.put_outbox("db/nas/web", {"name": "web", "host": "nas"}, 1, 300)
+    later = time.time() + 60
+    drainer.pause()
+    assert drainer.drain(later) == 0
+    drainer.resume()
+    assert drainer.drain(later) == 1
+    assert dispatched == ["db/nas/web"]
@@ -0,0 +1,83 @@
+import threading
+import time
+import pytest
+from src.rate_limiter import TokenBucket
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _bucket(rate=3.0, burst=3.0, recovery=60.0):
+    clock = _FakeClock()
+    return TokenBucket(rate, burst, recovery_seconds=recovery, clock=clock, sleep=clock.sleep), clock
+
+
+def test_burst_is_served_without_waiting():
+    bucket, _ = _bucket(rate=3, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_paces_at_rate_after_burst():
+    bucket, clock = _bucket(rate=2, burst=1)
+    for _ in range(5):
+        bucket.acquire()
+    # 첫 토큰은 버스트, 나머지 4개는 초당 2개씩
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_penalize_blocks_for_retry_after_and_lowers_rate():
+    bucket, clock = _bucket(rate=4, burst=4)
+    bucket.penalize(5.0)
+    assert bucket.rate == 2.0
+    waited = bucket.acquire()
+    assert waited >= 5.0
+    assert clock.now >= 5.0
+
+
+def test_rate_recovers_after_penalty():
+    bucket, clock = _bucket(rate=4, burst=4, recovery=10.0)
+    bucket.penalize(0.0)
+    clock.now += 10.0
+    bucket.acquire()
+    assert bucket.rate == 4.0
+
+
+def test_invalid_rate_raises():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_higher_priority_waiter_is_served_first():
+    # 실제 시간 사용: 토큰이 0.2초마다 하나씩 보충됨
+    bucket = TokenBucket(rate=5, burst=1)
+    bucket.acquire()
+    order = []
+
+    def take(name, priority):
+        bucket.acquire(priority)
+        order.append(name)
+
+    bulk = threading.Thread(target=take, args=("bulk", 2))
+    bulk.start()
+    time.sleep(0.05)
+    live = threading.Thread(target=take, args=("live", 0))
+    live.start()
+    bulk.join(timeout=2)
+    live.join(timeout=2)
+    # 먼저 기다리던 대량 작업보다 나중에 온 상태 전환이 먼저 토큰을 받음
+    assert order == ["live", "bulk"]
+
+
+def test_aging_prevents_starvation():
+    bucket, clock = _bucket(rate=1, burst=1)
+    bucket._waiters = {0: (2, 0.0), 1: (0, 10.0)}
+    # 10초 기다린 대량 작업(2 - 10/5 = 0)이 막 온 상태 전환(0)과 같아지면 먼저 온 쪽이 이김
+    assert bucket._next_waiter(10.0) == 0
@@ -51,3 +51,111 @@ def test_missing_required_env_raises(tmp_path, monkeypatch):
     yaml_path.write_text(YAML, encoding="utf-8")
     with pytest.raises(ValueError):
         Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path))
+
+
+def test_sync_defaults(settings):
+    assert settings.SEEN_REFRESH_SECONDS == 3600
+    assert settings.BULK_INDEX is True
+    assert settings.SYNC_WORKERS == 4
+    assert settings.EVENT_WORKERS == 4
+    assert settings.EVENT_QUEUE_SIZE == 1000
+    assert settings.EVENT_DEBOUNCE_SECONDS == 1.0
+    assert settings.EVENT_RESUME_HORIZON == 300
+    assert settings.CACHE_FLUSH_INTERVAL == 1.0
+    assert settings.CACHE_TTL_SECONDS == 300
+    assert settings.CACHE_MAX_ENTRIES == 0
+
+
+def test_notion_rate_defaults(settings):
+    assert settings.NOTION_RATE_LIMIT == 3.0
+    assert settings.NOTION_BURST == 3
+
+
+def test_metrics_defaults(settings):
+    # 메트릭 엔드포인트는 기본적으로 꺼져 있음
+    assert settings.METRICS_ENABLED is False
+    assert settings.METRICS_HOST == "0.0.0.0"
+    assert settings.METRICS_PORT == 9464
+
+
+def test_outbox_defaults(settings):
+    assert settings.OUTBOX_RETRY_SECONDS == 1.0
+    assert settings.OUTBOX_MAX_RETRY_SECONDS == 300.0
+
+
+def test_invalid_sync_value_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCKER_API_URL", "unix:///var/run/docker.sock")
+    monkeypatch.setenv("NOTION_API_KEY", "secret")
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(YAML + "sync:\n  seen_refresh_seconds: -1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path))
+
+
+def test_single_docker_host_from_env(settings):
+    assert settings.DOCKER_HOSTS == {"": "unix:///var/run/docker.sock"}
+
+
+def test_docker_hosts_list(tmp_path, monkeypatch):
+    monkeypatch.delenv("DOCKER_API_URL", raising=False)
+    monkeypatch.setenv("NOTION_API_KEY", "secret")
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(
+        YAML + "docker:\n  hosts:\n"
+        "    - name: nas\n      url: tcp://nas:2375\n"
+        "    - name: pi\n      url: tcp://pi:2375\n",
+        encoding="utf-8",
+    )
+    s = Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path))
+    assert s.DOCKER_HOSTS == {"nas": "tcp://nas:2375", "pi": "tcp://pi:2375"}
+
+
+def test_duplicate_docker_host_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("NOTION_API_KEY", "secret")
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(
+        YAML + "docker:\n  hosts:\n"
+        "    - name: nas\n      url: tcp://a:2375\n"
+        "    - name: nas\n      url: tcp://b:2375\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path))
+
+
+def test_breaker_defaults(settings):
+    assert settings.NOTION_BREAKER_FAILURES == 5
+    assert settings.NOTION_BREAKER_RESET_SECONDS == 30
+    # DB별 동시 처리 상한은 기본적으로 이벤트 워커(기본 4)의 절반
+    assert settings.NOTION_DB_CONCURRENCY == 2
+
+
+def test_database_concurrency_follows_event_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("NOTION_API_KEY", "secret")
+    monkeypatch.setenv("DOCKER_API_URL", "unix:///var/run/docker.sock")
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(YAML + "events:\n  workers: 5\n", encoding="utf-8")
+    assert Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path)).NOTION_DB_CONCURRENCY == 3
+
+    yaml_path.write_text(YAML + "events:\n  workers: 5\nnotion:\n  database_concurrency: 0\n", encoding="utf-8")
+    assert Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path)).NOTION_DB_CONCURRENCY == 0
+
+
+def test_single_database_concurrency_covers_all_workers(tmp_path, monkeypatch):
+    # 나눠 줄 다른 DB가 없으면 이벤트·전체 동기화 워커 모두가 쓸 수 있음
+    monkeypatch.setenv("NOTION_API_KEY", "secret")
+    monkeypatch.setenv("DOCKER_API_URL", "unix:///var/run/docker.sock")
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(
+        'targets:\n  default: "Docker"\n  databases:\n    - name: "Docker"\n      database_id: "db"\n',
+        encoding="utf-8",
+    )
+    assert Settings(env_file=str(tmp_path / ".env"), yaml_file=str(yaml_path)).NOTION_DB_CONCURRENCY == 8
+
+
+def test_max_concurrency_default(settings):
+    assert settings.NOTION_MAX_CONCURRENCY == 16
+
+
+def test_container_id_property_disabled_by_default(settings):
+    assert settings.NOTION_CONTAINER_ID_PROPERTY == ""
@@ -0,0 +1,83 @@
+import threading
+import time
+import pytest
+from src.singleflight import SingleFlight
+
+
+def _concurrent(flight, key, func, callers):
+    # 첫 호출이 func 안에서 멈춘 동안 나머지를 같은 키로 보냄
+    results = []
+    errors = []
+
+    def run():
+        try:
+            results.append(flight.do(key, func))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(callers)]
+    threads[0].start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def create():
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        return "page-1"
+
+    threads, results, _ = _concurrent(flight, "db/web", create, 4)
+    assert entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # 나머지가 진행 중인 호출을 기다리기 시작할 때까지
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [("page-1", False)] + [("page-1", True)] * 3
+    assert flight.in_flight() == 0
+
+
+def test_error_is_shared_with_waiters():
+    flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        entered.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    threads, _, errors = _concurrent(flight, "db/web", fail, 2)
+    assert entered.wait(5)
+    threads[1].start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert [str(e) for e in errors] == ["boom", "boom"]
+
+
+def test_finished_call_is_not_reused():
+    # 끝난 호출의 결과는 캐시하지 않음 (다음 호출은 다시 실행)
+    flight = SingleFlight()
+    assert flight.do("db/web", lambda: "page-1") == ("page-1", False)
+    assert flight.do("db/web", lambda: "page-2") == ("page-2", False)
+    with pytest.raises(ValueError):
+        flight.do("db/web", lambda: int("x"))
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    inner = flight.do("db/api", lambda: flight.do("db/web", lambda: "page-2")[0])
+    assert inner == ("page-2", False)
@@ -0,0 +1,56 @@
+import threading
+import time
+from src.work_queue import ShardedWorkQueue
+
+
+def test_same_key_is_processed_in_order():
+    wq = ShardedWorkQueue(workers=4, maxsize=100)
+    seen = []
+    for i in range(50):
+        wq.submit("web", lambda i=i: seen.append(i))
+    wq.join()
+    wq.stop()
+    assert seen == list(range(50))
+
+
+def test_different_keys_run_in_parallel():
+    wq = ShardedWorkQueue(workers=2, maxsize=10)
+    barrier = threading.Barrier(2, timeout=2)
+    # 두 작업이 동시에 실행되지 않으면 Barrier가 타임아웃으로 깨짐
+    results = []
+    keys = ["a", "b", "c", "d", "e"]
+    shards = {}
+    for key in keys:
+        shards.setdefault(wq._queues.index(wq._shard(key)), key)
+    first, second = list(shards.values())[:2]
+    for key in (first, second):
+        wq.submit(key, lambda: results.append(barrier.wait()))
+    wq.join()
+    wq.stop()
+    assert sorted(results) == [0, 1]
+
+
+def test_failed_task_does_not_stop_worker():
+    wq = ShardedWorkQueue(workers=1, maxsize=10)
+    done = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    wq.submit("web", boom)
+    wq.submit("web", lambda: done.append(True))
+    wq.join()
+    wq.stop()
+    assert done == [True]
+
+
+def test_stats_track_processed_and_wait():
+    wq = ShardedWorkQueue(workers=1, maxsize=10)
+    wq.submit("web", lambda: time.sleep(0.05))
+    wq.submit("web", lambda: None)
+    wq.join()
+    stats = wq.stats()
+    wq.stop()
+    assert stats.processed == 2
+    assert stats.depth == 0
+    assert stats.max_wait >= 0.04